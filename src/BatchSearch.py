@@ -0,0 +1,175 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Allow running as a script: python src/BatchSearch.py ...
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.DirectoryScanner import DirectoryScanner
+from src.ExtractCV import ExtractCV
+from src.SearchPipeline import SearchPipeline, DEFAULT_BATCH_SIZE, RANKINGS
+from src.Ranking import BM25, DEFAULT_K1, DEFAULT_B
+from src.TextCache import TextCache
+from src.Tracing import Tracer
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+
+"""
+Headless keyword search over the CV corpus, for cron jobs and pipelines.
+Runs the same SearchPipeline as the GUI, without starting Qt, and writes the ranked results
+with a timing breakdown as JSON (one document) or NDJSON (one result per line, then the summary).
+Only the extraction of the PDFs runs in a process pool (--workers); the CVs are searched in this
+process as their text arrives, with the pruning and indexes of the pipeline.
+
+Example:
+    python src/BatchSearch.py --data-dir data --keywords "python, sql" --algorithm aho --top 10 --format ndjson
+"""
+
+def iter_directory_applications(base_dir: str):
+        """
+        Yields one application row per CV file of a data directory (data/<ROLE>/<file>.pdf),
+        shaped like the rows of Database.iter_cv_data.
+        @param base_dir (str): The directory scanned with DirectoryScanner.
+        """
+        detail_id = 0
+        for role, paths in DirectoryScanner(base_dir).getMap().items():
+                application_role = role.replace('-', ' ').replace('_', ' ').title()
+                for cv_path in paths:
+                        detail_id += 1
+                        yield {
+                                'detail_id': detail_id,
+                                'applicant_id': detail_id,
+                                'first_name': 'Applicant',
+                                'last_name': os.path.splitext(os.path.basename(cv_path))[0],
+                                'application_role': application_role,
+                                'cv_path': cv_path,
+                        }
+
+def parse_args(argv=None):
+        parser = argparse.ArgumentParser(description="Search the CV corpus for keywords without the GUI.")
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--db", action="store_true", help="read the applications from the database (config/database.json)")
+        source.add_argument("--data-dir", help="read the applications from a data/<ROLE>/<file>.pdf directory")
+        parser.add_argument("--keywords", required=True, help="comma-separated keywords, e.g. 'python, sql'")
+        parser.add_argument("--algorithm", choices=["kmp", "bm", "aho", "sa"], default="kmp")
+        parser.add_argument("--whole-words", action="store_true", help="match whole words through the inverted index")
+        parser.add_argument("--ranking", choices=RANKINGS, default="occurrences", help="rank by total occurrences or by BM25 relevance")
+        parser.add_argument("--k1", type=float, default=DEFAULT_K1, help=f"BM25 term frequency saturation (default: {DEFAULT_K1})")
+        parser.add_argument("--b", type=float, default=DEFAULT_B, help=f"BM25 length normalization, 0 to 1 (default: {DEFAULT_B})")
+        parser.add_argument("--top", type=int, default=5, help="number of results to keep (default: 5)")
+        parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes, the search itself runs in this process (default: one per CPU)")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="applications read per batch")
+        parser.add_argument("--dedupe-content", action="store_true", help="search CV files with identical content once")
+        parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+        parser.add_argument("--output", default="-", help="output file (default: standard output)")
+        parser.add_argument("--no-cache", action="store_true", help="do not read or update the text cache and the indexes")
+        parser.add_argument("--trace", help="write a trace of the search stages to this file")
+        parser.add_argument("--trace-format", choices=["chrome", "json"], default="chrome",
+                            help="Chrome trace event format (chrome://tracing, Perfetto) or plain JSON")
+        parser.add_argument("--log-level", default="WARNING", help="logging level (default: WARNING)")
+        args = parser.parse_args(argv)
+        if args.top < 1:
+                parser.error("--top must be at least 1")
+        if args.k1 < 0 or not 0 <= args.b <= 1:
+                parser.error("--k1 must be positive and --b between 0 and 1")
+        return args
+
+def run_search(args) -> dict:
+        """
+        Runs the query described by the parsed arguments.
+        @return: A dict with the 'query', the ranked 'results', the pipeline 'summary' and the 'timings' in ms,
+                 with the per-stage 'trace' breakdown when --trace is given.
+        """
+        tracer = Tracer(enabled=bool(getattr(args, 'trace', None)), memory=True)
+        timings = {}
+        start_time = time.perf_counter()
+        keywords = [kw for kw in map(ExtractCV.normalize_text, args.keywords.split(',')) if kw]
+
+        text_cache = None
+        indexes = {}
+        if not args.no_cache:
+                text_cache = TextCache()
+                indexes = {
+                        'inverted_index': InvertedIndex.load(),
+                        'trigram_index': TrigramIndex.load(),
+                        'suffix_array_index': SuffixArrayIndex.load(),
+                }
+        else:
+                # The indexes are still needed by whole-word and suffix array queries, kept in memory only
+                indexes = {'inverted_index': InvertedIndex(), 'suffix_array_index': SuffixArrayIndex()}
+        timings['load_ms'] = (time.perf_counter() - start_time) * 1000
+
+        if args.db:
+                from src.Database import iter_cv_data
+                applications = iter_cv_data(batch_size=args.batch_size)
+        else:
+                applications = iter_directory_applications(args.data_dir)
+
+        pipeline = SearchPipeline(
+                text_cache, workers=args.workers, batch_size=args.batch_size, dedupe_content=args.dedupe_content,
+                bm25=BM25(args.k1, args.b), **indexes
+        )
+        search_start_time = time.perf_counter()
+        summary = pipeline.run(applications, keywords, args.algorithm, args.whole_words, args.top, ranking=args.ranking, tracer=tracer)
+        timings['search_ms'] = (time.perf_counter() - search_start_time) * 1000
+        timings['exact_ms'] = summary['runtime_ms']
+        timings['fuzzy_ms'] = summary['fuzzy_runtime_ms']
+
+        with tracer.span("save"):
+                save_start_time = time.perf_counter()
+                if text_cache is not None:
+                        for index in pipeline.dirty_indexes:
+                                index.save()
+                        summary['cache_stats'] = text_cache.get_stats()
+                        text_cache.close()
+                timings['save_ms'] = (time.perf_counter() - save_start_time) * 1000
+        timings['total_ms'] = (time.perf_counter() - start_time) * 1000
+        if tracer.enabled:
+                tracer.stop()
+                timings['trace'] = tracer.breakdown()
+                tracer.save(args.trace, args.trace_format)
+
+        results = summary.pop('results')
+        return {
+                'query': {
+                        'keywords': keywords,
+                        'algorithm': args.algorithm,
+                        'whole_words': args.whole_words,
+                        'top': args.top,
+                        'ranking': args.ranking,
+                        'source': 'db' if args.db else args.data_dir,
+                },
+                'results': results,
+                'summary': summary,
+                'timings': timings,
+        }
+
+def write_output(output: dict, fmt: str, stream):
+        """Writes the search output as one JSON document, or as NDJSON: one line per result, then the summary."""
+        if fmt == 'json':
+                json.dump(output, stream, indent=2, default=str)
+                stream.write("\n")
+                return
+        for rank, result in enumerate(output['results'], 1):
+                stream.write(json.dumps(dict(result, rank=rank), default=str) + "\n")
+        trailer = {key: value for key, value in output.items() if key != 'results'}
+        stream.write(json.dumps(trailer, default=str) + "\n")
+
+def main(argv=None) -> int:
+        args = parse_args(argv)
+        logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+        output = run_search(args)
+        if args.output == "-":
+                write_output(output, args.format, sys.stdout)
+        else:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                        write_output(output, args.format, f)
+        return 0
+
+if __name__ == "__main__":
+        sys.exit(main())
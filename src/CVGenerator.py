@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+# Allow running as a script: python src/CVGenerator.py ...
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+"""
+Generator of synthetic CV PDFs, for tests and benchmarks at any scale without the Kaggle dataset.
+The CVs are written in the layout read by DirectoryScanner (data/<ROLE>/<id>.pdf). Each CV is drawn
+from its own random generator seeded by (seed, id), so a corpus is reproducible, can be generated in
+parallel, and can be extended later with more ids without changing the existing files.
+
+Example:
+    python src/CVGenerator.py --count 10000 --output-dir data_synthetic --seed 7 --workers 8
+"""
+
+# Roles of the Kaggle resume dataset
+DEFAULT_ROLES = (
+        'ACCOUNTANT', 'ADVOCATE', 'AGRICULTURE', 'APPAREL', 'ARTS', 'AUTOMOBILE', 'AVIATION', 'BANKING', 'BPO',
+        'BUSINESS-DEVELOPMENT', 'CHEF', 'CONSTRUCTION', 'CONSULTANT', 'DESIGNER', 'DIGITAL-MEDIA', 'ENGINEERING',
+        'FINANCE', 'FITNESS', 'HEALTHCARE', 'HR', 'INFORMATION-TECHNOLOGY', 'PUBLIC-RELATIONS', 'SALES', 'TEACHER',
+)
+
+# Filler words; none of them contains a word of DEFAULT_KEYWORDS, so planted keywords are the only matches
+DEFAULT_VOCABULARY = (
+        'responsible', 'for', 'the', 'daily', 'operations', 'of', 'a', 'team', 'with', 'clients', 'and', 'partners',
+        'delivered', 'reports', 'on', 'time', 'improved', 'processes', 'across', 'departments', 'coordinated',
+        'schedules', 'budgets', 'vendors', 'trained', 'new', 'staff', 'members', 'handled', 'incoming', 'requests',
+        'maintained', 'records', 'in', 'compliance', 'policies', 'prepared', 'documents', 'presentations', 'meetings',
+        'organized', 'events', 'supported', 'senior', 'director', 'office', 'quality', 'standards', 'developed',
+        'strategies', 'increase', 'revenue', 'reduced', 'costs', 'by', 'percent', 'achieved', 'targets', 'quarterly',
+        'annual', 'planning', 'analysis', 'research', 'market', 'trends', 'negotiated', 'contracts', 'suppliers',
+        'monitored', 'performance', 'indicators', 'resolved', 'issues', 'escalations', 'worked', 'closely', 'hospital',
+        'school', 'company', 'corporation', 'agency', 'firm', 'group', 'support', 'industry', 'skills', 'strong',
+        'outstanding', 'communication', 'written', 'verbal', 'detail', 'oriented', 'motivated', 'professional',
+        'experience', 'years', 'bachelor', 'degree', 'university', 'college', 'certified', 'member', 'association',
+)
+
+DEFAULT_KEYWORDS = (
+        'python', 'sql', 'excel', 'accounting', 'java', 'leadership', 'payroll', 'marketing', 'autocad', 'nursing',
+        'project management', 'customer service',
+)
+
+SECTIONS = ('Summary', 'Skills', 'Experience', 'Education')
+FIRST_NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Jamie', 'Riley', 'Avery', 'Quinn')
+LAST_NAMES = ('Smith', 'Garcia', 'Nguyen', 'Okafor', 'Kowalski', 'Tanaka', 'Silva', 'Dubois', 'Haddad', 'Larsen')
+
+# A4 page, 50 pt margins, 10 pt Helvetica: about 800 words fit on a page
+PAGE_RECT = fitz.Rect(50, 50, 545, 792)
+FONT_SIZE = 10
+
+class CVGenerator:
+        """
+        Writes synthetic CVs as PDF files, with configurable vocabulary, page counts and keyword plant rate.
+        """
+
+        def __init__(self, base_dir: str, roles=DEFAULT_ROLES, vocabulary=DEFAULT_VOCABULARY, keywords=DEFAULT_KEYWORDS,
+                     plant_rate: float = 0.01, min_pages: int = 1, max_pages: int = 2, words_per_page: int = 350,
+                     seed: int = 0):
+                """
+                Initializes the generator.
+                @param base_dir (str): The data directory, e.g. 'data'; one subdirectory is created per role.
+                @param roles (tuple): The role directories the CVs are spread across.
+                @param vocabulary (tuple): The filler words of the CV text.
+                @param keywords (tuple): The keywords planted in the text; they may contain several words.
+                @param plant_rate (float): Probability of each word of the text to be a planted keyword.
+                @param min_pages (int): Minimum number of pages of a CV.
+                @param max_pages (int): Maximum number of pages of a CV.
+                @param words_per_page (int): Number of words per page, at most about 800.
+                @param seed (int): Seed of the corpus; the same seed always generates the same CVs.
+                """
+                if not roles or not vocabulary:
+                        raise ValueError("At least one role and one vocabulary word are needed")
+                if not 0 <= plant_rate <= 1 or not 1 <= min_pages <= max_pages:
+                        raise ValueError(f"Invalid plant rate {plant_rate} or page range {min_pages}-{max_pages}")
+                self.base_dir = base_dir
+                self.roles = tuple(roles)
+                self.vocabulary = tuple(vocabulary)
+                self.keywords = tuple(keywords)
+                self.plant_rate = plant_rate if self.keywords else 0
+                self.min_pages = min_pages
+                self.max_pages = max_pages
+                self.words_per_page = words_per_page
+                self.seed = seed
+
+        def generate_cv(self, cv_id: int) -> dict:
+                """
+                Draws the content of one CV, without writing it.
+                @param cv_id (int): The CV identifier, also its file name.
+                @return: A dict with the 'path', 'role', 'pages' (list of page texts) and 'planted' keyword counts.
+                """
+                rng = random.Random(f"{self.seed}/{cv_id}")
+                role = rng.choice(self.roles)
+                planted = {}
+                pages = []
+                for page_number in range(rng.randint(self.min_pages, self.max_pages)):
+                        lines = []
+                        if page_number == 0:
+                                lines.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+                                lines.append(role.replace('-', ' ').title())
+                        words_left = self.words_per_page
+                        while words_left > 0:
+                                lines.append(rng.choice(SECTIONS))
+                                sentence = []
+                                for _ in range(min(words_left, rng.randint(60, 120))):
+                                        if self.plant_rate and rng.random() < self.plant_rate:
+                                                keyword = rng.choice(self.keywords)
+                                                planted[keyword] = planted.get(keyword, 0) + 1
+                                                sentence.append(keyword)
+                                        else:
+                                                sentence.append(rng.choice(self.vocabulary))
+                                words_left -= len(sentence)
+                                lines.append(" ".join(sentence).capitalize() + ".")
+                        pages.append("\n".join(lines))
+                return {
+                        'path': os.path.join(self.base_dir, role, f"{cv_id}.pdf").replace('\\', '/'),
+                        'role': role,
+                        'pages': pages,
+                        'planted': planted,
+                }
+
+        def write_cv(self, cv_id: int) -> dict:
+                """
+                Generates one CV and writes it as a PDF.
+                @return: The dict of generate_cv, without the page texts, with the 'bytes' written.
+                """
+                cv = self.generate_cv(cv_id)
+                os.makedirs(os.path.dirname(cv['path']), exist_ok=True)
+                doc = fitz.open()
+                try:
+                        for text in cv.pop('pages'):
+                                page = doc.new_page(width=595, height=842)
+                                # insert_textbox returns a negative value and writes nothing when the text overflows
+                                if page.insert_textbox(PAGE_RECT, text, fontsize=FONT_SIZE, fontname="helv") < 0:
+                                        raise ValueError(f"{self.words_per_page} words do not fit on a page")
+                        doc.save(cv['path'], deflate=True)
+                finally:
+                        doc.close()
+                cv['bytes'] = os.path.getsize(cv['path'])
+                return cv
+
+        def _write_range(self, first_id: int, end_id: int) -> list:
+                return [self.write_cv(cv_id) for cv_id in range(first_id, end_id)]
+
+        def generate(self, count: int, first_id: int = 1, workers: int = 1, chunk_size: int = 200, on_progress=None) -> dict:
+                """
+                Writes count CVs with the ids first_id, first_id + 1, ...
+                @param count (int): Number of CVs to write.
+                @param first_id (int): The id of the first CV.
+                @param workers (int): Number of writer processes, None for one per CPU.
+                @param chunk_size (int): Number of CVs written per task of a writer process.
+                @param on_progress (callable): Called with (done, count) after each chunk.
+                @return: A dict with the number of 'files', 'bytes', 'seconds', 'files_per_sec', the CVs per 'roles'
+                         and the number of 'planted' occurrences of each keyword in each CV path ('manifest').
+                """
+                start_time = time.perf_counter()
+                stats = {'files': 0, 'bytes': 0, 'roles': {}, 'planted': {}, 'manifest': {}}
+
+                def collect(written):
+                        for cv in written:
+                                stats['files'] += 1
+                                stats['bytes'] += cv['bytes']
+                                stats['roles'][cv['role']] = stats['roles'].get(cv['role'], 0) + 1
+                                for keyword, occurrences in cv['planted'].items():
+                                        stats['planted'][keyword] = stats['planted'].get(keyword, 0) + occurrences
+                                stats['manifest'][cv['path']] = cv['planted']
+                        if on_progress is not None:
+                                on_progress(stats['files'], count)
+
+                ranges = [(i, min(i + chunk_size, first_id + count)) for i in range(first_id, first_id + count, chunk_size)]
+                if workers == 1 or len(ranges) <= 1:
+                        for first, end in ranges:
+                                collect(self._write_range(first, end))
+                else:
+                        with ProcessPoolExecutor(max_workers=workers) as executor:
+                                for written in executor.map(self._write_range, *zip(*ranges)):
+                                        collect(written)
+
+                stats['seconds'] = time.perf_counter() - start_time
+                stats['files_per_sec'] = stats['files'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+                return stats
+
+def _read_words(path: str) -> tuple:
+        """Reads one word or keyword per line, skipping empty lines."""
+        with open(path, encoding='utf-8') as f:
+                return tuple(line.strip() for line in f if line.strip())
+
+def parse_args(argv=None):
+        parser = argparse.ArgumentParser(description="Write synthetic CV PDFs into a data/<ROLE>/<id>.pdf directory.")
+        parser.add_argument("--count", type=int, required=True, help="number of CVs to write")
+        parser.add_argument("--output-dir", default="data_synthetic", help="data directory (default: data_synthetic)")
+        parser.add_argument("--first-id", type=int, default=1, help="id of the first CV (default: 1)")
+        parser.add_argument("--seed", type=int, default=0, help="seed of the corpus (default: 0)")
+        parser.add_argument("--roles", help="comma-separated role directories (default: the Kaggle dataset roles)")
+        parser.add_argument("--vocabulary", help="file of filler words, one per line")
+        parser.add_argument("--keywords", help="file of planted keywords, one per line")
+        parser.add_argument("--plant-rate", type=float, default=0.01, help="probability of a word to be a keyword (default: 0.01)")
+        parser.add_argument("--min-pages", type=int, default=1)
+        parser.add_argument("--max-pages", type=int, default=2)
+        parser.add_argument("--words-per-page", type=int, default=350)
+        parser.add_argument("--workers", type=int, default=None, help="writer processes (default: one per CPU)")
+        parser.add_argument("--manifest", help="write the planted keyword counts of every CV to this JSON file")
+        return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+        args = parse_args(argv)
+        options = {}
+        if args.roles:
+                options['roles'] = tuple(role.strip() for role in args.roles.split(',') if role.strip())
+        if args.vocabulary:
+                options['vocabulary'] = _read_words(args.vocabulary)
+        if args.keywords:
+                options['keywords'] = _read_words(args.keywords)
+        generator = CVGenerator(
+                args.output_dir, plant_rate=args.plant_rate, min_pages=args.min_pages, max_pages=args.max_pages,
+                words_per_page=args.words_per_page, seed=args.seed, **options
+        )
+
+        def report(done, count):
+                print(f"\r{done}/{count} CVs written", end="", file=sys.stderr, flush=True)
+
+        stats = generator.generate(args.count, args.first_id, args.workers, on_progress=report)
+        print(file=sys.stderr)
+        manifest = stats.pop('manifest')
+        if args.manifest:
+                with open(args.manifest, 'w', encoding='utf-8') as f:
+                        json.dump(manifest, f)
+        print(json.dumps(stats, indent=2))
+        return 0
+
+if __name__ == "__main__":
+        sys.exit(main())
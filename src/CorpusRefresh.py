@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Allow running as a script: python src/CorpusRefresh.py ...
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.DirectoryScanner import DirectoryScanner, DEFAULT_SNAPSHOT_PATH, absolute_path
+from src.ExtractCV import ExtractCV
+from src.TextCache import TextCache
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+
+"""
+Incremental refresh of the CV corpus after files were added, replaced or deleted.
+The data directory is scanned and compared with the snapshot of the previous scan; only the
+changed CVs are re-extracted into the text cache and re-indexed, and, with --db, the application
+rows of added and removed CVs are synchronized. The first run (no snapshot) indexes every CV.
+
+Example:
+    python src/CorpusRefresh.py --data-dir data --db
+"""
+
+def refresh_corpus(deltas: dict, text_cache=None, indexes=(), workers: int = None) -> dict:
+        """
+        Applies the changes of a directory scan to the text cache and the indexes.
+        @param deltas (dict): The 'added', 'modified' and 'removed' CV paths, from DirectoryScanner.changes().
+                              They are the canonical paths also used by the seeder and the search pipeline.
+        @param text_cache (TextCache): The cache of extracted text, None to extract without caching.
+        @param indexes (list): The CorpusIndex instances to update.
+        @param workers (int): Extraction processes, None for one per CPU.
+        @return: A dict with the numbers of 'extracted' CVs, 'reindexed' and 'unindexed' documents, and 'extract_ms'.
+        """
+        stale = deltas['modified'] + deltas['removed']
+        if text_cache is not None:
+                # A replaced file may keep its size and mtime; drop its entry rather than trust the cache key
+                for cv_path in stale:
+                        text_cache.invalidate(absolute_path(cv_path))
+
+        unindexed = 0
+        for index in indexes:
+                for cv_path in deltas['removed']:
+                        if index.has_document(cv_path):
+                                index.remove_document(cv_path)
+                                unindexed += 1
+
+        start_time = time.perf_counter()
+        changed = deltas['added'] + deltas['modified']
+        documents = {
+                changed[i]: text
+                for i, text in ExtractCV.iter_extract_many(
+                        [absolute_path(cv_path) for cv_path in changed], workers=workers, cache=text_cache
+                )
+        }
+        extract_ms = (time.perf_counter() - start_time) * 1000
+
+        reindexed = 0
+        for index in indexes:
+                reindexed += index.sync_documents(documents)
+        return {'extracted': len(documents), 'reindexed': reindexed, 'unindexed': unindexed, 'extract_ms': extract_ms}
+
+def parse_args(argv=None):
+        parser = argparse.ArgumentParser(description="Update the text cache, indexes and database for the CVs changed since the last scan.")
+        parser.add_argument("--data-dir", required=True, help="the data/<ROLE>/<file>.pdf directory")
+        parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_PATH, help="snapshot file of the previous scan")
+        parser.add_argument("--recursive", action="store_true", help="also scan the nested directories of each role")
+        parser.add_argument("--scan-workers", type=int, default=None, help="threads scanning the role directories")
+        parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: one per CPU)")
+        parser.add_argument("--db", action="store_true", help="also synchronize the application rows (config/database.json)")
+        parser.add_argument("--dry-run", action="store_true", help="report the changes without applying them or saving the snapshot")
+        return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+        args = parse_args(argv)
+        start_time = time.perf_counter()
+        scanner = DirectoryScanner(args.data_dir, recursive=args.recursive, workers=args.scan_workers)
+        deltas = scanner.changes(args.snapshot, save=False)
+        report = {
+                'files': len(scanner.file_stats),
+                'added': len(deltas['added']),
+                'modified': len(deltas['modified']),
+                'removed': len(deltas['removed']),
+                'scan_ms': (time.perf_counter() - start_time) * 1000,
+        }
+        if args.dry_run:
+                report['changes'] = deltas
+                print(json.dumps(report, indent=2))
+                return 0
+
+        text_cache = TextCache()
+        indexes = [InvertedIndex.load(), TrigramIndex.load(), SuffixArrayIndex.load()]
+        try:
+                report.update(refresh_corpus(deltas, text_cache, indexes, args.workers))
+                for index in indexes:
+                        index.save()
+        finally:
+                text_cache.close()
+
+        if args.db:
+                from src.Database import CONFIG_PATH
+                from src.Seeder import Seeder
+                report['applications'] = Seeder(args.data_dir, CONFIG_PATH).sync_applications(deltas)
+        # Saved last, so an interrupted refresh is redone from the same snapshot
+        scanner.save_snapshot(args.snapshot)
+        report['total_ms'] = (time.perf_counter() - start_time) * 1000
+        print(json.dumps(report, indent=2))
+        return 0
+
+if __name__ == "__main__":
+        sys.exit(main())
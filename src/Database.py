@@ -1,35 +1,100 @@
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector import pooling
 import json
+import logging
 import os
+import threading
+
+# Credentials file, resolved from this module so the application can be started from any directory
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'database.json')
+
+# Connections kept open and shared by the GUI, the search worker and scripts
+POOL_NAME = "cv_analyzer"
+POOL_SIZE = 4
+
+# Health check: a dropped connection is reopened up to PING_ATTEMPTS times, PING_DELAY seconds apart
+PING_ATTEMPTS = 3
+PING_DELAY = 1
+
+# Number of application rows read from the server at a time by iter_cv_data
+DEFAULT_BATCH_SIZE = 1000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+def load_config(file_path=CONFIG_PATH):
+    """Read the connection parameters from the credentials file."""
+    with open(file_path, 'r') as f:
+        credentials = json.load(f)
+
+    config = {
+        'host': credentials['host'],
+        'user': credentials['user'],
+        'password': credentials['password'],
+        'database': credentials['database'],
+    }
+    if 'port' in credentials:
+        config['port'] = credentials['port']
+    return config
+
+def get_pool(file_path=CONFIG_PATH):
+    """
+    Return the connection pool, creating it on first use.
+    Raises FileNotFoundError, KeyError or mysql.connector.Error if the pool can not be created.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                **load_config(file_path)
+            )
+        return _pool
+
+def check_connection(conn):
+    """
+    Health check: ping the server and reconnect if the connection was dropped.
+    Returns True if the connection can be used.
+    """
+    if not conn:
+        return False
+    try:
+        conn.ping(reconnect=True, attempts=PING_ATTEMPTS, delay=PING_DELAY)
+        return True
+    except Error as e:
+        print(f"Database Error: '{e}' occurred while checking the connection")
+        return False
 
 def create_connection():
+    """
+    Borrow a connection from the pool. close_connection (or conn.close()) returns it to the pool.
+    """
     conn = None
     try:
-        file_path = '../config/database.json'
-
-        with open(file_path, 'r') as f:
-            credentials = json.load(f)
-
-        conn = mysql.connector.connect(
-            host=credentials['host'],
-            user=credentials['user'],
-            password=credentials['password'],
-            database=credentials['database']
-        )
+        conn = get_pool().get_connection()
+        if not check_connection(conn):
+            conn.close()
+            return None
         print("Database connection successful")
 
     except FileNotFoundError:
-        print(f"Error: The credentials file was not found at {file_path}")
+        print(f"Error: The credentials file was not found at {CONFIG_PATH}")
     except KeyError as e:
         print(f"Error: The key {e} is missing from the database.json file.")
+    except pooling.PoolError as e:
+        print(f"Database Error: no connection available in the pool ({e})")
     except Error as e:
         print(f"Database Error: '{e}' occurred")
     
     return conn
 
 def close_connection(conn):
-    """Close the database connection."""
+    """Close the database connection, returning it to the pool."""
     if conn.is_connected():
         conn.close()
         print("Database connection closed.")
@@ -41,7 +106,7 @@ def get_summary_details_by_id(conn, detail_id):
     Fetches all profile and application info for a specific detail_id
     using a single, efficient JOIN query.
     """
-    if not conn or not conn.is_connected():
+    if not check_connection(conn):
         return None
 
     details = {}
@@ -78,19 +143,8 @@ def get_summary_details_by_id(conn, detail_id):
 
     return details
 
-def get_all_cv_data(conn):
-    """
-    Fetches all individual APPLICATIONS (not applicants) from the database.
-    Each row represents a unique CV to be searched.
-    """
-    if not conn or not conn.is_connected():
-        return []
-
-    results = []
-    cursor = conn.cursor(dictionary=True)
-
-    # This query joins the tables to get all necessary info for each application
-    query = """
+# Every individual APPLICATION (not applicant) with the applicant info needed to rank it
+CV_DATA_QUERY = """
     SELECT 
         d.detail_id, 
         p.applicant_id, 
@@ -103,12 +157,68 @@ def get_all_cv_data(conn):
     JOIN 
         applicantprofile p ON d.applicant_id = p.applicant_id
     """
+
+def _drop_connection(conn, reconnect):
+    """
+    Closes the socket of a connection whose unbuffered result was not read to the end.
+    Reading the rest would transfer the whole table, and no other command can be sent before it is read,
+    so the connection is dropped instead: reconnected for a caller that keeps using it,
+    or returned to the pool, which reconnects it on its next use.
+    """
+    # shutdown() closes the socket without the QUIT command, which would first wait for the unread rows
+    conn.shutdown()
+    if not reconnect:
+        try:
+            conn.close()
+        except Error as e:
+            # A pooled connection is returned to the pool even though resetting its session fails on the closed socket
+            logger.debug("Session reset of a dropped connection failed: %s", e)
+        return
+    try:
+        conn.reconnect(attempts=PING_ATTEMPTS, delay=PING_DELAY)
+    except Error as e:
+        print(f"Database Error: '{e}' occurred while reconnecting")
+
+def iter_cv_data(conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yields all individual APPLICATIONS (not applicants) from the database, one row dict at a time.
+    Rows are streamed through an unbuffered cursor and read batch_size at a time,
+    so the first rows can be processed before the whole table is transferred.
+    Without a connection, one is borrowed from the pool for the duration of the iteration,
+    which keeps the connection of the caller free for other queries.
+    If the iteration stops early (a cancelled query, a closed generator or an error), the rest of
+    the table is not read: the connection is dropped and reconnected instead.
+    """
+    own_connection = conn is None
+    if own_connection:
+        conn = create_connection()
+    if not check_connection(conn):
+        return
+
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    exhausted = False
     try:
-        cursor.execute(query)
-        results = cursor.fetchall()
+        cursor.execute(CV_DATA_QUERY)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                exhausted = True
+                break
+            yield from rows
     except Error as e:
         print(f"The error '{e}' occurred")
     finally:
-        cursor.close()
+        if exhausted:
+            cursor.close()
+            if own_connection:
+                conn.close()
+        else:
+            _drop_connection(conn, reconnect=not own_connection)
 
-    return results
\ No newline at end of file
+def get_all_cv_data(conn):
+    """
+    Fetches all individual APPLICATIONS (not applicants) from the database.
+    Each row represents a unique CV to be searched.
+    Prefer iter_cv_data for large tables.
+    """
+    return list(iter_cv_data(conn))
@@ -1,7 +1,38 @@
+import json
 import os
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 
+# Root of the project, which the CV paths of the database and of the indexes are relative to
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default location of the snapshot of the last scan: <project root>/cache/directory_snapshot.json
+DEFAULT_SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, 'cache', 'directory_snapshot.json')
+
+# Bump whenever the layout of the snapshot file changes
+SNAPSHOT_VERSION = 1
+
+def canonical_path(path: str, base_dir: str = None) -> str:
+        """
+        Returns the key identifying a CV file in the database, the indexes and the search results: its path
+        relative to the project root, with forward slashes, e.g. 'data/HR/1.pdf'. A file outside the project
+        is identified by its absolute path.
+        @param path (str): The path of the file, absolute or relative to base_dir.
+        @param base_dir (str): The directory a relative path starts from, None for the working directory.
+        """
+        absolute = os.path.abspath(os.path.join(base_dir, path) if base_dir else path)
+        try:
+                relative = os.path.relpath(absolute, PROJECT_ROOT)
+        except ValueError:
+                relative = absolute  # On another drive than the project
+        if os.path.isabs(relative) or relative == os.pardir or relative.startswith(os.pardir + os.sep):
+                return absolute.replace('\\', '/')
+        return relative.replace('\\', '/')
+
+def absolute_path(cv_path: str) -> str:
+        """Returns the absolute path of a CV file from its key, see canonical_path()."""
+        return os.path.join(PROJECT_ROOT, cv_path)
+
 class DirectoryScanner:
     
         """
@@ -9,17 +40,22 @@ class DirectoryScanner:
         provides methods to display and access data
         """
 
-        def __init__(self, base_dir: str):
+        def __init__(self, base_dir: str, recursive: bool = False, workers: int = None):
                 
                 """
                 Initializes the DirectoryScanner and collects all file paths.
                 @param base_dir (str) The path to the root directory to scan (e.g., '../data' from src).
+                @param recursive (bool): Also collect the files of nested directories, under their top-level subdirectory.
+                @param workers (int): Threads scanning the subdirectories, None for the ThreadPoolExecutor default.
                 """
 
                 self.base_dir = base_dir
-                self.file_path_map = self._collect_file_paths()
+                self.recursive = recursive
+                self.workers = workers
                 # Get absolute path for display
                 self.abs_base_dir = os.path.abspath(self.base_dir)
+                self.file_stats = {}  # path -> (size, mtime_ns, inode), the snapshot of this scan
+                self.file_path_map = self._collect_file_paths()
 
         def getMap(self) -> dict:
                 
@@ -35,29 +71,138 @@ class DirectoryScanner:
                 """
                 return self.file_path_map
 
+        def _scan_directory(self, directory: str) -> list:
+                """
+                Lists the files of one subdirectory with os.scandir, descending into nested
+                directories when recursive is set. Internal method, run in the worker threads.
+                @return: A list of (canonical path, (size, mtime_ns, inode)) tuples.
+                """
+                files = []
+                pending = [directory]
+                while pending:
+                        current = pending.pop()
+                        try:
+                                with os.scandir(current) as entries:
+                                        for entry in entries:
+                                                try:
+                                                        # is_dir/is_file use the type returned by the listing, without a stat call
+                                                        if entry.is_file():
+                                                                stat = entry.stat()
+                                                                normalized_path = canonical_path(entry.path)
+                                                                files.append((normalized_path, (stat.st_size, stat.st_mtime_ns, stat.st_ino)))
+                                                        elif self.recursive and entry.is_dir():
+                                                                pending.append(entry.path)
+                                                except OSError:
+                                                        pass # The file vanished or can't be read during the scan
+                        except OSError:
+                                pass # Silently ignore directories we can't access
+                files.sort()
+                return files
+
         def _collect_file_paths(self) -> dict:
                 """
-                Scans subdirectories and collects all file paths. Internal method.
+                Scans subdirectories and collects all file paths, with the stats of the snapshot.
+                The subdirectories are scanned in parallel threads, as the work is mostly waiting on system calls.
+                Internal method.
                 """
-                file_map = defaultdict(list)
-                if not os.path.isdir(self.base_dir):
-                        return {}
+                self.file_stats = {}
                 try:
-                        for item in sorted(os.listdir(self.base_dir)):
-                                full_path = os.path.join(self.base_dir, item)
-                                if os.path.isdir(full_path):
-                                        try:
-                                                files = sorted([f for f in os.listdir(full_path) if os.path.isfile(os.path.join(full_path, f))])
-                                                for file_name in files:
-                                                        relative_path = os.path.join(self.base_dir, item, file_name)
-                                                        normalized_path = relative_path.replace('\\', '/')
-                                                        file_map[item].append(normalized_path)
-                                        except OSError:
-                                                pass # Silently ignore directories we can't access
-                        return dict(file_map)
+                        with os.scandir(self.base_dir) as entries:
+                                subdirs = sorted(entry.name for entry in entries if entry.is_dir())
                 except OSError:
                         return {}
 
+                directories = [os.path.join(self.base_dir, name) for name in subdirs]
+                if self.workers == 1 or len(directories) < 2:
+                        scanned = map(self._scan_directory, directories)
+                else:
+                        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                                scanned = list(executor.map(self._scan_directory, directories))
+
+                file_map = {}
+                for name, files in zip(subdirs, scanned):
+                        if files:
+                                file_map[name] = [path for path, _ in files]
+                                self.file_stats.update(files)
+                return file_map
+
+        def snapshot(self) -> dict:
+                """
+                Returns the state of every file found by the scan.
+                @return: A dict path -> (size, mtime_ns, inode).
+                """
+                return dict(self.file_stats)
+
+        @staticmethod
+        def diff(previous: dict, current: dict) -> dict:
+                """
+                Compares two snapshots.
+                A file is modified when its size, mtime or inode changed, e.g. after an edit or a replacement.
+                @param previous (dict): The older snapshot, path -> (size, mtime_ns, inode).
+                @param current (dict): The newer snapshot.
+                @return: A dict with the sorted 'added', 'modified' and 'removed' paths.
+                """
+                return {
+                        'added': sorted(path for path in current if path not in previous),
+                        'modified': sorted(
+                                path for path, stats in current.items()
+                                if path in previous and tuple(previous[path]) != tuple(stats)
+                        ),
+                        'removed': sorted(path for path in previous if path not in current),
+                }
+
+        def save_snapshot(self, path: str = DEFAULT_SNAPSHOT_PATH):
+                """
+                Writes the snapshot of this scan as JSON, to be compared with by a later scan.
+                @param path (str): Path to the snapshot file.
+                """
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                state = {
+                        'version': SNAPSHOT_VERSION,
+                        'base_dir': self.abs_base_dir,
+                        'recursive': self.recursive,
+                        'files': self.file_stats,
+                }
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(state, f)
+                os.replace(tmp_path, path)
+
+        def load_snapshot(self, path: str = DEFAULT_SNAPSHOT_PATH) -> dict:
+                """
+                Reads the snapshot saved by an earlier scan of the same directory.
+                @param path (str): Path to the snapshot file.
+                @return: A dict path -> (size, mtime_ns, inode), empty if the file is missing or was
+                         written for another directory or version, so that every file counts as added.
+                """
+                try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                                state = json.load(f)
+                except FileNotFoundError:
+                        return {}
+                except (OSError, ValueError) as e:
+                        print(f"Error loading directory snapshot from '{path}': {e}")
+                        return {}
+
+                if (state.get('version') != SNAPSHOT_VERSION or state.get('base_dir') != self.abs_base_dir
+                                or state.get('recursive') != self.recursive):
+                        print(f"Ignoring directory snapshot '{path}' of another scan.")
+                        return {}
+                return {file_path: tuple(stats) for file_path, stats in state['files'].items()}
+
+        def changes(self, snapshot_path: str = DEFAULT_SNAPSHOT_PATH, save: bool = True) -> dict:
+                """
+                Computes the files added, modified and removed since the saved snapshot, then saves
+                the snapshot of this scan for the next run.
+                @param snapshot_path (str): Path to the snapshot file.
+                @param save (bool): Whether to replace the saved snapshot.
+                @return: The deltas, as returned by diff().
+                """
+                deltas = self.diff(self.load_snapshot(snapshot_path), self.file_stats)
+                if save:
+                        self.save_snapshot(snapshot_path)
+                return deltas
+
         def _get_emoji_for_file(self, file_path: str) -> str:
                 """Returns a suitable emoji based on the file extension."""
                 extension_map = {
@@ -1,11 +1,34 @@
 import fitz  # PyMuPDF
-import re
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+class _PunctuationTable(dict):
+        r"""
+        str.translate table deleting the characters matched by the regex [^\w\s]: every character
+        that is neither alphanumeric, '_' nor whitespace. Entries are computed on first sight, so
+        a text only pays a Python call for characters the table has not met yet.
+        """
+
+        def __missing__(self, code_point):
+                char = chr(code_point)
+                value = code_point if char.isalnum() or char == '_' or char.isspace() else None
+                self[code_point] = value
+                return value
+
+_PUNCTUATION_TABLE = _PunctuationTable()
 
 class ExtractCV:
-        def __init__(self, pdf_path):
+        def __init__(self, pdf_path, cache=None):
                 self.pdf_path = pdf_path
                 self.raw_text = ""
                 self.cleaned_text = ""
+                # Optional TextCache shared between instances, so unchanged PDFs are parsed only once
+                self.cache = cache
+                self.cached = False
         
         def get_raw_text(self):
                 # Return the raw text extracted from the PDF
@@ -28,30 +51,127 @@ class ExtractCV:
                 self.pdf_path = new_path
                 self.raw_text = ""
                 self.cleaned_text = ""
+                self.cached = False
 
         def extract_all_text(self):
-                # Extract all text from all pages of a PDF
-                doc = fitz.open(self.pdf_path)
-                full_text = ""
-                for page in doc:
-                        full_text += page.get_text()
-                self.raw_text = full_text
+                # Extract all text from all pages of a PDF, served from the text cache if the file is unchanged
+                if self.cache is not None:
+                        cached = self.cache.get(self.pdf_path)
+                        if cached is not None:
+                                self.raw_text, self.cleaned_text = cached
+                                self.cached = True
+                                return
+                # Join the pages once rather than growing a string page by page, and release the document
+                with fitz.open(self.pdf_path) as doc:
+                        self.raw_text = "".join(page.get_text() for page in doc)
 
         def to_continuous_string(self):
                 # Convert text to a lowercase string with no punctuation but preserve spaces between words
                 if not self.raw_text:
                         self.extract_all_text()
-                # Remove all punctuation using regex
-                text = re.sub(r'[^\w\s]', '', self.raw_text)
-                # Replace multiple whitespace characters with a single space and convert to lowercase
-                cleaned = re.sub(r'\s+', ' ', text).lower().strip()
-                self.cleaned_text = cleaned
+                self.cleaned_text = ExtractCV.normalize_text(self.raw_text)
+                # Store freshly parsed text so later queries and app restarts can skip the PDF
+                if self.cache is not None and not self.cached:
+                        self.cache.put(self.pdf_path, self.raw_text, self.cleaned_text)
+                        self.cached = True
 
+
+        @staticmethod
+        def normalize_text(text):
+                # Lowercase the text and remove punctuation, collapsing whitespace into single spaces.
+                # Also used on search keywords so they are tokenized the same way as the CV text.
+                # Same output as removing [^\w\s] then collapsing \s+, with one copy per step instead of
+                # regex passes: translate drops the punctuation, split/join collapses and strips the whitespace.
+                # Case folding stays a whole-string lower(), which handles context-dependent letters (final sigma).
+                return ' '.join(text.translate(_PUNCTUATION_TABLE).lower().split())
         
         def extract(self):
-                # Convert the PDF to a continuous string
-                self.extract_all_text()
-                self.to_continuous_string()
+                # Convert the PDF to a continuous string, skipping the steps whose output is already populated
+                if not self.raw_text:
+                        self.extract_all_text()
+                if not self.cleaned_text:
+                        self.to_continuous_string()
+
+        @staticmethod
+        def iter_extract_many(paths, workers=None, chunksize=None, cache=None, executor=None, on_timing=None):
+                # Yield (index, cleaned_text) for every PDF in paths as soon as it is available.
+                # Cached PDFs are yielded first; the rest are extracted in chunks across a process pool
+                # and yielded in completion order. Chunking keeps the per-task IPC overhead low.
+                # A caller extracting several batches can pass its own executor, which is left running.
+                # on_timing, if given, is called with (index, parse_ns, clean_ns) for every PDF actually parsed.
+                paths = list(paths)
+                pending = []
+                for i, path in enumerate(paths):
+                        cached = cache.get(path) if cache is not None else None
+                        if cached is not None:
+                                yield i, cached[1]
+                        else:
+                                pending.append(i)
+                if not pending:
+                        return
+
+                workers = workers or os.cpu_count() or 1
+                if chunksize is None:
+                        chunksize = max(1, min(64, len(pending) // (workers * 4)))
+                chunks = [pending[k:k + chunksize] for k in range(0, len(pending), chunksize)]
+
+                def finish(chunk, extracted):
+                        for i, texts in zip(chunk, extracted):
+                                if texts is None:
+                                        yield i, ""
+                                        continue
+                                if cache is not None:
+                                        cache.put(paths[i], texts[0], texts[1])
+                                if on_timing is not None:
+                                        on_timing(i, texts[2], texts[3])
+                                yield i, texts[1]
+
+                # A pool is not worth starting for a single worker or a single chunk
+                if executor is None and (workers == 1 or len(chunks) == 1):
+                        for chunk in chunks:
+                                yield from finish(chunk, _extract_chunk([paths[i] for i in chunk]))
+                        return
+
+                own_executor = executor is None
+                if own_executor:
+                        executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+                futures = {}
+                try:
+                        futures = {executor.submit(_extract_chunk, [paths[i] for i in chunk]): chunk for chunk in chunks}
+                        for future in as_completed(futures):
+                                yield from finish(futures[future], future.result())
+                finally:
+                        # Drop chunks that have not started yet if the consumer stops early,
+                        # without waiting for the chunks in flight
+                        if own_executor:
+                                executor.shutdown(wait=False, cancel_futures=True)
+                        else:
+                                for future in futures:
+                                        future.cancel()
 
+        @staticmethod
+        def extract_many(paths, workers=None, chunksize=None, cache=None):
+                # Return the cleaned text of every PDF in paths, in input order, extracted in parallel
+                paths = list(paths)
+                texts = [""] * len(paths)
+                for i, text in ExtractCV.iter_extract_many(paths, workers, chunksize, cache):
+                        texts[i] = text
+                return texts
 
 
+def _extract_chunk(paths):
+        # Extract the (raw_text, cleaned_text, parse_ns, clean_ns) of a chunk of PDFs inside a worker process.
+        # A PDF that cannot be read yields None instead of failing the whole batch.
+        results = []
+        for path in paths:
+                cv = ExtractCV(path)
+                try:
+                        start_ns = time.perf_counter_ns()
+                        cv.extract_all_text()
+                        parsed_ns = time.perf_counter_ns()
+                        cv.to_continuous_string()
+                        results.append((cv.raw_text, cv.cleaned_text, parsed_ns - start_ns, time.perf_counter_ns() - parsed_ns))
+                except Exception as e:
+                        logger.error("Error extracting text from '%s': %s", path, e)
+                        results.append(None)
+        return results
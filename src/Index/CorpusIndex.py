@@ -0,0 +1,96 @@
+import logging
+import os
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the persisted indexes: <project root>/cache
+INDEX_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cache'
+)
+
+class CorpusIndex(ABC):
+        """
+        Base class of the indexes built over the cleaned text of the CV corpus.
+
+        Subclasses implement add_document/remove_document and list the attributes that make up
+        their state in STATE_FIELDS; this class provides change detection and persistence.
+        """
+
+        # Bump in a subclass whenever its on-disk layout changes
+        VERSION = 1
+        STATE_FIELDS = ('doc_signatures',)
+        DEFAULT_PATH = None
+
+        def __init__(self):
+                self.doc_signatures = {}  # doc_id -> CRC32 of the indexed text, used to detect changes
+
+        @staticmethod
+        def _signature(text: str) -> int:
+                return zlib.crc32(text.encode('utf-8'))
+
+        @abstractmethod
+        def add_document(self, doc_id: str, text: str):
+                """Indexes the cleaned text of a document, replacing its previous text."""
+                pass
+
+        @abstractmethod
+        def remove_document(self, doc_id: str):
+                """Removes a document from the index."""
+                pass
+
+        def sync_documents(self, documents: dict) -> int:
+                """
+                Indexes the documents that are new or whose text changed since they were indexed.
+                @param documents (dict): doc_id -> cleaned text.
+                @return: The number of documents (re)indexed.
+                """
+                updated = 0
+                for doc_id, text in documents.items():
+                        if self.doc_signatures.get(doc_id) != self._signature(text):
+                                self.add_document(doc_id, text)
+                                updated += 1
+                return updated
+
+        def has_document(self, doc_id: str) -> bool:
+                return doc_id in self.doc_signatures
+
+        def get_documents(self) -> list:
+                return list(self.doc_signatures)
+
+        def save(self, path: str = None):
+                """Writes the index to disk (DEFAULT_PATH unless a path is given)."""
+                path = path or self.DEFAULT_PATH
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+                state['version'] = self.VERSION
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+
+        @classmethod
+        def load(cls, path: str = None):
+                """
+                Reads an index written by save().
+                @return: The loaded index, or an empty index if the file is missing or from another version.
+                """
+                path = path or cls.DEFAULT_PATH
+                index = cls()
+                try:
+                        with open(path, 'rb') as f:
+                                state = pickle.load(f)
+                except FileNotFoundError:
+                        return index
+                except (OSError, pickle.UnpicklingError, EOFError) as e:
+                        logger.error("Error loading %s from '%s': %s", cls.__name__, path, e)
+                        return index
+
+                if state.get('version') != cls.VERSION:
+                        logger.warning("Ignoring %s '%s' built by another version.", cls.__name__, path)
+                        return index
+                for field in cls.STATE_FIELDS:
+                        setattr(index, field, state[field])
+                return index
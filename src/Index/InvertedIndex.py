@@ -0,0 +1,131 @@
+import os
+from src.ExtractCV import ExtractCV
+from src.Index.CorpusIndex import CorpusIndex, INDEX_DIR
+
+class InvertedIndex(CorpusIndex):
+        """
+        Positional inverted index over the cleaned text of the CV corpus.
+
+        Each document is tokenized once (the cleaned text from ExtractCV.to_continuous_string is
+        split on spaces) into postings of term -> {document: [positions]}. Single-word keywords are
+        answered straight from the postings, multi-word keywords by intersecting the positions.
+        Matches are whole words only; KMP/BM remain the way to get substring matches.
+        The number of tokens of each document and of the corpus are kept for the BM25 ranking.
+        """
+
+        VERSION = 2
+        STATE_FIELDS = ('postings', 'doc_lengths', 'total_length', 'doc_terms', 'doc_signatures')
+        DEFAULT_PATH = os.path.join(INDEX_DIR, 'inverted_index.pkl')
+
+        def __init__(self):
+                """Initializes an empty index."""
+                super().__init__()
+                self.postings = {}        # term -> {doc_id: [positions]}
+                self.doc_lengths = {}     # doc_id -> number of tokens
+                self.total_length = 0     # number of tokens of every document
+                self.doc_terms = {}       # doc_id -> distinct terms, used to remove a document
+
+        def add_document(self, doc_id: str, text: str):
+                """
+                Indexes the cleaned text of a document, replacing its previous version if any.
+                @param doc_id (str): The document identifier (the CV path).
+                @param text (str): The cleaned text of the document.
+                """
+                if doc_id in self.doc_terms:
+                        self.remove_document(doc_id)
+
+                doc_postings = {}
+                tokens = text.split()
+                for position, token in enumerate(tokens):
+                        positions = doc_postings.get(token)
+                        if positions is None:
+                                doc_postings[token] = [position]
+                        else:
+                                positions.append(position)
+
+                postings = self.postings
+                for term, positions in doc_postings.items():
+                        entry = postings.get(term)
+                        if entry is None:
+                                postings[term] = {doc_id: positions}
+                        else:
+                                entry[doc_id] = positions
+                self.doc_lengths[doc_id] = len(tokens)
+                self.total_length += len(tokens)
+                self.doc_terms[doc_id] = tuple(doc_postings)
+                self.doc_signatures[doc_id] = self._signature(text)
+
+        def remove_document(self, doc_id: str):
+                """Removes a document and all of its postings from the index."""
+                for term in self.doc_terms.pop(doc_id, ()):
+                        entry = self.postings.get(term)
+                        if entry is not None:
+                                entry.pop(doc_id, None)
+                                if not entry:
+                                        del self.postings[term]
+                self.total_length -= self.doc_lengths.pop(doc_id, 0)
+                self.doc_signatures.pop(doc_id, None)
+
+        def average_length(self) -> float:
+                """Returns the average number of tokens of the indexed documents, 0 for an empty index."""
+                return self.total_length / len(self.doc_lengths) if self.doc_lengths else 0
+
+        def document_frequency(self, keyword: str) -> int:
+                """Returns the number of indexed documents containing the keyword as whole words."""
+                terms = ExtractCV.normalize_text(keyword).split()
+                if len(terms) == 1:
+                        return len(self.postings.get(terms[0], ()))
+                return len(self.phrase_counts(keyword))
+
+        def term_counts(self, term: str, doc_ids=None) -> dict:
+                """
+                Returns the number of occurrences of a single term in every document containing it.
+                @param doc_ids (iterable): Documents to count the term in, None for every document.
+                @return: A dict doc_id -> count.
+                """
+                entry = self.postings.get(term)
+                if not entry:
+                        return {}
+                if doc_ids is not None:
+                        return {doc_id: len(entry[doc_id]) for doc_id in doc_ids if doc_id in entry}
+                return {doc_id: len(positions) for doc_id, positions in entry.items()}
+
+        def phrase_counts(self, keyword: str, doc_ids=None) -> dict:
+                """
+                Returns the number of whole-word occurrences of a keyword in every document containing it.
+                The keyword is normalized like the CV text; multi-word keywords are matched by positional intersection.
+                @param keyword (str): The keyword, e.g. 'python' or 'project management'.
+                @param doc_ids (iterable): Documents to count the keyword in, None for every document.
+                @return: A dict doc_id -> count.
+                """
+                terms = ExtractCV.normalize_text(keyword).split()
+                if not terms:
+                        return {}
+                if len(terms) == 1:
+                        return self.term_counts(terms[0], doc_ids)
+
+                entries = [self.postings.get(term) for term in terms]
+                if not all(entries):
+                        return {}
+
+                # Only documents containing every term can contain the phrase; start from the rarest term
+                candidates = set(min(entries, key=len) if doc_ids is None else doc_ids)
+                for entry in entries:
+                        candidates.intersection_update(entry)
+
+                counts = {}
+                for doc_id in candidates:
+                        first_positions = entries[0][doc_id]
+                        following = [set(entry[doc_id]) for entry in entries[1:]]
+                        count = 0
+                        for position in first_positions:
+                                offset = 1
+                                for positions in following:
+                                        if position + offset not in positions:
+                                                break
+                                        offset += 1
+                                else:
+                                        count += 1
+                        if count:
+                                counts[doc_id] = count
+                return counts
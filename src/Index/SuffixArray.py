@@ -0,0 +1,175 @@
+import os
+from array import array
+from src.Index.CorpusIndex import CorpusIndex, INDEX_DIR
+
+class SuffixArrayIndex(CorpusIndex):
+        """
+        Suffix arrays of the cleaned text of every CV, one per document.
+
+        The occurrences of a pattern in a CV are a contiguous range of its suffix array, found with two
+        binary searches in O(m log n), whatever the length of the CV. Each array is built once, when its
+        document is added or changed, and saved with the index, so a corpus update costs the build of the
+        changed CVs only, never of the whole corpus. A query is answered CV by CV, in O(m log n) per CV.
+        """
+
+        VERSION = 2
+        STATE_FIELDS = ('doc_texts', 'doc_arrays', 'doc_signatures')
+        DEFAULT_PATH = os.path.join(INDEX_DIR, 'suffix_array.pkl')
+
+        def __init__(self):
+                """Initializes an empty index."""
+                super().__init__()
+                self.doc_texts = {}            # doc_id -> indexed text
+                self.doc_arrays = {}           # doc_id -> start offsets of the sorted suffixes of its text
+                self.pending = {}              # doc_id -> new text, or None for a removal, applied on rebuild
+                self.doc_lookup = None         # (hash, length) of a document text -> doc_ids with that key
+
+        def add_document(self, doc_id: str, text: str):
+                """Schedules the cleaned text of a document to be indexed on the next rebuild."""
+                self.pending[doc_id] = text
+                self.doc_signatures[doc_id] = self._signature(text)
+
+        def remove_document(self, doc_id: str):
+                """Schedules a document to be removed on the next rebuild."""
+                self.pending[doc_id] = None
+                self.doc_signatures.pop(doc_id, None)
+
+        def rebuild(self) -> int:
+                """
+                Applies the pending changes: builds the suffix arrays of the added and changed documents only.
+                @return: The number of suffix arrays built.
+                """
+                if not self.pending:
+                        return 0
+                built = 0
+                for doc_id, text in self.pending.items():
+                        # The lookup is updated for the changed documents only, as CVs are added one at a time while they stream
+                        previous = self.doc_texts.pop(doc_id, None)
+                        if previous is not None and self.doc_lookup is not None:
+                                self.doc_lookup[self._lookup_key(previous)].remove(doc_id)
+                        if text is None:
+                                self.doc_arrays.pop(doc_id, None)
+                        else:
+                                self.doc_texts[doc_id] = text
+                                self.doc_arrays[doc_id] = self.build_suffix_array(text)
+                                if self.doc_lookup is not None:
+                                        self.doc_lookup.setdefault(self._lookup_key(text), []).append(doc_id)
+                                built += 1
+                self.pending = {}
+                return built
+
+        @staticmethod
+        def build_suffix_array(text: str, prefix_length: int = 8) -> array:
+                """
+                Build the suffix array of a text by prefix doubling, as 64-bit offsets. Suffixes are first sorted by their first
+                prefix_length characters, then repeatedly by pairs of ranks covering twice as many characters,
+                until every rank is distinct.
+                """
+                n = len(text)
+                if n == 0:
+                        return array('q')
+
+                def assign_ranks(sa, key):
+                        rank = [0] * n
+                        r = 0
+                        previous = key[sa[0]]
+                        for i in sa:
+                                if key[i] != previous:
+                                        r += 1
+                                        previous = key[i]
+                                rank[i] = r
+                        return rank, r
+
+                prefixes = [text[i:i + prefix_length] for i in range(n)]
+                sa = sorted(range(n), key=prefixes.__getitem__)
+                rank, max_rank = assign_ranks(sa, prefixes)
+                del prefixes
+
+                k = prefix_length
+                while max_rank < n - 1 and k < n:
+                        # Key of a suffix: (rank of its first k characters, rank of the next k), 0 past the end
+                        base = max_rank + 2
+                        shifted = rank[k:] + [-1] * min(k, n)
+                        key = [r * base + s + 1 for r, s in zip(rank, shifted)]
+                        sa.sort(key=key.__getitem__)
+                        rank, max_rank = assign_ranks(sa, key)
+                        k *= 2
+                return array('q', sa)
+
+        @staticmethod
+        def _range(text: str, sa: array, pattern: str) -> tuple:
+                """Returns the [start, end) range of a suffix array of text whose suffixes start with the pattern."""
+                m = len(pattern)
+
+                lo, hi = 0, len(sa)
+                while lo < hi:
+                        mid = (lo + hi) // 2
+                        if text[sa[mid]:sa[mid] + m] < pattern:
+                                lo = mid + 1
+                        else:
+                                hi = mid
+                start = lo
+
+                hi = len(sa)
+                while lo < hi:
+                        mid = (lo + hi) // 2
+                        if text[sa[mid]:sa[mid] + m] == pattern:
+                                lo = mid + 1
+                        else:
+                                hi = mid
+                return start, lo
+
+        def _count_in(self, doc_id: str, pattern: str) -> int:
+                if not pattern:
+                        return 0
+                start, end = self._range(self.doc_texts[doc_id], self.doc_arrays[doc_id], pattern)
+                return end - start
+
+        @staticmethod
+        def _lookup_key(text: str) -> tuple:
+                return hash(text), len(text)
+
+        def find_document(self, text: str):
+                """
+                Returns the doc_id of an indexed text, or None if the text is not indexed.
+                Python caches the hash of a string, so repeated lookups of the same text are O(1);
+                the text is then compared with the indexed one, so a hash collision can not select another CV.
+                """
+                self.rebuild()
+                if self.doc_lookup is None:
+                        self.doc_lookup = {}
+                        for doc_id, doc_text in self.doc_texts.items():
+                                self.doc_lookup.setdefault(self._lookup_key(doc_text), []).append(doc_id)
+                for doc_id in self.doc_lookup.get(self._lookup_key(text), ()):
+                        if self.doc_texts[doc_id] == text:
+                                return doc_id
+                return None
+
+        def count(self, text: str, pattern: str):
+                """
+                Returns the number of occurrences of the pattern in an indexed text.
+                @return: The count, or None if the text is not indexed.
+                """
+                doc_id = self.find_document(text)
+                if doc_id is None:
+                        return None
+                return self._count_in(doc_id, pattern)
+
+        def offsets(self, text: str, pattern: str):
+                """
+                Returns the offsets of the occurrences of the pattern in an indexed text, in increasing order.
+                @return: The list of offsets, or None if the text is not indexed.
+                """
+                doc_id = self.find_document(text)
+                if doc_id is None:
+                        return None
+                if not pattern:
+                        return []
+                sa = self.doc_arrays[doc_id]
+                start, end = self._range(text, sa, pattern)
+                return sorted(sa[start:end])
+
+        def save(self, path: str = None):
+                """Builds the pending suffix arrays and writes the index to disk."""
+                self.rebuild()
+                super().save(path)
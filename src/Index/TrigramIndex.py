@@ -0,0 +1,112 @@
+import os
+from collections import Counter
+from src.Index.CorpusIndex import CorpusIndex, INDEX_DIR
+
+class TrigramIndex(CorpusIndex):
+        """
+        Trigram index over the cleaned text of the CV corpus, used as a prefilter for substring search.
+
+        Every occurrence of a keyword contains each of its trigrams, so only documents containing all
+        of them can match; KMP/BM/Aho-Corasick then verify those candidates and count the exact matches.
+        Keywords shorter than three characters cannot be filtered and match every document.
+        The number of occurrences of each trigram in each document is stored as well.
+        """
+
+        STATE_FIELDS = ('postings', 'doc_trigrams', 'doc_signatures')
+        DEFAULT_PATH = os.path.join(INDEX_DIR, 'trigram_index.pkl')
+
+        def __init__(self):
+                """Initializes an empty index."""
+                super().__init__()
+                self.postings = {}      # trigram -> {doc_id: occurrences}
+                self.doc_trigrams = {}  # doc_id -> distinct trigrams, used to remove a document
+
+        def add_document(self, doc_id: str, text: str):
+                """
+                Indexes the trigrams of the cleaned text of a document, replacing its previous version if any.
+                @param doc_id (str): The document identifier (the CV path).
+                @param text (str): The cleaned text of the document.
+                """
+                if doc_id in self.doc_signatures:
+                        self.remove_document(doc_id)
+
+                trigrams = Counter(text[i:i + 3] for i in range(len(text) - 2))
+                postings = self.postings
+                for trigram, count in trigrams.items():
+                        entry = postings.get(trigram)
+                        if entry is None:
+                                postings[trigram] = {doc_id: count}
+                        else:
+                                entry[doc_id] = count
+                self.doc_trigrams[doc_id] = tuple(trigrams)
+                self.doc_signatures[doc_id] = self._signature(text)
+
+        def remove_document(self, doc_id: str):
+                """Removes a document and all of its postings from the index."""
+                for trigram in self.doc_trigrams.pop(doc_id, ()):
+                        entry = self.postings.get(trigram)
+                        if entry is not None:
+                                entry.pop(doc_id, None)
+                                if not entry:
+                                        del self.postings[trigram]
+                self.doc_signatures.pop(doc_id, None)
+
+        @staticmethod
+        def _trigrams(keyword: str) -> set:
+                return {keyword[i:i + 3] for i in range(len(keyword) - 2)}
+
+        def candidates(self, keyword: str):
+                """
+                Returns the documents that contain every trigram of the keyword.
+                @param keyword (str): The keyword, as it will be searched in the cleaned text.
+                @return: A set of doc_ids, or None if the keyword is too short to be filtered.
+                """
+                trigrams = self._trigrams(keyword)
+                if not trigrams:
+                        return None
+
+                entries = [self.postings.get(trigram) for trigram in trigrams]
+                if not all(entries):
+                        return set()
+                entries.sort(key=len)
+                result = set(entries[0])
+                for entry in entries[1:]:
+                        result.intersection_update(entry)
+                        if not result:
+                                break
+                return result
+
+        def may_contain(self, doc_id: str, keyword: str) -> bool:
+                """
+                Tells whether an indexed document contains every trigram of the keyword, without
+                building the candidate set of the whole corpus. Used when documents are searched one by one.
+                @return: False only if the document cannot contain the keyword.
+                """
+                postings = self.postings
+                for trigram in self._trigrams(keyword):
+                        entry = postings.get(trigram)
+                        if entry is None or doc_id not in entry:
+                                return False
+                return True
+
+        def upper_bound(self, doc_id: str, keyword: str):
+                """
+                Returns the most occurrences the keyword can have in an indexed document. Every occurrence
+                of the keyword starts a distinct occurrence of each of its trigrams, so the keyword occurs
+                at most as often as its rarest trigram.
+                @return: The bound (0 if the document cannot contain the keyword), or None if the keyword
+                         is too short to be bounded.
+                """
+                trigrams = self._trigrams(keyword)
+                if not trigrams:
+                        return None
+                postings = self.postings
+                bound = None
+                for trigram in trigrams:
+                        entry = postings.get(trigram)
+                        count = entry.get(doc_id, 0) if entry is not None else 0
+                        if count == 0:
+                                return 0
+                        if bound is None or count < bound:
+                                bound = count
+                return bound
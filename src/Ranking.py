@@ -0,0 +1,123 @@
+import heapq
+import math
+
+class TopN:
+        """
+        Keeps the n best items of a stream by score, in a bounded min-heap of n entries.
+
+        Ties are broken by order: of two items with the same score, the one with the lower order ranks
+        first. The order defaults to the arrival order, as with a stable sort of the whole stream.
+        Memory is O(n) whatever the number of items pushed, and an item that cannot enter costs one comparison.
+        """
+
+        def __init__(self, n: int):
+                """
+                Initializes an empty selection.
+                @param n (int): Number of items to keep.
+                """
+                self.n = n
+                self.heap = []    # (score, -order, item); heap[0] is the worst item kept
+                self.pushed = 0   # number of items offered so far
+
+        def __len__(self) -> int:
+                return len(self.heap)
+
+        def threshold(self):
+                """Returns the score an item must exceed to enter, or None while fewer than n items are kept."""
+                return self.heap[0][0] if self.n > 0 and len(self.heap) >= self.n else None
+
+        def __iter__(self):
+                """Iterates over the items kept, in no particular order."""
+                return (entry[2] for entry in self.heap)
+
+        def push(self, score, item, order: int = None) -> bool:
+                """
+                Offers an item.
+                @param order (int): Rank of the item among the items with the same score, lowest first,
+                                    e.g. its position in the database; the arrival order by default.
+                                    Orders must be unique.
+                @return: True if the item is among the n best items pushed so far.
+                """
+                entry = (score, -(self.pushed if order is None else order), item)
+                self.pushed += 1
+                if len(self.heap) < self.n:
+                        heapq.heappush(self.heap, entry)
+                        return True
+                # The order is unique, so the items themselves are never compared
+                if self.n > 0 and entry[:2] > self.heap[0][:2]:
+                        heapq.heapreplace(self.heap, entry)
+                        return True
+                return False
+
+        def items(self) -> list:
+                """Returns the items kept, best first."""
+                return [entry[2] for entry in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]
+
+# Okapi BM25 parameters: term frequency saturation and document length normalization
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+class BM25:
+        """
+        Okapi BM25 relevance of the CVs matching a query.
+
+        The raw number of occurrences favours long CVs and common keywords; BM25 saturates the
+        frequency of each keyword (k1), normalizes it by the length of the CV relative to the
+        average (b), and weights each keyword by its inverse document frequency, so a match of a
+        rare keyword in a short CV ranks first. The corpus statistics (number of documents and their
+        lengths) are precomputed by the inverted index, so a query does not measure any text.
+        """
+
+        def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+                """
+                @param k1 (float): Term frequency saturation; 0 ranks by matched keywords only.
+                @param b (float): Length normalization, from 0 (none) to 1 (full).
+                """
+                if k1 < 0 or not 0 <= b <= 1:
+                        raise ValueError(f"Invalid BM25 parameters k1={k1}, b={b}")
+                self.k1 = k1
+                self.b = b
+
+        @staticmethod
+        def idf(document_frequency: int, documents: int) -> float:
+                """Returns the inverse document frequency of a keyword, never negative."""
+                return math.log(1 + (documents - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        def score_all(self, matches: dict, doc_lengths: dict, documents: int, average_length: float,
+                      document_frequencies: dict = None) -> dict:
+                """
+                Scores every matching document of a query in one pass.
+                @param matches (dict): doc_id -> {keyword: occurrences} of the documents with a match.
+                @param doc_lengths (dict): doc_id -> number of words, e.g. InvertedIndex.doc_lengths; only the
+                                           matching documents are looked up.
+                @param documents (int): Number of documents of the corpus.
+                @param average_length (float): Average number of words of a document of the corpus.
+                @param document_frequencies (dict): keyword -> number of documents containing it, e.g. from the inverted
+                                                    index. The keywords missing from it, such as substrings, are counted
+                                                    in the matches.
+                @return: A dict doc_id -> BM25 score.
+                """
+                if not matches or not documents:
+                        return {}
+                average_length = average_length or 1
+
+                counted = {}
+                for matched_keywords in matches.values():
+                        for keyword in matched_keywords:
+                                counted[keyword] = counted.get(keyword, 0) + 1
+                document_frequencies = {**counted, **(document_frequencies or {})}
+                # Per-keyword and per-length factors are computed once, not once per (document, keyword)
+                weights = {
+                        keyword: self.idf(document_frequencies[keyword], documents) * (self.k1 + 1)
+                        for keyword in counted
+                }
+                k1, b = self.k1, self.b
+                length_factor = k1 * b / average_length
+
+                scores = {}
+                for doc_id, matched_keywords in matches.items():
+                        norm = k1 * (1 - b) + length_factor * doc_lengths.get(doc_id, average_length)
+                        scores[doc_id] = sum(
+                                weights[keyword] * tf / (tf + norm) for keyword, tf in matched_keywords.items()
+                        )
+                return scores
@@ -0,0 +1,114 @@
+from collections import deque
+
+'''
+Aho-Corasick class for searching many patterns in CV text at once.
+All patterns are compiled into one automaton, so the cleaned text of a CV
+(see ExtractCV.get_cleaned_text) is scanned exactly once no matter how many keywords are searched.
+'''
+class AhoCorasick:
+        def __init__(self, patterns):
+                '''Initialize the AhoCorasick class by compiling the patterns into an automaton.'''
+                self.patterns = list(patterns)
+                self.build_automaton(self.patterns)
+
+        def get_patterns(self):
+                '''Get the compiled patterns.'''
+                return self.patterns
+
+        def build_automaton(self, patterns):
+                '''
+                Build the trie (goto function), the failure links and the BFS order of the states.
+                State 0 is the root; terminal[i] is the state reached by the i-th pattern.
+                '''
+                self.goto = [{}]
+                self.fail = [0]
+                self.terminal = []
+
+                # https://cp-algorithms.com/string/aho_corasick.html
+                for pattern in patterns:
+                        state = 0
+                        for ch in pattern:
+                                nxt = self.goto[state].get(ch)
+                                if nxt is None:
+                                        nxt = len(self.goto)
+                                        self.goto[state][ch] = nxt
+                                        self.goto.append({})
+                                        self.fail.append(0)
+                                state = nxt
+                        self.terminal.append(state)
+
+                # Breadth-first traversal so the failure link of a state is computed before its children
+                self.order = []
+                queue = deque(self.goto[0].values())
+                while queue:
+                        state = queue.popleft()
+                        self.order.append(state)
+                        for ch, child in self.goto[state].items():
+                                queue.append(child)
+                                fallback = self.fail[state]
+                                while fallback and ch not in self.goto[fallback]:
+                                        fallback = self.fail[fallback]
+                                self.fail[child] = self.goto[fallback].get(ch, 0)
+
+        def search(self, text):
+                '''
+                Count the occurrences (overlapping included) of every pattern in the text in a single pass.
+                @return: A list of counts, aligned with the compiled patterns.
+                '''
+                goto = self.goto
+                fail = self.fail
+                visits = [0] * len(goto)
+
+                state = 0
+                for ch in text:
+                        while True:
+                                nxt = goto[state].get(ch)
+                                if nxt is not None:
+                                        state = nxt
+                                        break
+                                if state == 0:
+                                        break
+                                state = fail[state]
+                        visits[state] += 1
+
+                # Every visit of a state is also an occurrence of the patterns ending at its failure links,
+                # so push the visit counts up the failure tree from the deepest states to the root
+                for state in reversed(self.order):
+                        visits[fail[state]] += visits[state]
+
+                return [visits[state] if pattern else 0 for pattern, state in zip(self.patterns, self.terminal)]
+
+        def finditer(self, text, index, max_count=None):
+                '''
+                Lazily yield the start offsets of the occurrences (overlapping included) of the index-th pattern.
+                @param max_count: Stop after this many matches, None to find them all.
+                '''
+                pattern = self.patterns[index]
+                if not pattern or (max_count is not None and max_count <= 0):
+                        return
+                # A state ends an occurrence when its chain of failure links passes through the terminal state
+                # of the pattern; failure links point to shallower states, which the BFS order lists first
+                ends = {self.terminal[index]}
+                for state in self.order:
+                        if self.fail[state] in ends:
+                                ends.add(state)
+
+                goto = self.goto
+                fail = self.fail
+                m = len(pattern)
+                found = 0
+                state = 0
+                for i, ch in enumerate(text):
+                        while True:
+                                nxt = goto[state].get(ch)
+                                if nxt is not None:
+                                        state = nxt
+                                        break
+                                if state == 0:
+                                        break
+                                state = fail[state]
+                        if state in ends:
+                                yield i - m + 1
+                                found += 1
+                                if found == max_count:
+                                        return
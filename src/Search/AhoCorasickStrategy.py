@@ -0,0 +1,71 @@
+import logging
+from collections import OrderedDict
+from src.Search.SearchStrategy import SearchStrategy
+from src.Search.AhoCorasick import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
+# Number of compiled automata kept across queries
+AUTOMATON_CACHE_SIZE = 8
+
+"""
+Implementation of the SearchStrategy interface using the Aho-Corasick algorithm.
+prepare() compiles every keyword of a query into one automaton, which is reused for every CV,
+including those searched for only a subset of the keywords. Recent automata are kept across queries.
+"""
+class AhoCorasickStrategy(SearchStrategy):
+
+    def __init__(self):
+        self.automaton = None
+        self.automata = OrderedDict()
+
+    def _compile(self, patterns) -> AhoCorasick:
+        key = tuple(patterns)
+        automaton = self.automata.get(key)
+        if automaton is None:
+            automaton = AhoCorasick(key)
+            self.automata[key] = automaton
+            if len(self.automata) > AUTOMATON_CACHE_SIZE:
+                self.automata.popitem(last=False)
+        else:
+            self.automata.move_to_end(key)
+        return automaton
+
+    def prepare(self, patterns: list) -> dict:
+        self.automaton = self._compile(patterns)
+        return {pattern: pattern for pattern in patterns}
+
+    def search(self, text: str, pattern: str) -> int:
+
+        logger.debug("Using Aho-Corasick search algorithm...")
+
+        pattern = self.pattern_text(pattern)
+        results = self.search_many(text, [pattern])[pattern]
+
+        if(results):
+                logger.debug("Found %d matches for pattern '%s' in the text.", results, pattern)
+                return results
+        else:
+                logger.debug("No matches found for pattern '%s' in the text.", pattern)
+                return 0
+
+    def search_many(self, text: str, patterns: list) -> dict:
+
+        logger.debug("Using Aho-Corasick search algorithm...")
+
+        patterns = [self.pattern_text(pattern) for pattern in patterns]
+        # The automaton of the current query also answers any subset of its keywords
+        automaton = self.automaton
+        if automaton is None or not set(patterns).issubset(automaton.get_patterns()):
+            automaton = self._compile(patterns)
+        counts = dict(zip(automaton.get_patterns(), automaton.search(text)))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scanned the text once for %d pattern(s), %d matched.", len(automaton.get_patterns()), sum(1 for c in counts.values() if c))
+        return {pattern: counts[pattern] for pattern in patterns}
+
+    def finditer(self, text: str, pattern: str, max_count: int = None):
+        pattern = self.pattern_text(pattern)
+        automaton = self.automaton
+        if automaton is None or pattern not in automaton.get_patterns():
+            automaton = self._compile([pattern])
+        return automaton.finditer(text, automaton.get_patterns().index(pattern), max_count)
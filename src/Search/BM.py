@@ -1,90 +1,234 @@
-NO_OF_CHARS = 256
+import logging
+from functools import lru_cache
 
 '''
-BM (Boyer-Moore) class for handling CV text extraction and manipulation.
-This class searches for a word matching the string from ExtractCV class
-using the Boyer-Moore algorithm.
+BM (Boyer-Moore) class for searching CV text.
+This class searches for a word matching the string in the cleaned text of a CV
+(see ExtractCV.get_cleaned_text) using the Boyer-Moore algorithm.
+The pattern may be given as a string or as a BMPattern from compile_pattern,
+whose shift tables are built once and shared by every document.
 '''
+
+# Patterns up to this length are searched with the Horspool variant,
+# where the good suffix rule rarely shifts further than the bad character rule
+HORSPOOL_MAX_LENGTH = 4
+
+# Number of compiled patterns kept across documents and queries
+PATTERN_CACHE_SIZE = 128
+
+logger = logging.getLogger(__name__)
+
 class BM:
-        def __init__(self, pattern, cv):
+        def __init__(self, pattern, text):
                 '''
-                Initialize the BM class with a search pattern and an ExtractCV instance.
+                Initialize the BM class with a search pattern (or compiled pattern) and the cleaned CV text.
                 '''
-                self.cv = cv
-                self.cv.extract()
-                self.pattern = pattern
-                self.bad_char = self.bad_char_heuristic(pattern)
+                self.text = text
+                self.set_pattern(pattern)
 
         def set_pattern(self, pattern):
                 '''
                 Set a new search pattern.
                 '''
-                self.pattern = pattern
-                self.bad_char = self.bad_char_heuristic(pattern)
+                compiled = pattern if isinstance(pattern, BMPattern) else compile_pattern(pattern)
+                self.pattern = compiled.pattern
+                self.bad_char = compiled.bad_char
+                self.good_suffix = compiled.good_suffix
+                self.horspool_shift = compiled.horspool_shift
 
         def get_pattern(self):
                 '''Get the current search pattern.'''
                 return self.pattern
 
-        def set_cv(self, cv):
-                '''Set a new ExtractCV instance.'''
-                self.cv = cv
+        def set_text(self, text):
+                '''Set a new cleaned CV text.'''
+                self.text = text
 
-        def get_cv(self):
-                '''Get the current ExtractCV instance.'''
-                return self.cv
+        def get_text(self):
+                '''Get the current cleaned CV text.'''
+                return self.text
 
         # https://www.geeksforgeeks.org/boyer-moore-algorithm-for-pattern-searching/
-        def bad_char_heuristic(self, pattern):
+        @staticmethod
+        def bad_char_heuristic(pattern):
                 '''
                 Compute the bad character heuristic table for the Boyer-Moore algorithm.
+                The table is a dict keyed by character, so any Unicode code point is supported;
+                characters absent from the pattern map to -1 through dict.get.
                 '''
-                m = len(pattern)
-                # Initialize all occurrences as -1
-                bad_char = [-1] * NO_OF_CHARS
+                bad_char = {}
 
                 # Fill the actual value of the last occurrence of a character
-                for i in range(m):
-                        bad_char[ord(pattern[i])] = i
+                for i, ch in enumerate(pattern):
+                        bad_char[ch] = i
                 return bad_char
 
-        def search(self):
+        # https://www.geeksforgeeks.org/boyer-moore-algorithm-good-suffix-heuristic/
+        @staticmethod
+        def good_suffix_heuristic(pattern):
+                '''
+                Compute the (strong) good suffix shift table for the Boyer-Moore algorithm.
+                shift[j + 1] is the safe shift after a mismatch at pattern[j],
+                shift[0] is the shift after a full match.
+                '''
+                m = len(pattern)
+                shift = [0] * (m + 1)
+                border = [0] * (m + 1)
+
+                # Case 1: the matched suffix occurs elsewhere in the pattern
+                i = m
+                j = m + 1
+                border[i] = j
+                while i > 0:
+                        while j <= m and pattern[i - 1] != pattern[j - 1]:
+                                if shift[j] == 0:
+                                        shift[j] = j - i
+                                j = border[j]
+                        i -= 1
+                        j -= 1
+                        border[i] = j
+
+                # Case 2: only a prefix of the pattern matches a part of the matched suffix
+                j = border[0]
+                for i in range(m + 1):
+                        if shift[i] == 0:
+                                shift[i] = j
+                        if i == j:
+                                j = border[j]
+                return shift
+
+        def finditer(self, max_count=None):
                 '''
-                Search for the pattern in the CV text using the Boyer-Moore algorithm
-                with the Bad Character Heuristic.
+                Lazily yield the offsets of the pattern in the CV text using the Boyer-Moore algorithm
+                with both the Bad Character and the Good Suffix Heuristics.
+                Short patterns are delegated to finditer_horspool.
+                @param max_count: Stop after this many matches, None to find them all.
                 '''
-                text = ""
-                text = self.cv.get_cleaned_text()
+                text = self.text
+                pattern = self.pattern
 
                 n = len(text)
-                m = len(self.pattern)
-                res = []
+                m = len(pattern)
 
                 # Warning for empty pattern or text
                 if m == 0:
-                        print(f"Warning: Empty pattern provided")
-                        return res
+                        logger.debug("Empty pattern provided")
+                        return
                 if n == 0:
-                        print(f"Warning: Empty text provided")
-                        return res
+                        logger.debug("Empty text provided")
+                        return
+                if m <= HORSPOOL_MAX_LENGTH:
+                        yield from self.finditer_horspool(max_count)
+                        return
+                if max_count is not None and max_count <= 0:
+                        return
 
+                bad_char = self.bad_char
+                good_suffix = self.good_suffix
+                last = pattern[-1]
+                found = 0
                 s = 0  # shift
                 while s <= n - m:
-                        j = m - 1
-                        while j >= 0 and self.pattern[j] == text[s + j]:
-                                j -= 1
+                        # Most windows already mismatch on their last character
+                        ch = text[s + m - 1]
+                        if ch != last:
+                                s += max(good_suffix[m], m - 1 - bad_char.get(ch, -1))
+                                continue
+                        if text.startswith(pattern, s):
+                                j = -1
+                        else:
+                                j = m - 2
+                                while pattern[j] == text[s + j]:
+                                        j -= 1
                         if j < 0:
-                                res.append(s)
-
-                                if s + m < n:
-                                        char_after_match_val = self.bad_char[ord(text[s + m])]
-                                        shift_val = m - char_after_match_val
-                                        s += shift_val
-                                else:
-                                        s += 1
+                                yield s
+                                found += 1
+                                if found == max_count:
+                                        return
+                                # Shift by the period of the pattern so overlapping matches are kept
+                                s += good_suffix[0]
                         else:
-                                # Mismatch at pattern[j] and text[s+j]. Shift pattern
-                                bad_char_in_text_val = self.bad_char[ord(text[s + j])]
-                                shift = j - bad_char_in_text_val
-                                s += max(1, shift)
-                return res
\ No newline at end of file
+                                # Mismatch at pattern[j] and text[s+j], take the larger of both heuristics
+                                bad_char_shift = j - bad_char.get(text[s + j], -1)
+                                s += max(good_suffix[j + 1], bad_char_shift)
+
+        def search(self):
+                '''
+                Search for the pattern in the CV text using the Boyer-Moore algorithm.
+                @return: The list of match offsets.
+                '''
+                return list(self.finditer())
+
+        def count(self):
+                '''Count the occurrences of the pattern in the CV text without building a list of offsets.'''
+                count = 0
+                for _ in self.finditer():
+                        count += 1
+                return count
+
+        @staticmethod
+        def horspool_heuristic(pattern):
+                '''
+                Compute the shift table of the Horspool variant: the distance from the last occurrence
+                of each character (except the last one) to the end of the pattern.
+                '''
+                m = len(pattern)
+                shift = {}
+                for i in range(m - 1):
+                        shift[pattern[i]] = m - 1 - i
+                return shift
+
+        def finditer_horspool(self, max_count=None):
+                '''
+                Lazily yield the offsets of the pattern in the CV text using the Boyer-Moore-Horspool variant.
+                Each window is shifted by the distance of its last character to the end of the pattern,
+                and verified with a single string comparison.
+                @param max_count: Stop after this many matches, None to find them all.
+                '''
+                text = self.text
+                pattern = self.pattern
+
+                n = len(text)
+                m = len(pattern)
+                if m == 0 or n < m:
+                        return
+                if max_count is not None and max_count <= 0:
+                        return
+
+                shift = self.horspool_shift
+                last = pattern[-1]
+                found = 0
+                s = 0
+                while s <= n - m:
+                        ch = text[s + m - 1]
+                        if ch == last and text.startswith(pattern, s):
+                                yield s
+                                found += 1
+                                if found == max_count:
+                                        return
+                        s += shift.get(ch, m)
+
+        def search_horspool(self):
+                '''Search for the pattern in the CV text using the Boyer-Moore-Horspool variant.'''
+                return list(self.finditer_horspool())
+
+
+'''
+BMPattern class holding a pattern together with its Boyer-Moore shift tables.
+'''
+class BMPattern:
+        def __init__(self, pattern):
+                '''Compile the pattern for the Boyer-Moore algorithm.'''
+                self.pattern = pattern
+                self.bad_char = BM.bad_char_heuristic(pattern)
+                self.good_suffix = BM.good_suffix_heuristic(pattern)
+                self.horspool_shift = BM.horspool_heuristic(pattern)
+
+        def __str__(self):
+                return self.pattern
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern):
+        '''Compile a pattern for the Boyer-Moore algorithm, reusing recently compiled patterns.'''
+        return BMPattern(pattern)
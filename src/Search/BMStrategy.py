@@ -1,21 +1,34 @@
+import logging
 from src.Search.SearchStrategy import SearchStrategy
-from src.Search.BM import BM
+from src.Search.BM import BM, BMPattern, compile_pattern
+
+logger = logging.getLogger(__name__)
 
 """
 Implementation of the SearchStrategy interface using the BM algorithm.
+Patterns compiled through compile() are passed straight to BM,
+so searching a document does no pattern preprocessing.
+search() counts the matches without keeping their offsets; finditer() streams them.
 """
 class BMStrategy(SearchStrategy):
 
+    def compile(self, pattern: str) -> BMPattern:
+        return compile_pattern(pattern)
+
     def search(self, text: str, pattern: str) -> int:
 
-        print("Using BM search algorithm...")
+        logger.debug("Using BM search algorithm...")
 
         bm_instance = BM(pattern, text)
-        results = bm_instance.search()
+        results = bm_instance.count()
+        pattern = bm_instance.get_pattern()
 
         if(results):
-                print(f"Found {len(results)} matches for pattern '{pattern}' in the text.")
-                return len(results)
+                logger.debug("Found %d matches for pattern '%s' in the text.", results, pattern)
+                return results
         else:
-                print(f"No matches found for pattern '{pattern}' in the text.")
-                return 0
\ No newline at end of file
+                logger.debug("No matches found for pattern '%s' in the text.", pattern)
+                return 0
+
+    def finditer(self, text: str, pattern: str, max_count: int = None):
+        return BM(pattern, text).finditer(max_count)
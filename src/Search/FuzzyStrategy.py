@@ -1,12 +1,51 @@
+import logging
 from src.Search.SearchStrategy import SearchStrategy
+from src.Search.Myers import Myers
+
+logger = logging.getLogger(__name__)
 
 """
-Implementation of the SearchStrategy interface using the KMP algorithm.
+Implementation of the SearchStrategy interface using Myers' bit-parallel approximate matching.
+A substring matches when its edit distance to the pattern is at most max_distance,
+or int(len(pattern) * max_error_ratio) when no absolute threshold is given.
 """
 class FuzzyStrategy(SearchStrategy):
 
+    def __init__(self, max_distance: int = None, max_error_ratio: float = 0.2):
+        self.max_distance = max_distance
+        self.max_error_ratio = max_error_ratio
+
+    def get_threshold(self, pattern: str) -> int:
+        if self.max_distance is not None:
+            return self.max_distance
+        return int(len(pattern) * self.max_error_ratio)
+
+    def search_detailed(self, text: str, pattern: str) -> tuple:
+        """
+        Search for approximate occurrences of the pattern.
+        @return: A (count, best_distance) tuple, best_distance being None when nothing matched.
+        """
+        pattern = self.pattern_text(pattern)
+        threshold = self.get_threshold(pattern)
+        # A zero threshold is an exact search, which the caller has already run
+        if threshold <= 0:
+            return 0, None
+
+        matches = Myers(pattern, text, threshold).search()
+        if not matches:
+            return 0, None
+        return len(matches), min(distance for _, distance in matches)
+
     def search(self, text: str, pattern: str) -> int:
         
-        print("Using <insert Fuzzy Search Algorithm> search algorithm...")
+        logger.debug("Using Myers fuzzy search algorithm...")
+
+        pattern = self.pattern_text(pattern)
+        count, best_distance = self.search_detailed(text, pattern)
 
-        # logic for fuzzy search would go here
\ No newline at end of file
+        if(count):
+                logger.debug("Found %d approximate matches for pattern '%s' (best distance %s).", count, pattern, best_distance)
+                return count
+        else:
+                logger.debug("No approximate matches found for pattern '%s' in the text.", pattern)
+                return 0
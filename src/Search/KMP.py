@@ -1,32 +1,44 @@
+import logging
+from functools import lru_cache
+
+# Number of compiled patterns kept across documents and queries
+PATTERN_CACHE_SIZE = 128
+
+logger = logging.getLogger(__name__)
+
 '''
-KMP (Knuth-Morris-Pratt) class for handling CV text extraction and manipulation.
-This class searchs a word matching the string from ExtractCV class
+KMP (Knuth-Morris-Pratt) class for searching CV text.
+This class searchs a word matching the string in the cleaned text of a CV
+(see ExtractCV.get_cleaned_text), which the caller extracts once and reuses.
+The pattern may be given as a string or as a KMPPattern from compile_pattern,
+whose LPS array is built once and shared by every document.
 '''
 class KMP:
-        def __init__(self, pattern, cv):
-                '''Initialize the KMP class with a search string and an ExtractCV instance.'''
-                self.cv = cv
-                cv.extract()
-                self.pattern = pattern
-                self.lps = self.compute_lps(pattern)
+        def __init__(self, pattern, text):
+                '''Initialize the KMP class with a search string (or compiled pattern) and the cleaned CV text.'''
+                self.text = text
+                self.set_pattern(pattern)
 
         def set_pattern(self, pattern):
                 '''Set a new search pattern.'''
-                self.pattern = pattern
+                compiled = pattern if isinstance(pattern, KMPPattern) else compile_pattern(pattern)
+                self.pattern = compiled.pattern
+                self.lps = compiled.lps
         
         def get_pattern(self):
                 '''Get the current search pattern.'''
                 return self.pattern
 
-        def set_cv(self, cv):
-                '''Set a new ExtractCV instance.'''
-                self.cv = cv
+        def set_text(self, text):
+                '''Set a new cleaned CV text.'''
+                self.text = text
         
-        def get_cv(self):
-                '''Get the current ExtractCV instance.'''
-                return self.cv
+        def get_text(self):
+                '''Get the current cleaned CV text.'''
+                return self.text
         
-        def compute_lps(self, pattern):
+        @staticmethod
+        def compute_lps(pattern):
                 '''Compute the longest prefix suffix (LPS) array for the KMP algorithm.'''
                 lps = [0] * (len(pattern))
                 length = 0  # Length of the previous longest prefix suffix
@@ -49,20 +61,25 @@ class KMP:
                         
 
         # https://www.geeksforgeeks.org/kmp-algorithm-for-pattern-searching/
-        def search(self):
-                '''Search for the pattern in the CV text using KMP algorithm.'''
-                text = self.cv.get_cleaned_text()
+        def finditer(self, max_count=None):
+                '''
+                Lazily yield the offsets of the pattern in the CV text using KMP algorithm.
+                @param max_count: Stop after this many matches, None to find them all.
+                '''
+                text = self.text
                 n = len(text)
                 m = len(self.pattern)
-                res = []
 
                 # Warning for empty pattern or text
                 if m == 0:
-                        print(f"Warning: Empty pattern provided")
-                        return res
+                        logger.debug("Empty pattern provided")
+                        return
                 if n == 0:
-                        print(f"Warning: Empty text provided")
-                        return res
+                        logger.debug("Empty text provided")
+                        return
+                if max_count is not None and max_count <= 0:
+                        return
+                found = 0
 
                 # Pointers i and j, for traversing 
                 # the text and pattern
@@ -78,7 +95,10 @@ class KMP:
 
                                 # If the entire pattern is found
                                 if(j == m):
-                                        res.append(i - j)
+                                        yield i - j
+                                        found += 1
+                                        if found == max_count:
+                                                return
 
                                         # Reset j to the last matched prefix
                                         j = self.lps[j - 1]
@@ -91,11 +111,37 @@ class KMP:
                                 else:
                                         i += 1
                 except IndexError as e:
-                    print(f"IndexError at: text[{i}] (len={n}), pattern[{j}] (len={m})")
-                    print(f"Current text window: '{text[max(0, i-10):min(n, i+10)]}'")
-                    print(f"Pattern: '{self.pattern}'")
+                    logger.error("IndexError at: text[%d] (len=%d), pattern[%d] (len=%d)", i, n, j, m)
+                    logger.error("Current text window: '%s'", text[max(0, i-10):min(n, i+10)])
+                    logger.error("Pattern: '%s'", self.pattern)
                     raise
 
-                return res
+        def search(self):
+                '''Search for the pattern in the CV text using KMP algorithm.'''
+                return list(self.finditer())
+
+        def count(self):
+                '''Count the occurrences of the pattern in the CV text without building a list of offsets.'''
+                count = 0
+                for _ in self.finditer():
+                        count += 1
+                return count
+
+
+'''
+KMPPattern class holding a pattern together with its LPS array.
+'''
+class KMPPattern:
+        def __init__(self, pattern):
+                '''Compile the pattern for the KMP algorithm.'''
+                self.pattern = pattern
+                self.lps = KMP.compute_lps(pattern)
+
+        def __str__(self):
+                return self.pattern
 
 
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern):
+        '''Compile a pattern for the KMP algorithm, reusing recently compiled patterns.'''
+        return KMPPattern(pattern)
@@ -1,21 +1,34 @@
+import logging
 from src.Search.SearchStrategy import SearchStrategy
-from src.Search.KMP import KMP
+from src.Search.KMP import KMP, KMPPattern, compile_pattern
+
+logger = logging.getLogger(__name__)
 
 """
 Implementation of the SearchStrategy interface using the KMP algorithm.
+Patterns compiled through compile() are passed straight to KMP,
+so searching a document does no pattern preprocessing.
+search() counts the matches without keeping their offsets; finditer() streams them.
 """
 class KMPStrategy(SearchStrategy):
 
+    def compile(self, pattern: str) -> KMPPattern:
+        return compile_pattern(pattern)
+
     def search(self, text: str, pattern: str) -> int:
         
-        print("Using KMP search algorithm...")
+        logger.debug("Using KMP search algorithm...")
 
         kmp_instance = KMP(pattern, text)
-        results = kmp_instance.search()
+        results = kmp_instance.count()
+        pattern = kmp_instance.get_pattern()
 
         if(results):
-                print(f"Found {len(results)} matches for pattern '{pattern}' in the text.")
-                return len(results)
+                logger.debug("Found %d matches for pattern '%s' in the text.", results, pattern)
+                return results
         else:
-                print(f"No matches found for pattern '{pattern}' in the text.")
-                return 0
\ No newline at end of file
+                logger.debug("No matches found for pattern '%s' in the text.", pattern)
+                return 0
+
+    def finditer(self, text: str, pattern: str, max_count: int = None):
+        return KMP(pattern, text).finditer(max_count)
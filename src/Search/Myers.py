@@ -0,0 +1,89 @@
+'''
+Myers class for approximate (fuzzy) searching of CV text.
+This class finds the substrings of the cleaned text of a CV that are within a given
+edit (Levenshtein) distance of the pattern, using Myers' bit-parallel algorithm.
+One column of the edit-distance matrix is kept as bit vectors, so each text character costs
+a handful of integer operations on ceil(m / w) machine words instead of m cells of a DP table.
+'''
+class Myers:
+        def __init__(self, pattern, text, max_distance):
+                '''Initialize the Myers class with a search pattern, the cleaned CV text and the edit-distance threshold.'''
+                self.text = text
+                self.max_distance = max_distance
+                self.set_pattern(pattern)
+
+        def set_pattern(self, pattern):
+                '''Set a new search pattern.'''
+                self.pattern = pattern
+                self.peq = self.compute_peq(pattern)
+
+        def get_pattern(self):
+                '''Get the current search pattern.'''
+                return self.pattern
+
+        def set_text(self, text):
+                '''Set a new cleaned CV text.'''
+                self.text = text
+
+        def get_text(self):
+                '''Get the current cleaned CV text.'''
+                return self.text
+
+        def compute_peq(self, pattern):
+                '''
+                Compute the match bit masks of the pattern:
+                bit i of peq[c] is set when pattern[i] == c.
+                '''
+                peq = {}
+                for i, ch in enumerate(pattern):
+                        peq[ch] = peq.get(ch, 0) | (1 << i)
+                return peq
+
+        # https://doi.org/10.1145/316542.316550 (G. Myers, A fast bit-vector algorithm for approximate string matching)
+        def search(self):
+                '''
+                Search for approximate occurrences of the pattern in the CV text.
+                A run of consecutive end positions within the threshold counts as one occurrence,
+                reported at the end position with the lowest distance.
+                @return: A list of (end_offset, distance) tuples, end_offset being exclusive.
+                '''
+                text = self.text
+                m = len(self.pattern)
+                k = self.max_distance
+                res = []
+                if m == 0 or not text:
+                        return res
+
+                peq = self.peq
+                mask = (1 << m) - 1
+                high = 1 << (m - 1)
+                pv = mask  # vertical positive deltas
+                mv = 0     # vertical negative deltas
+                score = m  # edit distance of the whole pattern ending at the current text position
+
+                best = None  # (end_offset, distance) of the current run of matches
+                for j, ch in enumerate(text):
+                        eq = peq.get(ch, 0)
+                        xv = eq | mv
+                        xh = (((eq & pv) + pv) ^ pv) | eq
+                        ph = mv | (~(xh | pv) & mask)
+                        mh = pv & xh
+                        if ph & high:
+                                score += 1
+                        elif mh & high:
+                                score -= 1
+                        # An occurrence may start anywhere in the text, so no carry is shifted in
+                        ph = (ph << 1) & mask
+                        mh = (mh << 1) & mask
+                        pv = mh | (~(xv | ph) & mask)
+                        mv = ph & xv
+
+                        if score <= k:
+                                if best is None or score < best[1]:
+                                        best = (j + 1, score)
+                        elif best is not None:
+                                res.append(best)
+                                best = None
+                if best is not None:
+                        res.append(best)
+                return res
@@ -1,59 +1,167 @@
+import logging
 from src.Search.KMPStrategy import KMPStrategy
 from src.Search.BMStrategy import BMStrategy
 from src.Search.FuzzyStrategy import FuzzyStrategy
+from src.Search.AhoCorasickStrategy import AhoCorasickStrategy
+from src.Search.SearchStats import SearchStats
+
+# Per-pattern messages are logged at DEBUG level, so they cost nothing unless enabled
+logger = logging.getLogger(__name__)
 
 class Search:
         def __init__(self):
                 self.strategies = {
                         'kmp': KMPStrategy(),
                         'bm': BMStrategy(),
-                        'fuzzy': FuzzyStrategy(),  # Placeholder for future fuzzy search strategy
+                        'aho': AhoCorasickStrategy(),
+                        'fuzzy': FuzzyStrategy(),
                 }
                 self.successStrategy = None
+                self.stats = SearchStats()
+
+        def register_strategy(self, strategy_name, strategy):
+                """
+                Register an additional search strategy, e.g. one backed by an index built at run time.
+                @param strategy_name: The name used to select the strategy in _search.
+                @param strategy: The SearchStrategy instance.
+                """
+                self.strategies[strategy_name] = strategy
+
+        @staticmethod
+        def _resolve_text(text):
+                """
+                Return the cleaned text of a document.
+                ExtractCV instances memoize their cleaned text, so passing the same instance
+                for every keyword of a query extracts the PDF at most once.
+                @param text: The cleaned text, or an ExtractCV instance.
+                @return: The cleaned text as a string.
+                """
+                if hasattr(text, 'get_cleaned_text'):
+                        return text.get_cleaned_text()
+                return text
         
-        def _search(self, strategy_name, text, pattern):
+        def _search(self, strategy_name, text, pattern, fuzzy_fallback=True, mode='count', max_count=None):
                 """
                 Perform a search using the specified strategy.
+                If the exact strategy finds nothing, the fuzzy strategy is tried next.
                 @param strategy_name: The name of the search strategy to use.
-                @param text: The text to search within.
-                @param pattern: The pattern to search for.
-                @return: The number of matches found.
+                @param text: The cleaned text to search within, or an ExtractCV instance.
+                @param pattern: The pattern to search for, as a string or as compiled by _compile.
+                @param fuzzy_fallback: Whether to fall back to the fuzzy strategy when nothing matched exactly.
+                @param mode: 'count' to count the matches, 'iter' to stream their offsets,
+                             'exists' to stop at the first match. Only 'count' falls back to fuzzy search.
+                @param max_count: In 'iter' mode, stop after this many matches.
+                @return: The number of matches found in 'count' mode, a generator of offsets in 'iter' mode,
+                         a bool in 'exists' mode, or -1 for an invalid strategy or mode.
                 """
                 
                 if strategy_name  == 'fuzzy':
-                        print("Fuzzy search strategy can not be called directly.")
-                elif strategy_name == 'kmp':
-                        print("Using KMP search strategy...")
-                        result = self.strategies['kmp'].search(text, pattern)
-                        if result > 0:
-                                print(f"Found {result} matches for pattern '{pattern}' using KMP Strategy.")
-                                self.successStrategy = 'kmp'
-                                return result
-                elif strategy_name == 'bm':
-                        print("Using BM search strategy...")
-                        result = self.strategies['bm'].search(text, pattern)
-                        if result > 0:
-                                print(f"Found {result} matches for pattern '{pattern}' using BM Strategy.")
-                                self.successStrategy = 'bm'
-                                return result
-                else:
-                        print(f"Unknown search strategy: {strategy_name}")
+                        logger.error("Fuzzy search strategy can not be called directly.")
                         return -1
+                elif strategy_name not in self.strategies:
+                        logger.error("Unknown search strategy: %s", strategy_name)
+                        return -1
+                elif mode != 'count':
+                        return self._search_mode(strategy_name, text, pattern, mode, max_count)
 
-                # if no matches found, try fuzzy search first
-                print(f"No matches found for pattern '{pattern}' using Fuzzy Strategy.")
-                
-                # Temporary return statement to avoid errors
-                # if implemented remove this line
-                return -2
-        
+                text = self._resolve_text(text)
+                self.stats.add_document(text)
+                logger.debug("Using %s search strategy...", strategy_name)
+                result = self.strategies[strategy_name].search(text, pattern)
+                if result > 0:
+                        logger.debug("Found %d matches for pattern '%s' using %s Strategy.", result, pattern, strategy_name)
+                        self.stats.matches_found += result
+                        self.successStrategy = strategy_name
+                        return result
+
+                if not fuzzy_fallback:
+                        self.successStrategy = None
+                        return 0
+
+                # if no matches found, try fuzzy search
+                logger.debug("No exact matches found for pattern '%s', trying Fuzzy Strategy.", pattern)
+                self.stats.fuzzy_fallbacks += 1
 
-                result_fuzzy = self.strategies['fuzzy'].search(text, pattern) 
+                result_fuzzy = self.strategies['fuzzy'].search(text, pattern)
                 if result_fuzzy > 0:
-                        print(f"Found {result_fuzzy} matches for pattern '{pattern}' using Fuzzy Strategy.")
+                        logger.debug("Found %d matches for pattern '%s' using Fuzzy Strategy.", result_fuzzy, pattern)
+                        self.stats.fuzzy_matches += result_fuzzy
                         self.successStrategy = 'fuzzy'
                         return result_fuzzy
                 else:
-                        print(f"No matches found for pattern '{pattern}' using Any Strategy.")
+                        logger.debug("No matches found for pattern '%s' using Any Strategy.", pattern)
                         self.successStrategy = None
-                        return 0
\ No newline at end of file
+                        return 0
+
+        def _search_mode(self, strategy_name, text, pattern, mode, max_count):
+                """
+                Perform a streaming or existence search using the specified strategy, without fuzzy fallback.
+                @return: A generator of offsets in 'iter' mode, a bool in 'exists' mode, or -1 for an invalid strategy or mode,
+                         or for 'iter' with a strategy that can not stream its matches, e.g. a fuzzy one.
+                """
+                if mode not in ('iter', 'exists'):
+                        logger.error("Unknown search mode: %s", mode)
+                        return -1
+                strategy = self.strategies[strategy_name]
+                if mode == 'iter' and getattr(strategy, 'finditer', None) is None:
+                        logger.error("The %s search strategy does not stream matches", strategy_name)
+                        return -1
+                text = self._resolve_text(text)
+                self.stats.add_document(text)
+                if mode == 'iter':
+                        return strategy.finditer(text, pattern, max_count)
+                found = strategy.contains(text, pattern)
+                self.stats.matches_found += int(found)
+                self.successStrategy = strategy_name if found else None
+                return found
+
+        def _compile(self, strategy_name, patterns):
+                """
+                Compile the patterns of a query once for the specified strategy.
+                The compiled patterns can be passed to _search and _search_many for every document,
+                so no pattern preprocessing happens in the per-document loop.
+                @param strategy_name: The name of the search strategy to use.
+                @param patterns: The patterns of the query.
+                @return: A dict mapping each pattern to its compiled form, or None for an invalid strategy.
+                """
+                if strategy_name not in self.strategies:
+                        logger.error("Unknown search strategy: %s", strategy_name)
+                        return None
+                return self.strategies[strategy_name].prepare(patterns)
+
+        def _search_many(self, strategy_name, text, patterns):
+                """
+                Count several patterns in one document using the specified strategy.
+                Multi-pattern strategies such as 'aho' scan the text once for all patterns;
+                the others fall back to one scan per pattern.
+                @param strategy_name: The name of the search strategy to use.
+                @param text: The cleaned text to search within, or an ExtractCV instance.
+                @param patterns: The patterns to search for, as strings or as compiled by _compile.
+                @return: A dict mapping each pattern to its number of matches, or None for an invalid strategy.
+                """
+                if strategy_name == 'fuzzy':
+                        logger.error("Fuzzy search strategy can not be called directly.")
+                        return None
+                if strategy_name not in self.strategies:
+                        logger.error("Unknown search strategy: %s", strategy_name)
+                        return None
+
+                text = self._resolve_text(text)
+                self.stats.add_document(text, len(patterns))
+                counts = self.strategies[strategy_name].search_many(text, patterns)
+                self.stats.matches_found += sum(counts.values())
+                self.successStrategy = strategy_name if any(counts.values()) else None
+                return counts
+
+        def _fuzzy_search(self, text, pattern):
+                """
+                Perform an approximate search with the fuzzy strategy only.
+                @param text: The cleaned text to search within, or an ExtractCV instance.
+                @param pattern: The pattern to search for.
+                @return: A (count, best_distance) tuple, best_distance being None when nothing matched.
+                """
+                text = self._resolve_text(text)
+                self.stats.add_document(text)
+                count, best_distance = self.strategies['fuzzy'].search_detailed(text, pattern)
+                self.stats.fuzzy_matches += count
+                return count, best_distance
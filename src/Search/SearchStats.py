@@ -0,0 +1,44 @@
+class SearchStats:
+        """
+        In-process counters of the work done by a Search engine, cheap enough to update
+        for every (CV, keyword) pair. Read them after a query, e.g. from the GUI or a benchmark.
+        A document counts once per call handing it to the engine, whatever the number of patterns.
+        """
+
+        FIELDS = (
+                'documents_scanned',  # documents handed to a search call
+                'chars_scanned',      # characters of those documents (cleaned CV text is mostly ASCII)
+                'patterns_searched',  # (document, pattern) pairs searched
+                'matches_found',      # exact matches counted
+                'fuzzy_fallbacks',    # exact searches without a match that fell back to the fuzzy strategy
+                'fuzzy_matches',      # approximate matches counted by the fuzzy strategy
+        )
+
+        def __init__(self):
+                """Initializes every counter to zero."""
+                self.reset()
+
+        def reset(self):
+                """Sets every counter back to zero, e.g. at the start of a query."""
+                for field in self.FIELDS:
+                        setattr(self, field, 0)
+
+        def add_document(self, text: str, patterns: int = 1):
+                """
+                Records a document handed to the engine.
+                @param text: The cleaned text of the document.
+                @param patterns: The number of patterns searched in it.
+                """
+                self.documents_scanned += 1
+                self.chars_scanned += len(text)
+                self.patterns_searched += patterns
+
+        def as_dict(self) -> dict:
+                """
+                Returns a snapshot of the counters.
+                @return: A dict counter name -> value.
+                """
+                return {field: getattr(self, field) for field in self.FIELDS}
+
+        def __str__(self):
+                return ", ".join(f"{field}={value}" for field, value in self.as_dict().items())
@@ -13,4 +13,63 @@ class SearchStrategy(ABC):
         """
         @abstractmethod
         def search(self, text: str, pattern: str) -> int:
-                pass
\ No newline at end of file
+                pass
+
+        """
+        Search for several patterns in the given text.
+        The default implementation runs search() once per pattern;
+        multi-pattern strategies override it to scan the text only once.
+        @param text: The text to search within.
+        @param patterns: The patterns to search for.
+        @return: A dict mapping each pattern to its number of matches.
+        """
+        def search_many(self, text: str, patterns: list) -> dict:
+                return {self.pattern_text(pattern): self.search(text, pattern) for pattern in patterns}
+
+        """
+        Compile a pattern once, so the tables it needs are not rebuilt for every document.
+        @param pattern: The pattern to compile.
+        @return: The compiled pattern, accepted by search() and search_many() in place of the string.
+        """
+        def compile(self, pattern: str):
+                return pattern
+
+        """
+        Prepare the strategy for a query run over many documents.
+        @param patterns: Every pattern of the query.
+        @return: A dict mapping each pattern to its compiled form.
+        """
+        def prepare(self, patterns: list) -> dict:
+                return {pattern: self.compile(pattern) for pattern in patterns}
+
+        """
+        Return the string of a pattern given either as a string or in compiled form.
+        """
+        @staticmethod
+        def pattern_text(pattern) -> str:
+                return getattr(pattern, 'pattern', pattern)
+
+
+        """
+        Count the matches of a pattern without keeping their offsets.
+        The default implementation relies on search(), which already returns a count.
+        @param text: The text to search within.
+        @param pattern: The pattern to search for.
+        @return: The number of matches found.
+        """
+        def count(self, text: str, pattern: str) -> int:
+                return self.search(text, pattern)
+
+        """
+        Tell whether a pattern occurs in the text, stopping at the first match when the strategy streams.
+        Strategies that scan the text position by position stream their matches with
+        finditer(text, pattern, max_count), a generator of offsets; the others only count.
+        @param text: The text to search within.
+        @param pattern: The pattern to search for.
+        @return: True if the pattern occurs at least once.
+        """
+        def contains(self, text: str, pattern: str) -> bool:
+                finditer = getattr(self, 'finditer', None)
+                if finditer is None:
+                        return self.count(text, pattern) > 0
+                return next(iter(finditer(text, pattern, max_count=1)), None) is not None
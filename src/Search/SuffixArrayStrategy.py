@@ -0,0 +1,40 @@
+import logging
+from itertools import islice
+from src.Search.SearchStrategy import SearchStrategy
+from src.Search.BM import BM
+
+logger = logging.getLogger(__name__)
+
+"""
+Implementation of the SearchStrategy interface using the suffix array of each CV.
+The occurrences of a pattern in a CV are counted with two binary searches in the suffix array
+of that CV. Texts missing from the index are searched with BM instead.
+"""
+class SuffixArrayStrategy(SearchStrategy):
+
+    def __init__(self, index):
+        self.index = index
+
+    def search(self, text: str, pattern: str) -> int:
+
+        logger.debug("Using Suffix Array search algorithm...")
+
+        pattern = self.pattern_text(pattern)
+        results = self.index.count(text, pattern)
+        if results is None:
+            logger.debug("Text is not in the suffix array index, falling back to BM search algorithm...")
+            results = BM(pattern, text).count()
+
+        if(results):
+                logger.debug("Found %d matches for pattern '%s' in the text.", results, pattern)
+                return results
+        else:
+                logger.debug("No matches found for pattern '%s' in the text.", pattern)
+                return 0
+
+    def finditer(self, text: str, pattern: str, max_count: int = None):
+        pattern = self.pattern_text(pattern)
+        offsets = self.index.offsets(text, pattern)
+        if offsets is None:
+            return BM(pattern, text).finditer(max_count)
+        return islice(offsets, max_count)
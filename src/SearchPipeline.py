@@ -0,0 +1,446 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from src.ExtractCV import ExtractCV
+from src.Ranking import TopN, BM25
+from src.Tracing import NULL_TRACER
+from src.DirectoryScanner import PROJECT_ROOT, canonical_path, absolute_path
+from src.TextCache import TextCache
+from src.Search.Search import Search
+from src.Search.SuffixArrayStrategy import SuffixArrayStrategy
+
+# Number of applications read before their CVs are extracted and searched
+DEFAULT_BATCH_SIZE = 1000
+# Ways to rank the results: total number of occurrences, or BM25 relevance
+RANKINGS = ('occurrences', 'bm25')
+
+def scan_document(search_engine: Search, algorithm: str, compiled_keywords: dict, text: str, trigram_index=None,
+                  doc_id: str = None) -> dict:
+        """
+        Counts the keywords in one document, skipping those the trigram index rules out.
+        Shared by the pipeline and the shard processes of the search service.
+        @param compiled_keywords (dict): keyword -> compiled keyword, from Search._compile.
+        @param trigram_index (TrigramIndex): Prefilter of the keywords, or None to count every keyword.
+        @param doc_id (str): The id of the document in the trigram index.
+        @return: A dict keyword -> count of the keywords found.
+        """
+        if trigram_index is not None:
+                candidate_keywords = [
+                        compiled for keyword, compiled in compiled_keywords.items()
+                        if trigram_index.may_contain(doc_id, keyword)
+                ]
+        else:
+                candidate_keywords = list(compiled_keywords.values())
+        if not candidate_keywords:
+                return {}
+        # Aho-Corasick scans each CV once for all keywords, KMP/BM once per keyword
+        counts = search_engine._search_many(algorithm, text, candidate_keywords)
+        return {keyword: count for keyword, count in counts.items() if count > 0}
+
+class SearchPipeline:
+        """
+        Runs a keyword query over the CVs of a list of applications: extraction, exact search,
+        then fuzzy search for the keywords without any exact match.
+
+        The pipeline does not depend on Qt, so it can run in a worker thread of the GUI as well as
+        in a script. Progress and partial results are reported through callbacks, and the query
+        stops between two CVs once the cancel event is set.
+        """
+
+        def __init__(self, text_cache=None, inverted_index=None, trigram_index=None, suffix_array_index=None, workers=None,
+                     batch_size=DEFAULT_BATCH_SIZE, dedupe_content=False, bm25=None):
+                """
+                Initializes the pipeline with the caches and indexes shared between queries.
+                @param text_cache (TextCache): Cache of extracted CV text, or None.
+                @param inverted_index (InvertedIndex): Index answering whole-word queries, or None.
+                @param trigram_index (TrigramIndex): Prefilter of substring searches, or None.
+                @param suffix_array_index (SuffixArrayIndex): Index used by the 'sa' algorithm, or None.
+                @param workers (int): Number of extraction processes, None for one per CPU.
+                @param batch_size (int): Number of applications read before their CVs are extracted.
+                @param dedupe_content (bool): Whether CVs stored under several paths with the same content
+                                              are extracted and searched once. Each file is hashed once per session.
+                @param bm25 (BM25): Scorer of the 'bm25' ranking, None for the default k1 and b.
+                """
+                self.text_cache = text_cache
+                self.inverted_index = inverted_index
+                self.trigram_index = trigram_index
+                self.suffix_array_index = suffix_array_index
+                self.workers = workers
+                self.batch_size = batch_size
+                self.dedupe_content = dedupe_content
+                self.bm25 = bm25 or BM25()
+                self.content_hashes = {}    # (path, size, mtime_ns) -> content hash, reused between queries
+                self.dirty_indexes = set()  # indexes updated by a query and not saved yet
+
+        @staticmethod
+        def make_result(app_data: dict, matched_keywords: dict) -> dict:
+                """
+                Builds the result entry of an application, shaped like the arguments of CVAnalyzerApp.create_cv_card.
+                """
+                return {
+                        "detail_id": app_data['detail_id'],
+                        "applicant_id": app_data['applicant_id'],
+                        "name": f"{app_data['first_name']} {app_data['last_name']}",
+                        "application_role": app_data['application_role'],
+                        "cv_path": app_data['cv_path'],
+                        "matched_keywords": matched_keywords,
+                }
+
+        @staticmethod
+        def score(result: dict) -> int:
+                """Returns the ranking score of a result entry: its total number of matches."""
+                return sum(result['matched_keywords'].values())
+
+        @staticmethod
+        def _batches(iterable, batch_size: int):
+                """Yields lists of at most batch_size items of an iterable, consuming it lazily."""
+                iterator = iter(iterable)
+                while True:
+                        batch = list(islice(iterator, batch_size))
+                        if not batch:
+                                return
+                        yield batch
+
+        def _content_hash(self, cv_path: str):
+                """Returns the content hash of a CV file, or None if it can not be read."""
+                path = absolute_path(cv_path)
+                try:
+                        stat = os.stat(path)
+                        key = (path, stat.st_size, stat.st_mtime_ns)
+                        content_hash = self.content_hashes.get(key)
+                        if content_hash is None:
+                                content_hash = TextCache._hash_file(path)
+                                self.content_hashes[key] = content_hash
+                        return content_hash
+                except OSError:
+                        return None
+
+        def _document(self, cv_path: str, documents_by_content: dict) -> str:
+                """
+                Returns the path of the document a cv_path refers to: the first path seen with the
+                same content when dedupe_content is set, the canonical cv_path otherwise. A relative
+                cv_path, as stored by the seeder, is relative to the project root.
+                """
+                cv_path = canonical_path(cv_path, PROJECT_ROOT)
+                if not self.dedupe_content:
+                        return cv_path
+                content_hash = self._content_hash(cv_path)
+                if content_hash is None:
+                        return cv_path
+                return documents_by_content.setdefault(content_hash, cv_path)
+
+        def _sync(self, index, documents: dict):
+                if index.sync_documents(documents):
+                        self.dirty_indexes.add(index)
+
+        def _upper_bound(self, cv_path: str, keywords) -> int:
+                """
+                Returns the highest score a CV can reach from the trigram index, or None if it can not be bounded
+                (no trigram index, or a keyword shorter than three characters).
+                """
+                if self.trigram_index is None:
+                        return None
+                bound = 0
+                for keyword in keywords:
+                        keyword_bound = self.trigram_index.upper_bound(cv_path, keyword)
+                        if keyword_bound is None:
+                                return None
+                        bound += keyword_bound
+                return bound
+
+        def _contains_any(self, search_engine: Search, algorithm: str, compiled_keywords: dict, text: str, cv_path: str) -> bool:
+                """
+                Tells whether a CV contains any of the keywords, stopping at the first occurrence.
+                Used for the CVs pruned from the ranking, so they are still counted as relevant.
+                """
+                return any(
+                        self.trigram_index.may_contain(cv_path, keyword)
+                        and search_engine._search(algorithm, text, compiled, mode='exists')
+                        for keyword, compiled in compiled_keywords.items()
+                )
+
+        def run(self, applications, keywords: list, algorithm: str = 'kmp', whole_words: bool = False,
+                top_n: int = 5, cancel_event=None, on_progress=None, on_results=None, ranking: str = 'occurrences',
+                tracer=None) -> dict:
+                """
+                Runs a query and returns its ranked results.
+                Each CV is searched as soon as its text is extracted, so the first results are reported before the
+                whole corpus is read. Whole-word queries are answered from the inverted index and suffix array queries
+                from the suffix array of the CV, both updated CV by CV.
+                @param applications (iterable): Application rows, e.g. from Database.iter_cv_data; consumed lazily.
+                @param keywords (list): The cleaned keywords of the query.
+                @param algorithm (str): 'kmp', 'bm', 'aho' or 'sa'.
+                @param whole_words (bool): Whether to match whole words through the inverted index.
+                @param top_n (int): Number of results to return.
+                @param cancel_event (threading.Event): Set it to stop the query, or None.
+                @param on_progress (callable): Called with (done, total, stage) as CVs are processed.
+                @param on_results (callable): Called with the current top results whenever they change.
+                @param ranking (str): 'occurrences' to rank by total number of matches, or 'bm25' to rank by relevance.
+                                      BM25 reads the statistics of the corpus from the inverted index, which is
+                                      updated as the CVs are searched, so the results reported while the query
+                                      runs are ranked by occurrences until the final ranking.
+                @param tracer (Tracer): Records the time of each stage ('fetch', 'extract', 'index', 'search', 'fuzzy',
+                                        'rank') and of PDF parsing and cleaning in the workers, or None. The work
+                                        done per CV is added to counters rather than kept as spans.
+                @return: A dict with the top 'results', the number of 'relevant' CVs, of application 'documents'
+                         and of 'unique_documents', the number of documents 'pruned' because they could not reach
+                         the top results, the 'runtime_ms' of the exact search, the 'fuzzy_keywords' and
+                         'fuzzy_runtime_ms', the engine 'stats' and 'cancelled'. With 'bm25', each result has a 'score'.
+                The results are ranked as the CVs are searched, in a heap of top_n entries, and the text of a CV is
+                dropped once searched. Only the score of each document is kept, for the later applications of the
+                same CV. The rows and counts of every document are kept while a keyword has no exact match, as the
+                fuzzy pass may rank any of them, and their texts are then read again, from the text cache if any.
+                With 'bm25', those of the matching documents are kept until the final ranking.
+                """
+                if ranking not in RANKINGS:
+                        raise ValueError(f"Unknown ranking '{ranking}', expected one of {', '.join(RANKINGS)}")
+                if ranking == 'bm25' and self.inverted_index is None:
+                        raise ValueError("The 'bm25' ranking needs an inverted index")
+                def cancelled():
+                        return cancel_event is not None and cancel_event.is_set()
+
+                def progress(done, total, stage):
+                        if on_progress is not None:
+                                on_progress(done, total, stage)
+
+                tracer = tracer or NULL_TRACER
+                on_timing = None
+                if tracer.enabled:
+                        def on_timing(i, parse_ns, clean_ns):
+                                tracer.add_worker_time("pdf parse", parse_ns)
+                                tracer.add_worker_time("text cleaning", clean_ns)
+
+                start_time = time.perf_counter()
+                search_engine = Search()
+                summary = {
+                        "results": [], "relevant": 0, "documents": 0, "unique_documents": 0, "pruned": 0, "runtime_ms": 0.0,
+                        "fuzzy_keywords": [], "fuzzy_runtime_ms": 0.0, "stats": {}, "cancelled": False,
+                }
+
+                # Each unique document is extracted and searched once, and every application referencing it
+                # gets its counts. Documents are identified by their canonical cv_path, or by the first path
+                # with the same content with dedupe_content.
+                documents_by_content = {}  # content hash -> path of the document
+                document_scores = {}       # path of a searched document -> its number of matches, None if pruned but matching
+                unfound = set(keywords)    # keywords without an exact match so far
+                retained = {}              # path of a document -> [matched keywords, [(order, row)]], for the fuzzy pass and BM25
+                top = TopN(top_n)          # (document, row, matched keywords) of the best applications
+                relevant = 0
+
+                compiled_keywords = None
+                if algorithm == 'sa':
+                        search_engine.register_strategy("sa", SuffixArrayStrategy(self.suffix_array_index))
+                if not whole_words:
+                        # Pattern tables (LPS, shift tables, automaton) are built once here, not once per CV
+                        compiled_keywords = search_engine._compile(algorithm, keywords)
+
+                def report():
+                        if on_results is not None:
+                                on_results([self.make_result(app_data, dict(matched_keywords)) for _, app_data, matched_keywords in top.items()])
+
+                def count(document, text):
+                        # Returns the matched keywords of a CV, or None if it was pruned
+                        if whole_words:
+                                with tracer.timed("index"):
+                                        self._sync(self.inverted_index, {document: text})
+                                with tracer.timed("search"):
+                                        counts_per_keyword = {keyword: self.inverted_index.phrase_counts(keyword, (document,)) for keyword in keywords}
+                                return {keyword: counts[document] for keyword, counts in counts_per_keyword.items() if counts}
+
+                        if algorithm == 'sa' or self.trigram_index is not None or ranking == 'bm25':
+                                with tracer.timed("index"):
+                                        # The inverted index holds the document lengths of BM25
+                                        if ranking == 'bm25':
+                                                self._sync(self.inverted_index, {document: text})
+                                        # Only the suffix arrays of the CVs added or changed since the index was saved are built
+                                        if algorithm == 'sa':
+                                                self._sync(self.suffix_array_index, {document: text})
+                                                self.suffix_array_index.rebuild()
+                                        if self.trigram_index is not None:
+                                                self._sync(self.trigram_index, {document: text})
+                        # Max-score pruning: once top_n results are ranked, a CV whose trigram upper bound is below the
+                        # lowest of them can not enter the top results, and its keywords are not counted. The bounds hold
+                        # for occurrences only, not for BM25 scores, and no CV is pruned while a keyword has no exact match,
+                        # as the CV may hold the one that saves it from the fuzzy pass
+                        threshold = top.threshold()
+                        if ranking == 'occurrences' and threshold is not None and not unfound:
+                                bound = self._upper_bound(document, compiled_keywords)
+                                if bound is not None and bound < threshold:
+                                        summary["pruned"] += 1
+                                        with tracer.timed("search"):
+                                                matches = bound > 0 and self._contains_any(search_engine, algorithm, compiled_keywords, text, document)
+                                        document_scores[document] = None if matches else 0
+                                        return None
+                        with tracer.timed("search"):
+                                return scan_document(search_engine, algorithm, compiled_keywords, text, self.trigram_index, document)
+
+                def add_application(document, order, app_data):
+                        # Ranks an application of a CV searched earlier in the query, with the counts of that CV
+                        nonlocal relevant
+                        entry = retained.get(document)
+                        if entry is not None:
+                                entry[1].append((order, app_data))
+                        score = document_scores[document]
+                        if score != 0:
+                                relevant += 1
+                        threshold = top.threshold()
+                        if not score or (threshold is not None and score <= threshold):
+                                return False
+                        # The application comes after those of the same CV, so it can only enter the top results
+                        # along with one of them, whose counts it shares
+                        matched_keywords = next((matched for ranked, _, matched in top if ranked == document), None)
+                        if matched_keywords is None:
+                                return False
+                        return top.push(score, (document, app_data, matched_keywords), order)
+
+                def add_document(document, text, rows):
+                        # Searches a new CV and ranks its applications read so far
+                        nonlocal relevant, retained
+                        matched_keywords = count(document, text)
+                        if matched_keywords is None:
+                                relevant += len(rows) if document_scores[document] is None else 0
+                                return False
+                        score = sum(matched_keywords.values())
+                        document_scores[document] = score
+                        if unfound:
+                                unfound.difference_update(matched_keywords)
+                                if not unfound:
+                                        # Every keyword has an exact match, so there is no fuzzy pass
+                                        retained = {path: entry for path, entry in retained.items() if ranking == 'bm25' and entry[0]}
+                        if unfound or (ranking == 'bm25' and matched_keywords):
+                                retained[document] = [matched_keywords, rows]
+                        if not matched_keywords:
+                                return False
+                        relevant += len(rows)
+                        changed = False
+                        for order, app_data in rows:
+                                changed = top.push(score, (document, app_data, matched_keywords), order) or changed
+                        return changed
+
+                # Read the applications batch by batch, so a large table is not loaded before the first CV is searched.
+                # Every CV is extracted once, in parallel across a process pool shared by the batches,
+                # and searched as soon as it is available
+                unique_documents = 0
+                executor = None if self.workers == 1 else ProcessPoolExecutor(max_workers=self.workers)
+                try:
+                        batches = self._batches(applications, self.batch_size)
+                        while not cancelled():
+                                # Reading the next batch is where the database is fetched from
+                                with tracer.span("fetch"):
+                                        batch = next(batches, None)
+                                if batch is None:
+                                        break
+                                # Rows of the CVs first seen in this batch, ranked once their CV is searched
+                                new_documents = {}
+                                changed = False
+                                for app_data in batch:
+                                        order = summary["documents"]
+                                        summary["documents"] += 1
+                                        document = self._document(app_data['cv_path'], documents_by_content)
+                                        if document in new_documents:
+                                                new_documents[document].append((order, app_data))
+                                        elif document in document_scores:
+                                                changed = add_application(document, order, app_data) or changed
+                                        else:
+                                                new_documents[document] = [(order, app_data)]
+                                unique_documents += len(new_documents)
+                                if changed:
+                                        report()
+
+                                new_paths = list(new_documents)
+                                extraction = ExtractCV.iter_extract_many(
+                                        [absolute_path(cv_path) for cv_path in new_paths], self.workers, cache=self.text_cache, executor=executor, on_timing=on_timing
+                                )
+                                try:
+                                        while not cancelled():
+                                                # Time spent waiting for the next text, from the cache or the workers
+                                                with tracer.timed("extract"):
+                                                        item = next(extraction, None)
+                                                if item is None:
+                                                        break
+                                                i, text = item
+                                                document = new_paths[i]
+                                                if add_document(document, text, new_documents.pop(document)):
+                                                        report()
+                                                progress(len(document_scores), unique_documents, "extract")
+                                finally:
+                                        # Drops the chunks not started yet when the query is cancelled
+                                        extraction.close()
+                        summary["unique_documents"] = unique_documents
+                        summary["runtime_ms"] = (time.perf_counter() - start_time) * 1000
+
+                        # Keywords without a single exact occurrence in any CV are retried with the fuzzy strategy.
+                        # Fuzzy matches raise the scores of any CV, so every document is ranked again
+                        fuzzy_start_time = time.perf_counter()
+                        fuzzy_keywords = [keyword for keyword in keywords if keyword in unfound]
+                        if fuzzy_keywords and not cancelled():
+                                summary["fuzzy_keywords"] = fuzzy_keywords
+                                fuzzy_top = TopN(top_n)
+                                fuzzy_relevant = 0
+                                paths = list(retained)
+                                # Texts are not kept between the passes; they are read again, from the text cache if any
+                                extraction = ExtractCV.iter_extract_many(
+                                        [absolute_path(cv_path) for cv_path in paths], self.workers, cache=self.text_cache, executor=executor, on_timing=on_timing
+                                )
+                                try:
+                                        for done in range(1, len(paths) + 1):
+                                                if cancelled():
+                                                        break
+                                                with tracer.timed("extract"):
+                                                        i, text = next(extraction)
+                                                document = paths[i]
+                                                entry = retained[document]
+                                                with tracer.timed("fuzzy"):
+                                                        fuzzy_matches = {}
+                                                        for keyword in fuzzy_keywords:
+                                                                fuzzy_count, _ = search_engine._fuzzy_search(text, keyword)
+                                                                if fuzzy_count > 0:
+                                                                        fuzzy_matches[keyword] = fuzzy_count
+                                                if fuzzy_matches:
+                                                        entry[0] = {**entry[0], **fuzzy_matches}
+                                                matched_keywords, rows = entry
+                                                if matched_keywords:
+                                                        fuzzy_relevant += len(rows)
+                                                        score = sum(matched_keywords.values())
+                                                        for order, app_data in rows:
+                                                                fuzzy_top.push(score, (document, app_data, matched_keywords), order)
+                                                progress(done, len(paths), "fuzzy")
+                                finally:
+                                        extraction.close()
+                                if not cancelled():
+                                        top, relevant = fuzzy_top, fuzzy_relevant
+                                        report()
+                                summary["fuzzy_runtime_ms"] = (time.perf_counter() - fuzzy_start_time) * 1000
+                finally:
+                        if executor is not None:
+                                executor.shutdown(wait=False, cancel_futures=True)
+
+                with tracer.span("rank"):
+                        if ranking == 'bm25':
+                                # Whole-word keywords take their document frequencies from the index, substrings and
+                                # fuzzy matches from the matches of the query
+                                document_frequencies = None
+                                if whole_words:
+                                        document_frequencies = {
+                                                keyword: self.inverted_index.document_frequency(keyword) for keyword in keywords if keyword not in unfound
+                                        }
+                                scores = self.bm25.score_all(
+                                        {document: entry[0] for document, entry in retained.items() if entry[0]},
+                                        self.inverted_index.doc_lengths, len(self.inverted_index.doc_lengths),
+                                        self.inverted_index.average_length(), document_frequencies
+                                )
+                                top = TopN(top_n)
+                                for document, (matched_keywords, rows) in retained.items():
+                                        if matched_keywords:
+                                                for order, app_data in rows:
+                                                        top.push(scores[document], (document, app_data, matched_keywords), order)
+                        for document, app_data, matched_keywords in top.items():
+                                result = self.make_result(app_data, matched_keywords)
+                                if ranking == 'bm25':
+                                        result["score"] = round(scores[document], 4)
+                                summary["results"].append(result)
+                summary["relevant"] = relevant
+                summary["stats"] = search_engine.stats.as_dict()
+                summary["cancelled"] = cancelled()
+                return summary
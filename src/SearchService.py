@@ -0,0 +1,414 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+# Allow running as a script: python src/SearchService.py ...
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.DirectoryScanner import absolute_path
+from src.ExtractCV import ExtractCV
+from src.Ranking import TopN, BM25
+from src.SearchPipeline import SearchPipeline, RANKINGS, scan_document
+from src.TextCache import TextCache
+from src.Search.Search import Search
+from src.Search.SuffixArrayStrategy import SuffixArrayStrategy
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+
+"""
+Long-running keyword search service over a warm, in-memory CV corpus.
+The CVs are extracted once at startup and split into shards; each shard lives in its own worker
+process with its texts and indexes, so every query is a parallel scan of memory instead of a
+re-read of the corpus. The HTTP front end runs on asyncio and only listens on the loopback interface.
+
+Endpoints:
+    GET  /health                                      -> corpus size and shard count
+    GET  /search?keywords=python,sql&algorithm=aho&top=5&whole_words=1
+    POST /search  {"keywords": ["python", "sql"], "algorithm": "aho", "top": 5, "whole_words": false, "ranking": "bm25"}
+
+Example:
+    python src/SearchService.py --data-dir data --port 8765
+"""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+ALGORITHMS = ('kmp', 'bm', 'aho', 'sa')
+MAX_BODY_BYTES = 64 * 1024
+STATUS_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                  413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# ======================================================================
+#  Shard worker: runs inside the worker process owning a part of the corpus
+# ======================================================================
+_shard = None
+
+def _init_shard(documents: dict):
+        """
+        Loads a shard into its worker process and builds its indexes.
+        @param documents (dict): cv_path -> cleaned text of the documents of the shard.
+        """
+        global _shard
+        trigram_index = TrigramIndex()
+        trigram_index.sync_documents(documents)
+        inverted_index = InvertedIndex()
+        inverted_index.sync_documents(documents)
+        _shard = {
+                'documents': documents,
+                'inverted_index': inverted_index,
+                'trigram_index': trigram_index,
+                'suffix_array_index': None,
+        }
+
+def _shard_doc_lengths() -> dict:
+        """Returns cv_path -> number of words of the documents of the shard, from its inverted index."""
+        return _shard['inverted_index'].doc_lengths
+
+def _search_shard(keywords: list, algorithm: str, whole_words: bool) -> tuple:
+        """
+        Counts the exact matches of the keywords in the documents of the shard.
+        @return: A tuple (matches, stats): a dict cv_path -> {keyword: count} of the documents with a match,
+                 and the engine counters of the scan.
+        """
+        documents = _shard['documents']
+        search_engine = Search()
+        matches = {}
+        if whole_words:
+                for keyword in keywords:
+                        for cv_path, count in _shard['inverted_index'].phrase_counts(keyword).items():
+                                matches.setdefault(cv_path, {})[keyword] = count
+                return matches, search_engine.stats.as_dict()
+
+        if algorithm == 'sa':
+                # The suffix array is the most expensive index to build, so a shard builds it on its first 'sa' query
+                if _shard['suffix_array_index'] is None:
+                        _shard['suffix_array_index'] = SuffixArrayIndex()
+                        _shard['suffix_array_index'].sync_documents(documents)
+                search_engine.register_strategy("sa", SuffixArrayStrategy(_shard['suffix_array_index']))
+        compiled_keywords = search_engine._compile(algorithm, keywords)
+        for cv_path, text in documents.items():
+                matched_keywords = scan_document(search_engine, algorithm, compiled_keywords, text, _shard['trigram_index'], cv_path)
+                if matched_keywords:
+                        matches[cv_path] = matched_keywords
+        return matches, search_engine.stats.as_dict()
+
+def _fuzzy_shard(keywords: list) -> tuple:
+        """
+        Counts the fuzzy matches of the keywords in the documents of the shard.
+        @return: A tuple (matches, stats), like _search_shard.
+        """
+        search_engine = Search()
+        matches = {}
+        for cv_path, text in _shard['documents'].items():
+                for keyword in keywords:
+                        count, _ = search_engine._fuzzy_search(text, keyword)
+                        if count > 0:
+                                matches.setdefault(cv_path, {})[keyword] = count
+        return matches, search_engine.stats.as_dict()
+
+# ======================================================================
+#  Service
+# ======================================================================
+class SearchService:
+        """
+        Serves keyword queries over a corpus loaded once.
+
+        Queries run concurrently: each one is sent to every shard, and a shard process answers the
+        queries of its part of the corpus one after the other. The event loop only parses requests,
+        merges the shard results and ranks them, so it stays responsive while the shards scan.
+        """
+
+        def __init__(self, applications, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, shards: int = None,
+                     text_cache=None, extract_workers: int = None, bm25=None):
+                """
+                Initializes the service. The corpus is loaded by load().
+                @param applications (iterable): Application rows, e.g. from Database.iter_cv_data.
+                @param host (str): The loopback address to listen on.
+                @param port (int): The port to listen on, 0 for any free port.
+                @param shards (int): Number of shard processes, None for one per CPU.
+                @param text_cache (TextCache): Cache of extracted CV text used at startup, or None.
+                @param extract_workers (int): Number of extraction processes at startup, None for one per CPU.
+                @param bm25 (BM25): Scorer of the 'bm25' ranking, None for the default k1 and b.
+                """
+                if host not in LOOPBACK_HOSTS:
+                        raise ValueError(f"The search service only listens on the loopback interface, not on {host!r}")
+                self.applications = applications
+                self.host = host
+                self.port = port
+                self.shard_count = max(1, shards or os.cpu_count() or 1)
+                self.text_cache = text_cache
+                self.extract_workers = extract_workers
+                self.bm25 = bm25 or BM25()
+                self.doc_lengths = {}    # cv_path -> number of words, for the BM25 ranking
+                self.average_length = 0  # average number of words of a document
+                self.shards = []         # one single-process executor per shard
+                self.server = None
+                self.started_at = None
+
+        def load(self):
+                """Extracts the corpus and starts the shard processes with their part of it."""
+                start_time = time.perf_counter()
+                self.applications = list(self.applications)
+                cv_paths = list(dict.fromkeys(app_data['cv_path'] for app_data in self.applications))
+                texts = ExtractCV.extract_many([absolute_path(cv_path) for cv_path in cv_paths], self.extract_workers, cache=self.text_cache)
+
+                # Spread the documents by size, largest first, onto the shard holding the fewest characters
+                parts = [{} for _ in range(min(self.shard_count, max(1, len(cv_paths))))]
+                sizes = [0] * len(parts)
+                for cv_path, text in sorted(zip(cv_paths, texts), key=lambda item: len(item[1]), reverse=True):
+                        k = sizes.index(min(sizes))
+                        parts[k][cv_path] = text
+                        sizes[k] += len(text)
+
+                self.shards = [
+                        ProcessPoolExecutor(max_workers=1, initializer=_init_shard, initargs=(part,)) for part in parts
+                ]
+                # Start the processes now, so the indexes are built before the first query. The BM25 statistics
+                # come from the inverted indexes of the shards
+                self.doc_lengths = {}
+                for executor in self.shards:
+                        self.doc_lengths.update(executor.submit(_shard_doc_lengths).result())
+                self.average_length = sum(self.doc_lengths.values()) / len(self.doc_lengths) if self.doc_lengths else 0
+                loaded = len(self.doc_lengths)
+                self.started_at = time.time()
+                logger.info("Loaded %d documents of %d applications into %d shards in %.0f ms",
+                            loaded, len(self.applications), len(self.shards), (time.perf_counter() - start_time) * 1000)
+
+        def close(self):
+                """Stops the shard processes."""
+                for executor in self.shards:
+                        executor.shutdown(wait=True, cancel_futures=True)
+                self.shards = []
+
+        async def _map_shards(self, function, *args) -> tuple:
+                """Runs a function on every shard and merges their (matches, stats) results."""
+                loop = asyncio.get_running_loop()
+                parts = await asyncio.gather(*(loop.run_in_executor(executor, function, *args) for executor in self.shards))
+                matches, stats = {}, {}
+                for shard_matches, shard_stats in parts:
+                        matches.update(shard_matches)
+                        for key, value in shard_stats.items():
+                                stats[key] = stats.get(key, 0) + value
+                return matches, stats
+
+        async def search(self, keywords: list, algorithm: str = 'kmp', whole_words: bool = False, top_n: int = 5,
+                         ranking: str = 'occurrences') -> dict:
+                """
+                Runs a query over the warm corpus, with the fuzzy pass of SearchPipeline for keywords without exact match.
+                @param ranking (str): 'occurrences' or 'bm25', as in SearchPipeline.run.
+                @return: A dict with the top 'results' (shaped like SearchPipeline.make_result), the number of 'relevant'
+                         applications, 'documents', 'fuzzy_keywords', the merged engine 'stats' and 'runtime_ms'.
+                """
+                start_time = time.perf_counter()
+                matches, stats = await self._map_shards(_search_shard, keywords, algorithm, whole_words)
+                exact_ms = (time.perf_counter() - start_time) * 1000
+
+                found_keywords = {keyword for matched_keywords in matches.values() for keyword in matched_keywords}
+                fuzzy_keywords = [keyword for keyword in keywords if keyword not in found_keywords]
+                if fuzzy_keywords:
+                        fuzzy_matches, fuzzy_stats = await self._map_shards(_fuzzy_shard, fuzzy_keywords)
+                        for cv_path, matched_keywords in fuzzy_matches.items():
+                                matches.setdefault(cv_path, {}).update(matched_keywords)
+                        for key, value in fuzzy_stats.items():
+                                stats[key] = stats.get(key, 0) + value
+
+                # Rank in application order, so ties keep the order of the database, as the pipeline does
+                if ranking == 'bm25':
+                        scores = self.bm25.score_all(matches, self.doc_lengths, len(self.doc_lengths), self.average_length)
+                top = TopN(top_n)
+                for app_data in self.applications:
+                        cv_path = app_data['cv_path']
+                        matched_keywords = matches.get(cv_path)
+                        if matched_keywords:
+                                top.push(scores[cv_path] if ranking == 'bm25' else sum(matched_keywords.values()), app_data)
+                results = []
+                for app_data in top.items():
+                        cv_path = app_data['cv_path']
+                        result = SearchPipeline.make_result(app_data, dict(matches[cv_path]))
+                        if ranking == 'bm25':
+                                result["score"] = round(scores[cv_path], 4)
+                        results.append(result)
+                return {
+                        "results": results,
+                        "relevant": top.pushed,
+                        "documents": len(self.applications),
+                        "fuzzy_keywords": fuzzy_keywords,
+                        "stats": stats,
+                        "exact_ms": exact_ms,
+                        "runtime_ms": (time.perf_counter() - start_time) * 1000,
+                }
+
+        @staticmethod
+        def _parse_query(params: dict) -> tuple:
+                """
+                Validates the parameters of a search request, from a JSON body or a query string.
+                @return: A tuple (keywords, algorithm, whole_words, top_n, ranking).
+                @raise ValueError: If a parameter is missing or invalid.
+                """
+                keywords = params.get('keywords')
+                if isinstance(keywords, str):
+                        keywords = keywords.split(',')
+                if not isinstance(keywords, list) or not all(isinstance(kw, str) for kw in keywords):
+                        raise ValueError("'keywords' must be a list of strings or a comma-separated string")
+                # Normalized like the CV text, so punctuation in a keyword ("node.js") does not prevent a match
+                keywords = [kw for kw in map(ExtractCV.normalize_text, keywords) if kw]
+                if not keywords:
+                        raise ValueError("'keywords' is empty")
+
+                algorithm = str(params.get('algorithm', 'kmp')).lower()
+                if algorithm not in ALGORITHMS:
+                        raise ValueError(f"'algorithm' must be one of {', '.join(ALGORITHMS)}")
+                whole_words = params.get('whole_words', False)
+                if isinstance(whole_words, str):
+                        whole_words = whole_words.lower() in ('1', 'true', 'yes')
+                try:
+                        top_n = int(params.get('top', 5))
+                except (TypeError, ValueError):
+                        raise ValueError("'top' must be an integer")
+                if top_n < 1:
+                        raise ValueError("'top' must be at least 1")
+                ranking = str(params.get('ranking', 'occurrences')).lower()
+                if ranking not in RANKINGS:
+                        raise ValueError(f"'ranking' must be one of {', '.join(RANKINGS)}")
+                return keywords, algorithm, bool(whole_words), top_n, ranking
+
+        async def _route(self, method: str, target: str, body: bytes) -> tuple:
+                """Answers one request. @return: A tuple (status, JSON-serializable payload)."""
+                url = urlsplit(target)
+                if url.path == '/health':
+                        if method != 'GET':
+                                return 405, {"error": "Use GET"}
+                        return 200, {
+                                "status": "ok",
+                                "documents": len(self.applications),
+                                "unique_documents": len(self.doc_lengths),
+                                "shards": len(self.shards),
+                                "uptime_s": time.time() - self.started_at,
+                        }
+                if url.path == '/search':
+                        if method == 'GET':
+                                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                        elif method == 'POST':
+                                try:
+                                        params = json.loads(body or b'{}')
+                                except ValueError:
+                                        return 400, {"error": "The body is not valid JSON"}
+                                if not isinstance(params, dict):
+                                        return 400, {"error": "The body must be a JSON object"}
+                        else:
+                                return 405, {"error": "Use GET or POST"}
+                        try:
+                                query = self._parse_query(params)
+                        except ValueError as e:
+                                return 400, {"error": str(e)}
+                        return 200, await self.search(*query)
+                return 404, {"error": f"Unknown path {url.path}"}
+
+        async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+                """Reads one HTTP/1.1 request from a connection, answers it and closes the connection."""
+                status, payload = 500, {"error": "Internal server error"}
+                try:
+                        request_line = (await reader.readline()).decode('latin-1').split()
+                        if len(request_line) != 3:
+                                status, payload = 400, {"error": "Malformed request line"}
+                        else:
+                                method, target, _ = request_line
+                                headers = {}
+                                while True:
+                                        line = await reader.readline()
+                                        if line in (b'\r\n', b'\n', b''):
+                                                break
+                                        name, _, value = line.decode('latin-1').partition(':')
+                                        headers[name.strip().lower()] = value.strip()
+                                length = int(headers.get('content-length', 0) or 0)
+                                if length > MAX_BODY_BYTES:
+                                        status, payload = 413, {"error": f"The body is limited to {MAX_BODY_BYTES} bytes"}
+                                else:
+                                        body = await reader.readexactly(length) if length else b''
+                                        status, payload = await self._route(method.upper(), target, body)
+                                logger.debug("%s %s -> %d", method, target, status)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                        status, payload = 400, {"error": f"Malformed request: {e}"}
+                except Exception:
+                        logger.exception("Search request failed")
+
+                data = json.dumps(payload, default=str).encode('utf-8')
+                head = (
+                        f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        "Connection: close\r\n\r\n"
+                )
+                try:
+                        writer.write(head.encode('latin-1') + data)
+                        await writer.drain()
+                except ConnectionError:
+                        pass
+                finally:
+                        writer.close()
+
+        async def start(self):
+                """Starts listening. With port 0, self.port is set to the port picked by the system."""
+                self.server = await asyncio.start_server(self._handle, self.host, self.port)
+                self.port = self.server.sockets[0].getsockname()[1]
+                logger.info("Search service listening on http://%s:%d", self.host, self.port)
+
+        async def stop(self):
+                """Stops listening; queries in progress are answered first."""
+                if self.server is not None:
+                        self.server.close()
+                        await self.server.wait_closed()
+                        self.server = None
+
+        async def serve_forever(self):
+                await self.start()
+                async with self.server:
+                        await self.server.serve_forever()
+
+def parse_args(argv=None):
+        parser = argparse.ArgumentParser(description="Serve keyword searches over a CV corpus kept in memory.")
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--db", action="store_true", help="read the applications from the database (config/database.json)")
+        source.add_argument("--data-dir", help="read the applications from a data/<ROLE>/<file>.pdf directory")
+        parser.add_argument("--host", default=DEFAULT_HOST, choices=LOOPBACK_HOSTS, help="loopback address (default: 127.0.0.1)")
+        parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+        parser.add_argument("--shards", type=int, default=None, help="shard processes (default: one per CPU)")
+        parser.add_argument("--no-cache", action="store_true", help="extract every CV instead of reading the text cache")
+        parser.add_argument("--log-level", default="INFO", help="logging level (default: INFO)")
+        return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+        args = parse_args(argv)
+        logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+        if args.db:
+                from src.Database import iter_cv_data
+                applications = iter_cv_data()
+        else:
+                from src.BatchSearch import iter_directory_applications
+                applications = iter_directory_applications(args.data_dir)
+
+        text_cache = None if args.no_cache else TextCache()
+        service = SearchService(applications, args.host, args.port, args.shards, text_cache)
+        try:
+                service.load()
+                if text_cache is not None:
+                        text_cache.close()
+                asyncio.run(service.serve_forever())
+        except KeyboardInterrupt:
+                pass
+        finally:
+                service.close()
+        return 0
+
+if __name__ == "__main__":
+        sys.exit(main())
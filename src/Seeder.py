@@ -1,8 +1,39 @@
 import mysql.connector
 from mysql.connector import Error
+import csv
 import os
 import json
-from src.DirectoryScanner import DirectoryScanner
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from src.DirectoryScanner import DirectoryScanner, absolute_path
+
+# Rows sent per executemany call in bulk mode; the connector turns each call into one multi-row INSERT
+DEFAULT_BATCH_SIZE = 5000
+# Batches written between two commits in bulk mode
+DEFAULT_COMMIT_EVERY = 10
+
+def generate_random_date(start_year=1970, end_year=2000, rng=random):
+    start_date = datetime(start_year, 1, 1)
+    end_date = datetime(end_year, 12, 31)
+    days_between = (end_date - start_date).days
+    random_days = rng.randint(0, days_between)
+    return start_date + timedelta(days=random_days)
+
+def generate_random_phone(rng=random):
+    prefix = rng.choice(['0812', '0813', '0814', '0815', '0816', '0855', '0856', '0857', '0858'])
+    suffix = ''.join(rng.choices('0123456789', k=8))
+    return f"{prefix}{suffix}"
+
+def generate_random_address(rng=random):
+    streets = ['Jalan Sudirman', 'Jalan Thamrin', 'Jalan Gatot Subroto', 'Jalan Asia Afrika', 
+              'Jalan Diponegoro', 'Jalan Ahmad Yani', 'Jalan Pahlawan']
+    cities = ['Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Semarang', 'Medan', 'Palembang']
+    numbers = rng.randint(1, 200)
+    street = rng.choice(streets)
+    city = rng.choice(cities)
+    return f"{street} No. {numbers}, {city}"
 
 class Seeder:
         """
@@ -26,10 +57,16 @@ class Seeder:
                 self.conn = None
                 self.cursor = None
 
-        def _connect_db(self):
-                """Establishes a connection to the MariaDB/MySQL database."""
+        def _connect_db(self, allow_local_infile: bool = False):
+                """
+                Establishes a connection to the MariaDB/MySQL database.
+                @param allow_local_infile (bool): Whether the connection may send local files with LOAD DATA LOCAL INFILE.
+                """
                 try:
-                        self.conn = mysql.connector.connect(**self.db_config)
+                        if allow_local_infile:
+                                self.conn = mysql.connector.connect(**self.db_config, allow_local_infile=True)
+                        else:
+                                self.conn = mysql.connector.connect(**self.db_config)
                         self.cursor = self.conn.cursor()
                         print(f"Successfully connected to database '{self.db_config.get('database')}'")
                 except Error as e:
@@ -92,30 +129,6 @@ class Seeder:
                 - 5 applicants with 3 roles each
                 And so on...
                 """
-                import random
-                from datetime import datetime, timedelta
-
-                def generate_random_date(start_year=1970, end_year=2000):
-                    start_date = datetime(start_year, 1, 1)
-                    end_date = datetime(end_year, 12, 31)
-                    days_between = (end_date - start_date).days
-                    random_days = random.randint(0, days_between)
-                    return start_date + timedelta(days=random_days)
-
-                def generate_random_phone():
-                    prefix = random.choice(['0812', '0813', '0814', '0815', '0816', '0855', '0856', '0857', '0858'])
-                    suffix = ''.join(random.choices('0123456789', k=8))
-                    return f"{prefix}{suffix}"
-
-                def generate_random_address():
-                    streets = ['Jalan Sudirman', 'Jalan Thamrin', 'Jalan Gatot Subroto', 'Jalan Asia Afrika', 
-                              'Jalan Diponegoro', 'Jalan Ahmad Yani', 'Jalan Pahlawan']
-                    cities = ['Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Semarang', 'Medan', 'Palembang']
-                    numbers = random.randint(1, 200)
-                    street = random.choice(streets)
-                    city = random.choice(cities)
-                    return f"{street} No. {numbers}, {city}"
-
                 file_map = self.scanner.getMap()
                 if not file_map:
                     print("No data to seed. The scanned directory is empty or unreadable.")
@@ -178,6 +191,240 @@ class Seeder:
                     self._close_db()
                     print("\nData seeding process complete.")
 
+        def generate_bulk_rows(self, num_applicants: int, first_applicant_id: int = 1, max_roles: int = None, seed: int = None):
+                """
+                Generates the rows of num_applicants applicants and of their applications, lazily.
+                Applicant ids are assigned here rather than by AUTO_INCREMENT, so application rows
+                can reference them without reading lastrowid after every insert.
+                @param num_applicants (int): Number of ApplicantProfile rows to generate.
+                @param first_applicant_id (int): Id of the first generated applicant.
+                @param max_roles (int): Maximum number of roles an applicant applies for, None for every role.
+                @param seed (int): Seed of the random generator, for reproducible datasets.
+                @return: A generator of (profile_row, detail_rows) tuples.
+                """
+                file_map = self.scanner.getMap()
+                roles = [(role.replace('-', ' ').replace('_', ' ').title(), paths) for role, paths in file_map.items() if paths]
+                if not roles:
+                        return
+                max_roles = min(max_roles or len(roles), len(roles))
+                rng = random.Random(seed)
+
+                for applicant_id in range(first_applicant_id, first_applicant_id + num_applicants):
+                        num_roles = rng.randint(1, max_roles)
+                        profile_row = (
+                                applicant_id,
+                                f"Group{num_roles}",
+                                f"Applicant{applicant_id}",
+                                generate_random_date(rng=rng).strftime('%Y-%m-%d'),
+                                generate_random_address(rng),
+                                generate_random_phone(rng),
+                        )
+                        detail_rows = [
+                                (applicant_id, application_role, rng.choice(paths))
+                                for application_role, paths in rng.sample(roles, num_roles)
+                        ]
+                        yield profile_row, detail_rows
+
+        def _next_applicant_id(self) -> int:
+                self.cursor.execute("SELECT COALESCE(MAX(applicant_id), 0) + 1 FROM ApplicantProfile")
+                return self.cursor.fetchone()[0]
+
+        def _insert_batches(self, rows, batch_size: int, commit_every: int, report):
+                """
+                Writes (profile_row, detail_rows) tuples with one executemany per table and batch,
+                committing every commit_every batches.
+                @return: The numbers of profile and detail rows written.
+                """
+                profile_query = """
+                        INSERT INTO ApplicantProfile
+                        (applicant_id, first_name, last_name, date_of_birth, address, phone_number)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                detail_query = """
+                        INSERT INTO ApplicationDetail
+                        (applicant_id, application_role, cv_path)
+                        VALUES (%s, %s, %s)
+                """
+                profiles, details = [], []
+                written_profiles = written_details = 0
+                batches = 0
+
+                def flush():
+                        nonlocal written_profiles, written_details, batches
+                        # Profiles first: every application references an applicant of the same or an earlier batch
+                        if profiles:
+                                self.cursor.executemany(profile_query, profiles)
+                        if details:
+                                self.cursor.executemany(detail_query, details)
+                        written_profiles += len(profiles)
+                        written_details += len(details)
+                        profiles.clear()
+                        details.clear()
+                        batches += 1
+                        if batches % commit_every == 0:
+                                self.conn.commit()
+                                report(written_profiles, written_details)
+
+                for profile_row, detail_rows in rows:
+                        profiles.append(profile_row)
+                        details.extend(detail_rows)
+                        if len(profiles) + len(details) >= batch_size:
+                                flush()
+                if profiles or details:
+                        flush()
+                self.conn.commit()
+                return written_profiles, written_details
+
+        def _load_data_infile(self, rows, report):
+                """
+                Writes (profile_row, detail_rows) tuples to two temporary tab-separated files,
+                then loads each of them with a single LOAD DATA LOCAL INFILE statement.
+                @return: The numbers of profile and detail rows written.
+                """
+                load_query = """
+                        LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                        CHARACTER SET utf8mb4
+                        FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+                        LINES TERMINATED BY '\\n'
+                        ({columns})
+                """
+                with tempfile.TemporaryDirectory() as tmp:
+                        profile_path = os.path.join(tmp, 'applicant_profile.tsv')
+                        detail_path = os.path.join(tmp, 'application_detail.tsv')
+                        written_profiles = written_details = 0
+                        with open(profile_path, 'w', newline='', encoding='utf-8') as profile_file, \
+                             open(detail_path, 'w', newline='', encoding='utf-8') as detail_file:
+                                profile_writer = csv.writer(profile_file, delimiter='\t', lineterminator='\n')
+                                detail_writer = csv.writer(detail_file, delimiter='\t', lineterminator='\n')
+                                for profile_row, detail_rows in rows:
+                                        profile_writer.writerow(profile_row)
+                                        detail_writer.writerows(detail_rows)
+                                        written_profiles += 1
+                                        written_details += len(detail_rows)
+
+                        self.cursor.execute(
+                                load_query.format(table='ApplicantProfile', columns='applicant_id, first_name, last_name, date_of_birth, address, phone_number'),
+                                (profile_path,)
+                        )
+                        self.conn.commit()
+                        report(written_profiles, 0)
+                        self.cursor.execute(
+                                load_query.format(table='ApplicationDetail', columns='applicant_id, application_role, cv_path'),
+                                (detail_path,)
+                        )
+                        self.conn.commit()
+                return written_profiles, written_details
+
+        def seed_bulk(self, num_applicants: int, max_roles: int = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                      commit_every: int = DEFAULT_COMMIT_EVERY, use_load_data: bool = False, seed: int = None) -> dict:
+                """
+                Populates the database tables with num_applicants generated applicants, for load testing.
+                Each applicant applies for 1 to max_roles random roles, with a random CV of the scanned directory.
+                Rows are written with multi-row INSERT batches (or LOAD DATA LOCAL INFILE), with foreign key
+                and unique checks disabled for the session, and the throughput is reported as rows/sec.
+                @param num_applicants (int): Number of applicants to create.
+                @param max_roles (int): Maximum number of roles per applicant, None for every role.
+                @param batch_size (int): Rows per INSERT batch.
+                @param commit_every (int): Batches between two commits.
+                @param use_load_data (bool): Load the rows from temporary files with LOAD DATA LOCAL INFILE instead.
+                @param seed (int): Seed of the random generator, for reproducible datasets.
+                @return: A dict with the numbers of 'profiles' and 'applications' written, 'seconds' and 'rows_per_sec'.
+                """
+                stats = {'profiles': 0, 'applications': 0, 'seconds': 0.0, 'rows_per_sec': 0.0}
+                if not self.scanner.getMap():
+                        print("No data to seed. The scanned directory is empty or unreadable.")
+                        return stats
+
+                start_time = time.perf_counter()
+
+                def report(profiles, details):
+                        elapsed = time.perf_counter() - start_time
+                        rows = profiles + details
+                        print(f"  - {rows} rows written in {elapsed:.1f} s ({rows / elapsed if elapsed else 0:.0f} rows/sec)")
+
+                self._connect_db(allow_local_infile=use_load_data)
+                try:
+                        self.cursor.execute("SET SESSION foreign_key_checks = 0")
+                        self.cursor.execute("SET SESSION unique_checks = 0")
+                        rows = self.generate_bulk_rows(num_applicants, self._next_applicant_id(), max_roles, seed)
+                        print(f"\nBulk seeding {num_applicants} applicants...")
+                        if use_load_data:
+                                profiles, details = self._load_data_infile(rows, report)
+                        else:
+                                profiles, details = self._insert_batches(rows, batch_size, commit_every, report)
+
+                        elapsed = time.perf_counter() - start_time
+                        stats = {
+                                'profiles': profiles,
+                                'applications': details,
+                                'seconds': elapsed,
+                                'rows_per_sec': (profiles + details) / elapsed if elapsed else 0.0,
+                        }
+                        print(f"Bulk seeded {profiles} applicants and {details} applications in {elapsed:.1f} s "
+                              f"({stats['rows_per_sec']:.0f} rows/sec).")
+                except Error as e:
+                        print(f"Error bulk seeding data: {e}")
+                        self.conn.rollback()
+                finally:
+                        try:
+                                self.cursor.execute("SET SESSION unique_checks = 1")
+                                self.cursor.execute("SET SESSION foreign_key_checks = 1")
+                        except Error:
+                                pass
+                        self._close_db()
+                return stats
+
+        def sync_applications(self, deltas: dict, seed: int = None) -> dict:
+                """
+                Brings the application rows in line with the changes of the scanned directory, as
+                computed by DirectoryScanner.changes(), instead of reseeding every table.
+                The applications of removed CVs are deleted, and each added CV gets a new applicant
+                applying for the role of its directory. Modified CVs keep their rows, as their path is unchanged.
+                @param deltas (dict): The 'added', 'modified' and 'removed' CV paths.
+                @param seed (int): Seed of the random generator, for reproducible profiles.
+                @return: A dict with the numbers of 'added' and 'removed' applications.
+                """
+                stats = {'added': 0, 'removed': 0}
+                added, removed = deltas.get('added', []), deltas.get('removed', [])
+                if not added and not removed:
+                        return stats
+                rng = random.Random(seed)
+
+                self._connect_db()
+                try:
+                        if removed:
+                                self.cursor.executemany(
+                                        "DELETE FROM ApplicationDetail WHERE cv_path = %s", [(cv_path,) for cv_path in removed]
+                                )
+                                # A CV may be referenced by several applications, or by none
+                                stats['removed'] = max(self.cursor.rowcount, 0)
+                        if added:
+                                base_dir = os.path.abspath(self.scanner.base_dir).replace('\\', '/').rstrip('/') + '/'
+                                first_applicant_id = self._next_applicant_id()
+                                rows = []
+                                for applicant_id, cv_path in enumerate(added, first_applicant_id):
+                                        path = os.path.abspath(absolute_path(cv_path)).replace('\\', '/')
+                                        role = path[len(base_dir):].split('/')[0] if path.startswith(base_dir) else ''
+                                        application_role = role.replace('-', ' ').replace('_', ' ').title()
+                                        profile_row = (
+                                                applicant_id,
+                                                "Group1",
+                                                f"Applicant{applicant_id}",
+                                                generate_random_date(rng=rng).strftime('%Y-%m-%d'),
+                                                generate_random_address(rng),
+                                                generate_random_phone(rng),
+                                        )
+                                        rows.append((profile_row, [(applicant_id, application_role, cv_path)]))
+                                _, stats['added'] = self._insert_batches(rows, DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY, lambda *_: None)
+                        self.conn.commit()
+                        print(f"Synchronized applications: {stats['added']} added, {stats['removed']} removed.")
+                except Error as e:
+                        print(f"Error synchronizing applications: {e}")
+                        self.conn.rollback()
+                finally:
+                        self._close_db()
+                return stats
+
         def verify_data(self):
                 """
                 Connects to the database and prints its contents to verify seeding.
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Default location of the cache file: <project root>/cache/cv_text.sqlite3
+DEFAULT_CACHE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'cv_text.sqlite3'
+)
+
+# Default size cap of the stored text (raw + cleaned), in bytes
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class TextCache:
+        """
+        Persistent on-disk cache of text extracted from CV PDFs, stored in a single SQLite file.
+
+        Entries are keyed on (cv_path, file size, mtime), so an unchanged PDF is only parsed
+        once across queries and app restarts. When use_content_hash is enabled, a PDF whose
+        mtime changed but whose content did not (e.g. after a copy) is still served from the cache.
+        The total size of the stored text is capped; the least recently used entries are evicted first.
+        """
+
+        def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                     use_content_hash: bool = False):
+                """
+                Opens (or creates) the cache file.
+                @param db_path (str): Path to the SQLite cache file, ':memory:' for a non-persistent cache.
+                @param max_bytes (int): Size cap of the stored text in bytes.
+                @param use_content_hash (bool): Also match entries by SHA-256 of the PDF content.
+                """
+                self.db_path = db_path
+                self.max_bytes = max_bytes
+                self.use_content_hash = use_content_hash
+                self.hits = 0
+                self.misses = 0
+                self.evictions = 0
+                self._lock = threading.Lock()
+
+                if db_path != ':memory:':
+                        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self.conn = sqlite3.connect(db_path, check_same_thread=False)
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                self.conn.execute('''
+                        CREATE TABLE IF NOT EXISTS cv_text (
+                        cv_path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        content_hash TEXT,
+                        raw_text TEXT NOT NULL,
+                        cleaned_text TEXT NOT NULL,
+                        nbytes INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                        )
+                ''')
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_text_last_access ON cv_text(last_access)")
+                self.conn.commit()
+                self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM cv_text").fetchone()[0]
+
+        @staticmethod
+        def _key(cv_path: str) -> str:
+                """Normalizes a CV path so relative and absolute spellings share one entry."""
+                return os.path.abspath(cv_path).replace('\\', '/')
+
+        @staticmethod
+        def _hash_file(cv_path: str) -> str:
+                """Returns the SHA-256 hex digest of a file's content."""
+                digest = hashlib.sha256()
+                with open(cv_path, 'rb') as f:
+                        for block in iter(lambda: f.read(1024 * 1024), b''):
+                                digest.update(block)
+                return digest.hexdigest()
+
+        def get(self, cv_path: str):
+                """
+                Looks up the cached text of a PDF.
+                @param cv_path (str): Path to the PDF file.
+                @return: A (raw_text, cleaned_text) tuple, or None if the PDF is not cached or has changed.
+                """
+                try:
+                        stat = os.stat(cv_path)
+                except OSError:
+                        with self._lock:
+                                self.misses += 1
+                        return None
+
+                key = self._key(cv_path)
+                with self._lock:
+                        row = self.conn.execute(
+                                "SELECT size, mtime_ns, content_hash, raw_text, cleaned_text FROM cv_text WHERE cv_path = ?",
+                                (key,)
+                        ).fetchone()
+                        if row is None or row[0] != stat.st_size:
+                                self.misses += 1
+                                return None
+
+                        size, mtime_ns, content_hash, raw_text, cleaned_text = row
+                        if mtime_ns != stat.st_mtime_ns:
+                                # Same size but touched: only reusable if the content hash still matches
+                                if not (self.use_content_hash and content_hash and content_hash == self._hash_file(cv_path)):
+                                        self.misses += 1
+                                        return None
+                                self.conn.execute("UPDATE cv_text SET mtime_ns = ? WHERE cv_path = ?", (stat.st_mtime_ns, key))
+
+                        self.conn.execute("UPDATE cv_text SET last_access = ? WHERE cv_path = ?", (time.time(), key))
+                        self.conn.commit()
+                        self.hits += 1
+                        return raw_text, cleaned_text
+
+        def put(self, cv_path: str, raw_text: str, cleaned_text: str):
+                """
+                Stores the extracted text of a PDF, evicting least recently used entries if over the size cap.
+                @param cv_path (str): Path to the PDF file.
+                @param raw_text (str): Raw text extracted from the PDF.
+                @param cleaned_text (str): Continuous string produced from the raw text.
+                """
+                try:
+                        stat = os.stat(cv_path)
+                except OSError:
+                        return
+                content_hash = self._hash_file(cv_path) if self.use_content_hash else None
+                nbytes = len(raw_text.encode('utf-8')) + len(cleaned_text.encode('utf-8'))
+                if nbytes > self.max_bytes:
+                        return
+
+                key = self._key(cv_path)
+                with self._lock:
+                        old = self.conn.execute("SELECT nbytes FROM cv_text WHERE cv_path = ?", (key,)).fetchone()
+                        if old is not None:
+                                self.total_bytes -= old[0]
+                        self.conn.execute('''
+                                INSERT OR REPLACE INTO cv_text
+                                (cv_path, size, mtime_ns, content_hash, raw_text, cleaned_text, nbytes, last_access)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ''', (key, stat.st_size, stat.st_mtime_ns, content_hash, raw_text, cleaned_text, nbytes, time.time()))
+                        self.total_bytes += nbytes
+                        self._evict()
+                        self.conn.commit()
+
+        def _evict(self):
+                """Deletes least recently used entries until the cache fits its size cap. Caller holds the lock."""
+                while self.total_bytes > self.max_bytes:
+                        rows = self.conn.execute(
+                                "SELECT cv_path, nbytes FROM cv_text ORDER BY last_access ASC LIMIT 64"
+                        ).fetchall()
+                        if not rows:
+                                self.total_bytes = 0
+                                return
+                        for cv_path, nbytes in rows:
+                                if self.total_bytes <= self.max_bytes:
+                                        return
+                                self.conn.execute("DELETE FROM cv_text WHERE cv_path = ?", (cv_path,))
+                                self.total_bytes -= nbytes
+                                self.evictions += 1
+
+        def invalidate(self, cv_path: str):
+                """Removes the entry of a single PDF from the cache."""
+                key = self._key(cv_path)
+                with self._lock:
+                        row = self.conn.execute("SELECT nbytes FROM cv_text WHERE cv_path = ?", (key,)).fetchone()
+                        if row is not None:
+                                self.conn.execute("DELETE FROM cv_text WHERE cv_path = ?", (key,))
+                                self.total_bytes -= row[0]
+                                self.conn.commit()
+
+        def clear(self):
+                """Removes every entry from the cache and resets the counters."""
+                with self._lock:
+                        self.conn.execute("DELETE FROM cv_text")
+                        self.conn.commit()
+                        self.total_bytes = 0
+                        self.hits = self.misses = self.evictions = 0
+
+        def get_stats(self) -> dict:
+                """Returns the hit/miss/eviction counters and the current size of the cache."""
+                with self._lock:
+                        entries = self.conn.execute("SELECT COUNT(*) FROM cv_text").fetchone()[0]
+                        return {
+                                'hits': self.hits,
+                                'misses': self.misses,
+                                'evictions': self.evictions,
+                                'entries': entries,
+                                'bytes': self.total_bytes,
+                        }
+
+        def close(self):
+                """Closes the underlying SQLite connection."""
+                with self._lock:
+                        self.conn.close()
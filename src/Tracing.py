@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+try:
+        import resource  # Unix only
+except ImportError:
+        resource = None
+
+"""
+Lightweight tracing of the search stages.
+A Tracer records perf_counter_ns spans (database fetch, extraction, indexing, ranking, result
+cards), the time spent in worker processes, and per-document timings (search and fuzzy pass of
+each CV) as counters, so its memory does not grow with the corpus, with optional tracemalloc and
+RSS peaks. The trace can be summarized as a per-stage breakdown, or exported as
+JSON or in the Chrome trace event format (chrome://tracing, https://ui.perfetto.dev).
+
+A disabled tracer (NULL_TRACER) hands out one shared no-op span, so instrumented code costs a
+method call per span when tracing is off.
+"""
+
+class _NullSpan:
+        __slots__ = ()
+
+        def __enter__(self):
+                return self
+
+        def __exit__(self, *exc_info):
+                return False
+
+        def set(self, **args):
+                pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+        __slots__ = ('tracer', 'name', 'args', 'start')
+
+        def __init__(self, tracer, name: str, args: dict):
+                self.tracer = tracer
+                self.name = name
+                self.args = args
+
+        def __enter__(self):
+                self.start = time.perf_counter_ns()
+                return self
+
+        def __exit__(self, *exc_info):
+                self.tracer.record(self.name, self.start, time.perf_counter_ns(), **self.args)
+                return False
+
+        def set(self, **args):
+                """Adds arguments to the span, e.g. a result known once the work is done."""
+                self.args.update(args)
+
+class _Timer:
+        __slots__ = ('tracer', 'name', 'start')
+
+        def __init__(self, tracer, name: str):
+                self.tracer = tracer
+                self.name = name
+
+        def __enter__(self):
+                self.start = time.perf_counter_ns()
+                return self
+
+        def __exit__(self, *exc_info):
+                self.tracer.add_time(self.name, self.start, time.perf_counter_ns())
+                return False
+
+        def set(self, **args):
+                pass
+
+class Tracer:
+        """
+        Collects the timing spans of one search. Spans may be recorded from several threads.
+        """
+
+        def __init__(self, enabled: bool = True, memory: bool = False):
+                """
+                Initializes the tracer and starts its clock.
+                @param enabled (bool): Whether spans are recorded.
+                @param memory (bool): Whether to track the Python heap peak with tracemalloc, which slows allocations down.
+                """
+                self.enabled = enabled
+                self.origin_ns = time.perf_counter_ns()
+                self.spans = []          # (name, start_ns, end_ns, thread id, args)
+                self.worker_times = {}   # name -> [count, total ns] of work done in other processes
+                self.stage_times = {}    # name -> [count, total ns, first start ns] of blocks timed without a span
+                self.lock = threading.Lock()
+                self.memory = {}
+                self.own_tracemalloc = enabled and memory and not tracemalloc.is_tracing()
+                if self.own_tracemalloc:
+                        tracemalloc.start()
+
+        def span(self, name: str, **args):
+                """
+                Returns a context manager timing a block, e.g. `with tracer.span('search', cv_path=path):`.
+                """
+                if not self.enabled:
+                        return _NULL_SPAN
+                return _Span(self, name, args)
+
+        def timed(self, name: str):
+                """
+                Returns a context manager adding the time of a block to the counters of a stage, without keeping
+                a span, e.g. `with tracer.timed('search'):` around the search of each CV.
+                """
+                if not self.enabled:
+                        return _NULL_SPAN
+                return _Timer(self, name)
+
+        def add_time(self, name: str, start_ns: int, end_ns: int):
+                """Adds a block measured with time.perf_counter_ns() to the counters of a stage."""
+                if self.enabled:
+                        with self.lock:
+                                entry = self.stage_times.get(name)
+                                if entry is None:
+                                        self.stage_times[name] = [1, end_ns - start_ns, start_ns]
+                                else:
+                                        entry[0] += 1
+                                        entry[1] += end_ns - start_ns
+
+        def record(self, name: str, start_ns: int, end_ns: int, **args):
+                """Records a span measured by the caller with time.perf_counter_ns()."""
+                if self.enabled:
+                        self.spans.append((name, start_ns, end_ns, threading.get_ident(), args))
+
+        def add_worker_time(self, name: str, duration_ns: int):
+                """Adds time spent in a worker process, which is summed up but has no place on the timeline."""
+                if self.enabled:
+                        entry = self.worker_times.setdefault(name, [0, 0])
+                        entry[0] += 1
+                        entry[1] += duration_ns
+
+        def stop(self):
+                """Captures the memory peaks; the tracer can still be read and exported afterwards."""
+                if not self.enabled:
+                        return
+                if tracemalloc.is_tracing():
+                        self.memory['tracemalloc_peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                        if self.own_tracemalloc:
+                                tracemalloc.stop()
+                                self.own_tracemalloc = False
+                if resource is not None:
+                        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+                        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                        self.memory['rss_peak_kb'] = max_rss // 1024 if os.uname().sysname == 'Darwin' else max_rss
+
+        def breakdown(self) -> dict:
+                """
+                Sums up the spans and counters per stage, in order of first occurrence.
+                @return: A dict name -> {'count', 'total_ms'}; the time of worker processes is under 'workers'.
+                """
+                stages = {}
+                first_start = {}
+                for name, start_ns, end_ns, _, _ in self.spans:
+                        entry = stages.setdefault(name, {'count': 0, 'total_ms': 0.0})
+                        entry['count'] += 1
+                        entry['total_ms'] += (end_ns - start_ns) / 1e6
+                        first_start.setdefault(name, start_ns)
+                for name, (count, total_ns, start_ns) in self.stage_times.items():
+                        entry = stages.setdefault(name, {'count': 0, 'total_ms': 0.0})
+                        entry['count'] += count
+                        entry['total_ms'] += total_ns / 1e6
+                        first_start[name] = min(first_start.get(name, start_ns), start_ns)
+                stages = {name: stages[name] for name in sorted(stages, key=first_start.__getitem__)}
+                return {
+                        'stages': stages,
+                        'workers': {name: {'count': count, 'total_ms': total / 1e6} for name, (count, total) in self.worker_times.items()},
+                        'memory': dict(self.memory),
+                }
+
+        def format_breakdown(self) -> str:
+                """Returns the breakdown as one line, e.g. for the results summary label."""
+                breakdown = self.breakdown()
+                parts = [f"{name} {entry['total_ms']:.1f} ms" + (f" ({entry['count']}x)" if entry['count'] > 1 else "")
+                         for name, entry in breakdown['stages'].items()]
+                line = "Stages: " + (", ".join(parts) or "none") + "."
+                if breakdown['workers']:
+                        line += " Workers: " + ", ".join(
+                                f"{name} {entry['total_ms']:.1f} ms" for name, entry in breakdown['workers'].items()
+                        ) + "."
+                memory = breakdown['memory']
+                if 'rss_peak_kb' in memory:
+                        line += f" Peak RSS {memory['rss_peak_kb'] / 1024:.0f} MB."
+                if 'tracemalloc_peak_kb' in memory:
+                        line += f" Python heap peak {memory['tracemalloc_peak_kb'] / 1024:.1f} MB."
+                return line
+
+        def to_dict(self) -> dict:
+                """
+                Returns the trace as JSON-serializable data: the breakdown and every span, in ms from the start.
+                Stages timed with counters are in the breakdown only.
+                """
+                data = self.breakdown()
+                data['spans'] = [
+                        {
+                                'name': name,
+                                'start_ms': (start_ns - self.origin_ns) / 1e6,
+                                'duration_ms': (end_ns - start_ns) / 1e6,
+                                'thread': thread_id,
+                                'args': args,
+                        }
+                        for name, start_ns, end_ns, thread_id, args in self.spans
+                ]
+                return data
+
+        def to_chrome_trace(self) -> dict:
+                """Returns the spans as complete ('X') events of the Chrome trace event format, in microseconds."""
+                pid = os.getpid()
+                events = [
+                        {
+                                'name': name, 'cat': 'search', 'ph': 'X', 'pid': pid, 'tid': thread_id,
+                                'ts': (start_ns - self.origin_ns) / 1000, 'dur': (end_ns - start_ns) / 1000,
+                                'args': {key: str(value) for key, value in args.items()},
+                        }
+                        for name, start_ns, end_ns, thread_id, args in self.spans
+                ]
+                return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': self.breakdown()}
+
+        def save(self, path: str, fmt: str = 'chrome'):
+                """
+                Writes the trace to a file.
+                @param fmt (str): 'chrome' for the Chrome trace event format, 'json' for to_dict().
+                """
+                data = self.to_chrome_trace() if fmt == 'chrome' else self.to_dict()
+                with open(path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, default=str)
+
+# Shared disabled tracer, the default of instrumented code
+NULL_TRACER = Tracer(enabled=False)
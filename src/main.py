@@ -1,6 +1,8 @@
 import sys
 import os
-import time
+import logging
+import threading
+from contextlib import nullcontext
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -15,13 +17,64 @@ from PySide6.QtWidgets import (
     QFormLayout,
     QRadioButton,
     QSpinBox,
+    QCheckBox,
 )
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtGui import QFont
 from SummaryWindow import SummaryWindow 
-from Database import create_connection, get_all_cv_data, get_all_cv_data, get_summary_details_by_id
+from Database import create_connection, iter_cv_data, get_summary_details_by_id
 from ExtractCV import ExtractCV
-from Search.Search import Search
+from DirectoryScanner import absolute_path
+from TextCache import TextCache
+from Index.InvertedIndex import InvertedIndex
+from Index.TrigramIndex import TrigramIndex
+from Index.SuffixArray import SuffixArrayIndex
+from SearchPipeline import SearchPipeline
+from Tracing import Tracer
+
+# Set CV_ANALYZER_TRACE=<file> to also track the Python heap and write a Chrome trace of each search
+TRACE_PATH = os.environ.get("CV_ANALYZER_TRACE")
+
+class SearchSignals(QObject):
+    # (done, total, stage) as CVs are processed
+    progress = Signal(int, int, str)
+    # Current top results, shaped like the arguments of create_cv_card
+    results = Signal(list)
+    # Summary returned by SearchPipeline.run
+    finished = Signal(dict)
+    error = Signal(str)
+
+class SearchWorker(QRunnable):
+    def __init__(self, pipeline, keywords, algorithm, whole_words, top_n, ranking='occurrences', tracer=None):
+        super().__init__()
+        self.pipeline = pipeline
+        self.keywords = keywords
+        self.algorithm = algorithm
+        self.whole_words = whole_words
+        self.top_n = top_n
+        self.ranking = ranking
+        self.tracer = tracer
+        self.cancel_event = threading.Event()
+        self.signals = SearchSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            # Applications are streamed on a pooled connection of their own, so the GUI can keep using its connection
+            summary = self.pipeline.run(
+                iter_cv_data(), self.keywords, self.algorithm, self.whole_words, self.top_n,
+                cancel_event=self.cancel_event,
+                on_progress=self.signals.progress.emit,
+                on_results=self.signals.results.emit,
+                ranking=self.ranking,
+                tracer=self.tracer,
+            )
+            self.signals.finished.emit(summary)
+        except Exception as e:
+            logging.getLogger(__name__).exception("Search failed")
+            self.signals.error.emit(str(e))
 
 class CVAnalyzerApp(QMainWindow):
     def __init__(self):
@@ -30,6 +83,25 @@ class CVAnalyzerApp(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
 
         self.db_connection = None
+        # Persistent cache of extracted CV text, shared by every search
+        self.text_cache = TextCache()
+        # Positional index of the CV corpus, answering whole-word queries without scanning
+        self.inverted_index = InvertedIndex.load()
+        # Trigram index of the CV corpus, so substring searches only verify candidate CVs
+        self.trigram_index = TrigramIndex.load()
+        # Suffix array of each CV, counting a keyword in a CV with two binary searches
+        self.suffix_array_index = SuffixArrayIndex.load()
+        # Indexes updated since they were loaded, saved on exit
+        self.dirty_indexes = set()
+        # Queries run in a background thread, one at a time
+        self.search_pipeline = SearchPipeline(
+            self.text_cache, self.inverted_index, self.trigram_index, self.suffix_array_index
+        )
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.search_worker = None
+        # Stage timings of the current search, shown in the summary
+        self.tracer = None
 
         # Main widget and layout
         main_widget = QWidget()
@@ -60,22 +132,40 @@ class CVAnalyzerApp(QMainWindow):
         algorithm_layout = QHBoxLayout()
         self.kmp_radio = QRadioButton("KMP")
         self.bm_radio = QRadioButton("BM")
+        self.aho_radio = QRadioButton("Aho-Corasick")
+        self.sa_radio = QRadioButton("Suffix Array")
         self.kmp_radio.setChecked(True)  # Default selection
         algorithm_layout.addWidget(self.kmp_radio)
         algorithm_layout.addWidget(self.bm_radio)
+        algorithm_layout.addWidget(self.aho_radio)
+        algorithm_layout.addWidget(self.sa_radio)
         search_layout.addRow(QLabel("Search Algorithm:"), algorithm_layout)
 
+        # Whole-word matching through the inverted index
+        self.whole_words_checkbox = QCheckBox("Whole words only (use index)")
+        search_layout.addRow(QLabel("Match:"), self.whole_words_checkbox)
+
+        # BM25 favours rare keywords and short CVs over the raw number of occurrences
+        self.bm25_checkbox = QCheckBox("Rank by relevance (BM25)")
+        search_layout.addRow(QLabel("Ranking:"), self.bm25_checkbox)
+
         # Top Matches selector
         self.top_matches_spinbox = QSpinBox()
         self.top_matches_spinbox.setMinimum(1)
         self.top_matches_spinbox.setValue(5)
         search_layout.addRow(QLabel("Top Matches:"), self.top_matches_spinbox)
 
-        # Search Button
+        # Search and Cancel Buttons
+        search_buttons_layout = QHBoxLayout()
         self.search_button = QPushButton("Search")
         self.search_button.setEnabled(False) 
         self.search_button.setStyleSheet("padding: 10px;")
-        search_layout.addRow(self.search_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.setStyleSheet("padding: 10px;")
+        search_buttons_layout.addWidget(self.search_button)
+        search_buttons_layout.addWidget(self.cancel_button)
+        search_layout.addRow(search_buttons_layout)
 
         main_layout.addWidget(search_panel)
 
@@ -104,6 +194,7 @@ class CVAnalyzerApp(QMainWindow):
         # Load database
         self.load_database_button.clicked.connect(self.load_database)
         self.search_button.clicked.connect(self.perform_search)
+        self.cancel_button.clicked.connect(self.cancel_search)
 
     def load_database(self):
         if self.db_connection is None:
@@ -118,86 +209,126 @@ class CVAnalyzerApp(QMainWindow):
             self.results_summary_label.setText("Database connection failed. Check credentials/server.")
 
     def perform_search(self):
-        ## Clear Cards ##
-        for i in reversed(range(self.results_grid_layout.count())):
-            widget = self.results_grid_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
         keywords_text = self.keywords_input.text()
         if not keywords_text:
             self.results_summary_label.setText("Please enter at least one keyword.")
             return
-        keywords = [kw.strip().lower() for kw in keywords_text.split(',') if kw.strip()]
-        algorithm = "kmp" if self.kmp_radio.isChecked() else "bm"
+        # Keywords are normalized like the CV text, so "Node.js" matches "nodejs" in a CV
+        keywords = [kw for kw in map(ExtractCV.normalize_text, keywords_text.split(',')) if kw]
+        if not keywords:
+            self.results_summary_label.setText("Please enter at least one keyword.")
+            return
+        if self.kmp_radio.isChecked():
+            algorithm = "kmp"
+        elif self.bm_radio.isChecked():
+            algorithm = "bm"
+        elif self.aho_radio.isChecked():
+            algorithm = "aho"
+        else:
+            algorithm = "sa"
         top_n = self.top_matches_spinbox.value()
 
         if not self.db_connection:
             self.results_summary_label.setText("Please load the database first.")
             return
-        
+
+        self.clear_cards()
         self.results_summary_label.setText(f"Searching {algorithm.upper()} for '{keywords}'...")
-        QApplication.processEvents() # Allow GUI to update
-
-        start_time = time.time()
-        search_engine = Search()
-        all_applications = get_all_cv_data(self.db_connection)
-        results = []
-        
-        for app_data in all_applications:
-            cv_path = app_data['cv_path']
-            cv_extractor = ExtractCV(cv_path) 
-            
-            matched_keywords = {}
-            for keyword in keywords:
-                count = search_engine._search(algorithm, cv_extractor, keyword)
-                if count > 0:
-                    matched_keywords[keyword] = count
-            
-            if matched_keywords:
-                result_entry = {
-                    "detail_id": app_data['detail_id'],
-                    "applicant_id": app_data['applicant_id'],
-                    "name": f"{app_data['first_name']} {app_data['last_name']}",
-                    "application_role": app_data['application_role'],
-                    "cv_path": cv_path,
-                    "matched_keywords": matched_keywords
-                }
-                results.append(result_entry)
-        
-        runtime_ms = (time.time() - start_time) * 1000
-
-        # Sort results and get top N
-        results.sort(key=lambda x: sum(x['matched_keywords'].values()), reverse=True)
-        final_results = results[:top_n]
-        
-        self.results_summary_label.setText(
-            f"Exact Match: Scanned {len(all_applications)} CVs in {runtime_ms:.2f} ms. Found {len(results)} relevant CV(s)."
+        self.search_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+        # The tracer keeps a few spans per search and counts the work done per CV, so it stays on for the
+        # stage breakdown; heap tracking only runs when a trace file is requested
+        self.tracer = Tracer(memory=bool(TRACE_PATH))
+
+        # The query runs in a worker thread; its signals are delivered to this (GUI) thread
+        worker = SearchWorker(
+            self.search_pipeline, keywords, algorithm, self.whole_words_checkbox.isChecked(), top_n,
+            'bm25' if self.bm25_checkbox.isChecked() else 'occurrences', self.tracer,
+        )
+        worker.signals.progress.connect(self.on_search_progress)
+        worker.signals.results.connect(self.show_cards)
+        worker.signals.finished.connect(self.on_search_finished)
+        worker.signals.error.connect(self.on_search_error)
+        self.search_worker = worker
+        self.thread_pool.start(worker)
+
+    def cancel_search(self):
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.results_summary_label.setText("Cancelling search...")
+
+    def on_search_progress(self, done, total, stage):
+        stage_text = {"extract": "Extracting and searching", "search": "Searching", "fuzzy": "Fuzzy matching"}.get(stage, stage)
+        self.results_summary_label.setText(f"{stage_text}: {done} / {total} CVs...")
+
+    def on_search_finished(self, summary):
+        self.search_worker = None
+        self.search_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.dirty_indexes.update(self.search_pipeline.dirty_indexes)
+
+        final_results = summary["results"]
+        self.show_cards(final_results)
+
+        cache_stats = self.text_cache.get_stats()
+        search_stats = summary["stats"]
+        summary_lines = [
+            f"Exact Match: Scanned {summary['documents']} CVs ({summary['unique_documents']} unique documents) in {summary['runtime_ms']:.2f} ms. "
+            f"Found {summary['relevant']} relevant CV(s)."
+        ]
+        if summary["pruned"]:
+            summary_lines[0] += f" Did not count the matches of {summary['pruned']} CV(s) that could not reach the top {len(final_results)}."
+        if summary["fuzzy_keywords"]:
+            summary_lines.append(
+                f"Fuzzy Match: Scanned {summary['documents']} CVs in {summary['fuzzy_runtime_ms']:.2f} ms for {', '.join(summary['fuzzy_keywords'])}."
+            )
+        summary_lines.append(
+            f"Engine: {search_stats['documents_scanned']} document scans, {search_stats['chars_scanned']:,} chars, "
+            f"{search_stats['matches_found']} exact and {search_stats['fuzzy_matches']} fuzzy matches."
         )
-        ## Input Fuzzy match results here
+        summary_lines.append(f"Text cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+        if self.tracer is not None:
+            self.tracer.stop()
+            summary_lines.append(self.tracer.format_breakdown())
+            if TRACE_PATH:
+                self.tracer.save(TRACE_PATH)
+        if summary["cancelled"]:
+            summary_lines.insert(0, "Search cancelled, showing partial results.")
+        self.results_summary_label.setText("\n".join(summary_lines))
+
+        if not final_results and not summary["cancelled"]:
+            self.results_summary_label.setText("No matches found.")
 
-        # Clear previous results
+    def on_search_error(self, message):
+        self.search_worker = None
+        if self.tracer is not None:
+            self.tracer.stop()
+        self.search_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.results_summary_label.setText(f"Search failed: {message}")
+
+    def clear_cards(self):
         for i in reversed(range(self.results_grid_layout.count())):
             widget = self.results_grid_layout.itemAt(i).widget()
             if widget:
                 widget.setParent(None)
-        
-        if not final_results:
-            self.results_summary_label.setText("No matches found.")
-            return
 
-        for result in final_results:
-            card = self.create_cv_card(
-                result["detail_id"], # Pass the detail_id
-                result["applicant_id"],
-                result["name"],
-                result["application_role"],
-                result["cv_path"],
-                result["matched_keywords"]
-            )
-            self.results_grid_layout.addWidget(card)
+    def show_cards(self, results):
+        with self.tracer.span("cards") if self.tracer is not None else nullcontext():
+            self.clear_cards()
+            for result in results:
+                card = self.create_cv_card(
+                    result["detail_id"], # Pass the detail_id
+                    result["applicant_id"],
+                    result["name"],
+                    result["application_role"],
+                    result["cv_path"],
+                    result["matched_keywords"]
+                )
+                self.results_grid_layout.addWidget(card)
 
-    
     def create_cv_card(self, detail_id, applicant_id, name, application_role, cv_path, matched_keywords_data):
         card = QFrame()
         card.setFrameShape(QFrame.Box)
@@ -248,19 +379,39 @@ class CVAnalyzerApp(QMainWindow):
         else:
             print(f"No details found for application with Detail ID {detail_id}.")
 
+    def closeEvent(self, event):
+        # Stop a running query before saving the indexes it may be updating
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        self.thread_pool.waitForDone()
+        self.dirty_indexes.update(self.search_pipeline.dirty_indexes)
+        for index in self.dirty_indexes:
+            index.save()
+        self.text_cache.close()
+        # Return the connection to the pool
+        if self.db_connection is not None and self.db_connection.is_connected():
+            self.db_connection.close()
+        super().closeEvent(event)
+
     def view_cv(self, name, cv_path):
-        if not os.path.exists(cv_path):
+        # Stored paths are relative to the project root, whatever the working directory
+        path = absolute_path(cv_path)
+        if not os.path.exists(path):
             self.results_summary_label.setText(f"CV file not found: {cv_path}")
             return
 
         # Open the CV file using the default application
         try:
-            absolute_path = os.path.abspath(cv_path)
-            os.startfile(absolute_path)  # For Windows
+            os.startfile(path)  # For Windows
         except Exception as e:
             self.results_summary_label.setText(f"Error opening CV: {str(e)}")
 
 if __name__ == "__main__":
+    # Per-document search messages are DEBUG; set CV_ANALYZER_LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(
+        level=os.environ.get("CV_ANALYZER_LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
     app = QApplication(sys.argv)
     window = CVAnalyzerApp()
     window.show()
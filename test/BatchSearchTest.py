@@ -0,0 +1,108 @@
+import sys
+import os
+import io
+import json
+import contextlib
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.BatchSearch import main, iter_directory_applications
+from TextCacheTest import write_pdf
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  Helper to write a data/<ROLE>/<file>.pdf directory
+# ======================================================================
+def make_data_dir(tmp):
+    data_dir = os.path.join(tmp, 'data')
+    cvs = {
+        'ACCOUNTANT': ["Accountant with Excel and SQL reporting.", "Senior accountant, Excel, Excel."],
+        'INFORMATION-TECHNOLOGY': ["Senior Python developer, Python, Node.js and SQL."],
+    }
+    for role, texts in cvs.items():
+        os.makedirs(os.path.join(data_dir, role))
+        for i, text in enumerate(texts):
+            write_pdf(os.path.join(data_dir, role, f"{i}.pdf"), text)
+    return data_dir
+
+# ======================================================================
+#  TEST CASE 1: test_directory_source_rows
+# ======================================================================
+def test_directory_source_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = list(iter_directory_applications(make_data_dir(tmp)))
+        print_assertion("3 rows with consecutive detail ids and titled roles")
+        assert [row['detail_id'] for row in rows] == [1, 2, 3], f"Unexpected rows: {rows}"
+        assert [row['application_role'] for row in rows] == ['Accountant', 'Accountant', 'Information Technology'], rows
+
+# ======================================================================
+#  TEST CASE 2: test_json_output
+# ======================================================================
+def test_json_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = make_data_dir(tmp)
+        output_path = os.path.join(tmp, 'results.json')
+        exit_code = main([
+            "--data-dir", data_dir, "--keywords", "Excel, sql", "--algorithm", "bm", "--top", "2",
+            "--workers", "1", "--no-cache", "--output", output_path,
+        ])
+        with open(output_path) as f:
+            output = json.load(f)
+
+        print_assertion("exit_code == 0 and output['query']['keywords'] == ['excel', 'sql']")
+        assert exit_code == 0 and output['query']['keywords'] == ['excel', 'sql'], f"Unexpected query: {output['query']}"
+        ranked = [(result['application_role'], result['matched_keywords']) for result in output['results']]
+        # Both CVs score 2, so they keep the order of the directory
+        print_assertion("ranked == [('Accountant', {'excel': 1, 'sql': 1}), ('Accountant', {'excel': 2})]")
+        assert ranked == [('Accountant', {'excel': 1, 'sql': 1}), ('Accountant', {'excel': 2})], f"Unexpected ranking: {ranked}"
+        print_assertion("summary['relevant'] == 3 and every timing is reported")
+        assert output['summary']['relevant'] == 3, f"Unexpected summary: {output['summary']}"
+        assert {'load_ms', 'search_ms', 'exact_ms', 'fuzzy_ms', 'save_ms', 'total_ms'} <= set(output['timings']), output['timings']
+
+# ======================================================================
+#  TEST CASE 3: test_ndjson_output
+# ======================================================================
+def test_ndjson_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = make_data_dir(tmp)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            main(["--data-dir", data_dir, "--keywords", "python", "--whole-words", "--format", "ndjson", "--workers", "1", "--no-cache"])
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        print_assertion("one result line, then the summary line")
+        assert len(lines) == 2 and lines[0]['rank'] == 1 and 'summary' in lines[1], f"Unexpected lines: {lines}"
+        print_assertion("lines[0]['matched_keywords'] == {'python': 2}")
+        assert lines[0]['matched_keywords'] == {'python': 2}, f"Unexpected result: {lines[0]}"
+
+# ======================================================================
+#  TEST CASE 4: test_keywords_normalized_like_cv_text
+# ======================================================================
+def test_keywords_normalized_like_cv_text():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = make_data_dir(tmp)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            main(["--data-dir", data_dir, "--keywords", "Node.js, (SQL)", "--workers", "1", "--no-cache"])
+        output = json.loads(stdout.getvalue())
+
+        print_assertion("output['query']['keywords'] == ['nodejs', 'sql']")
+        assert output['query']['keywords'] == ['nodejs', 'sql'], f"Unexpected query: {output['query']}"
+        print_assertion("'Node.js' matches the 'Node.js' of the CV")
+        assert output['results'][0]['matched_keywords'] == {'nodejs': 1, 'sql': 1}, f"Unexpected result: {output['results'][0]}"
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_directory_source_rows,
+        test_json_output,
+        test_ndjson_output,
+        test_keywords_normalized_like_cv_text,
+    ]
+    run_test_suite(tests_to_run)
@@ -0,0 +1,79 @@
+import sys
+import os
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.CVGenerator import CVGenerator, DEFAULT_KEYWORDS
+from src.DirectoryScanner import DirectoryScanner
+from src.ExtractCV import ExtractCV
+from src.Search.Search import Search
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  TEST CASE 1: test_generated_layout_and_planted_keywords
+# ======================================================================
+def test_generated_layout_and_planted_keywords():
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, 'data')
+        generator = CVGenerator(base_dir, roles=('ACCOUNTANT', 'DESIGNER'), plant_rate=0.05, max_pages=3, seed=11)
+        stats = generator.generate(12, workers=2, chunk_size=5)
+        print(f"{stats['files']} files, {stats['bytes']} bytes, planted {stats['planted']}")
+
+        file_map = DirectoryScanner(base_dir).getMap()
+        paths = sorted(path for role_paths in file_map.values() for path in role_paths)
+        print_assertion("12 CVs in data/<ROLE>/<id>.pdf, one manifest entry each")
+        assert stats['files'] == 12 and set(file_map) <= {'ACCOUNTANT', 'DESIGNER'}, f"Unexpected layout: {file_map}"
+        assert paths == sorted(stats['manifest']), f"{paths} != {sorted(stats['manifest'])}"
+        assert sorted(os.path.basename(path) for path in paths) == sorted(f"{i}.pdf" for i in range(1, 13)), paths
+
+        search_engine = Search()
+        print_assertion("the extracted text holds exactly the planted keywords")
+        for path, planted in stats['manifest'].items():
+            text = ExtractCV(path).get_cleaned_text()
+            for keyword in DEFAULT_KEYWORDS:
+                count = search_engine._search('kmp', text, keyword, fuzzy_fallback=False)
+                assert count == planted.get(keyword, 0), f"'{keyword}' found {count} times in {path}, planted {planted}"
+        print_assertion("sum(stats['planted'].values()) > 0")
+        assert sum(stats['planted'].values()) > 0, "Keywords should be planted"
+
+# ======================================================================
+#  TEST CASE 2: test_generation_is_reproducible
+# ======================================================================
+def test_generation_is_reproducible():
+    with tempfile.TemporaryDirectory() as tmp:
+        first = CVGenerator(os.path.join(tmp, 'a'), seed=3)
+        second = CVGenerator(os.path.join(tmp, 'b'), seed=3)
+        other = CVGenerator(os.path.join(tmp, 'c'), seed=4)
+
+        print_assertion("the same seed and id give the same CV, another seed another CV")
+        for cv_id in [1, 2, 500]:
+            a, b = first.generate_cv(cv_id), second.generate_cv(cv_id)
+            assert (a['role'], a['pages'], a['planted']) == (b['role'], b['pages'], b['planted']), f"CV {cv_id} differs"
+        assert first.generate_cv(1)['pages'] != other.generate_cv(1)['pages'], "Another seed should give another CV"
+
+        print_assertion("a serial run writes the same texts as a parallel run")
+        serial = first.generate(4, workers=1)
+        parallel = second.generate(4, workers=2, chunk_size=1)
+        texts = lambda stats: sorted(ExtractCV(path).get_cleaned_text() for path in stats['manifest'])
+        assert texts(serial) == texts(parallel), "Serial and parallel runs should write the same CVs"
+
+        print_assertion("too many words per page -> ValueError")
+        try:
+            CVGenerator(os.path.join(tmp, 'd'), words_per_page=3000).write_cv(1)
+            assert False, "Overflowing pages should be rejected"
+        except ValueError:
+            pass
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_generated_layout_and_planted_keywords,
+        test_generation_is_reproducible,
+    ]
+    run_test_suite(tests_to_run)
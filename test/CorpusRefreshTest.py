@@ -0,0 +1,180 @@
+import sys
+import os
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.DirectoryScanner import DirectoryScanner, PROJECT_ROOT
+from src.SearchPipeline import SearchPipeline
+from src.BatchSearch import iter_directory_applications
+from src.CorpusRefresh import refresh_corpus
+from src.TextCache import TextCache
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+from SearchTest import run_test_suite, print_assertion
+from SeederBulkTest import make_seeder
+from TextCacheTest import write_pdf
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+# ======================================================================
+#  TEST CASE 1: test_snapshot_deltas
+# ======================================================================
+def test_snapshot_deltas():
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, 'data')
+        snapshot_path = os.path.join(tmp, 'snapshot.json')
+        for role in ['ACCOUNTANT', 'DESIGNER', 'EMPTY']:
+            os.makedirs(os.path.join(base_dir, role))
+        for name in ['b.pdf', 'a.pdf']:
+            write_file(os.path.join(base_dir, 'ACCOUNTANT', name), name)
+        write_file(os.path.join(base_dir, 'DESIGNER', 'c.pdf'), 'c')
+        write_file(os.path.join(base_dir, 'DESIGNER', 'old', 'd.pdf'), 'd')
+
+        scanner = DirectoryScanner(base_dir, workers=2)
+        print_assertion("getMap() lists the files of each role, sorted, without nested or empty directories")
+        assert scanner.getMap() == {
+            'ACCOUNTANT': [f"{base_dir}/ACCOUNTANT/a.pdf", f"{base_dir}/ACCOUNTANT/b.pdf"],
+            'DESIGNER': [f"{base_dir}/DESIGNER/c.pdf"],
+        }, scanner.getMap()
+        print_assertion("the first run finds every file added")
+        first = scanner.changes(snapshot_path)
+        assert first['added'] == sorted(scanner.snapshot()) and not first['modified'] and not first['removed'], first
+        print_assertion("an unchanged directory has no delta")
+        unchanged = DirectoryScanner(base_dir).changes(snapshot_path)
+        assert unchanged == {'added': [], 'modified': [], 'removed': []}, unchanged
+
+        write_file(os.path.join(base_dir, 'ACCOUNTANT', 'a.pdf'), 'a, rewritten')
+        os.remove(os.path.join(base_dir, 'ACCOUNTANT', 'b.pdf'))
+        write_file(os.path.join(base_dir, 'EMPTY', 'e.pdf'), 'e')
+        deltas = DirectoryScanner(base_dir).changes(snapshot_path)
+        print_assertion("added, modified and removed files are detected")
+        assert deltas == {
+            'added': [f"{base_dir}/EMPTY/e.pdf"],
+            'modified': [f"{base_dir}/ACCOUNTANT/a.pdf"],
+            'removed': [f"{base_dir}/ACCOUNTANT/b.pdf"],
+        }, deltas
+
+        recursive = DirectoryScanner(base_dir, recursive=True)
+        print_assertion("a recursive scan files nested CVs under their role and ignores the flat snapshot")
+        assert f"{base_dir}/DESIGNER/old/d.pdf" in recursive.getMap()['DESIGNER'], recursive.getMap()
+        assert recursive.load_snapshot(snapshot_path) == {}, "A snapshot of a flat scan should not be compared"
+
+# ======================================================================
+#  TEST CASE 2: test_refresh_reindexes_changed_files_only
+# ======================================================================
+def test_refresh_reindexes_changed_files_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, 'data')
+        snapshot_path = os.path.join(tmp, 'snapshot.json')
+        os.makedirs(os.path.join(base_dir, 'ACCOUNTANT'))
+        paths = [os.path.join(base_dir, 'ACCOUNTANT', f"cv{i}.pdf").replace('\\', '/') for i in range(4)]
+        for i, path in enumerate(paths):
+            write_pdf(path, f"Accountant number {i} with SQL skills.")
+        cache = TextCache(os.path.join(tmp, 'cache.sqlite3'))
+        indexes = [InvertedIndex(), TrigramIndex()]
+
+        stats = refresh_corpus(DirectoryScanner(base_dir).changes(snapshot_path), cache, indexes, workers=1)
+        print_assertion("the first refresh extracts and indexes every CV")
+        assert stats['extracted'] == 4 and stats['reindexed'] == 8, stats
+        assert all(sorted(index.get_documents()) == paths for index in indexes), "Every CV should be indexed"
+
+        write_pdf(paths[0], "Accountant now fluent in Python.")
+        os.remove(paths[1])
+        added = os.path.join(base_dir, 'ACCOUNTANT', 'cv9.pdf').replace('\\', '/')
+        write_pdf(added, "New accountant with Excel.")
+        cache.hits = cache.misses = 0
+        stats = refresh_corpus(DirectoryScanner(base_dir).changes(snapshot_path), cache, indexes, workers=1)
+        print_assertion("only the added and modified CVs are extracted")
+        assert stats['extracted'] == 2 and cache.misses == 2 and stats['unindexed'] == 2, stats
+        print_assertion("the indexes hold the new text and drop the removed CV")
+        inverted = indexes[0]
+        assert sorted(inverted.get_documents()) == sorted([paths[0], paths[2], paths[3], added]), inverted.get_documents()
+        assert set(inverted.term_counts('python')) == {paths[0]} and set(inverted.term_counts('excel')) == {added}
+        print_assertion("a refresh without changes does nothing")
+        stats = refresh_corpus(DirectoryScanner(base_dir).changes(snapshot_path), cache, indexes, workers=1)
+        assert stats['extracted'] == stats['reindexed'] == stats['unindexed'] == 0, stats
+        cache.close()
+
+# ======================================================================
+#  TEST CASE 3: test_sync_applications
+# ======================================================================
+def test_sync_applications():
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, 'data').replace('\\', '/')
+        deltas = {
+            'added': [f"{base_dir}/DESIGNER/new.pdf", f"{base_dir}/INFORMATION-TECHNOLOGY/new.pdf"],
+            'modified': [f"{base_dir}/ACCOUNTANT/accountant0.pdf"],
+            'removed': [f"{base_dir}/ACCOUNTANT/accountant1.pdf", f"{base_dir}/ACCOUNTANT/accountant2.pdf"],
+        }
+        # accountant1.pdf is referenced by three applications, accountant2.pdf by none
+        seeder, connections = make_seeder(tmp, {deltas['removed'][0]: 3})
+        stats = seeder.sync_applications(deltas, seed=1)
+        conn, cursor, _ = connections[0]
+        details = [rows for table, rows in cursor.batches if table == 'ApplicationDetail']
+
+        print_assertion("the applications of removed CVs are deleted, by cv_path")
+        assert [rows for rows in details if len(rows[0]) == 1] == [[(path,) for path in deltas['removed']]], cursor.batches
+        print_assertion("each added CV gets an applicant applying for the role of its directory")
+        inserted = [rows for rows in details if len(rows[0]) == 3]
+        assert inserted == [[(1, 'Designer', deltas['added'][0]), (2, 'Information Technology', deltas['added'][1])]], cursor.batches
+        print_assertion("stats == {'added': 2, 'removed': 3}, the number of deleted rows")
+        assert stats == {'added': 2, 'removed': 3} and conn.commits >= 1, stats
+
+# ======================================================================
+#  TEST CASE 4: test_refresh_and_pipeline_share_document_ids
+# ======================================================================
+def test_refresh_and_pipeline_share_document_ids():
+    # Inside the project (cache/ is ignored by git), so the CV paths are relative to the project root
+    os.makedirs(os.path.join(PROJECT_ROOT, 'cache'), exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=os.path.join(PROJECT_ROOT, 'cache')) as tmp:
+        base_dir = os.path.join(tmp, 'data')
+        os.makedirs(os.path.join(base_dir, 'HR'))
+        for i in range(3):
+            write_pdf(os.path.join(base_dir, 'HR', f"{i}.pdf"), f"Recruiter {i} with payroll and python skills.")
+        relative_dir = os.path.relpath(tmp, PROJECT_ROOT).replace('\\', '/')
+        keys = [f"{relative_dir}/data/HR/{i}.pdf" for i in range(3)]
+        snapshot_path = os.path.join(tmp, 'snapshot.json')
+        cache = TextCache(os.path.join(tmp, 'cache.sqlite3'))
+        indexes = [InvertedIndex(), TrigramIndex(), SuffixArrayIndex()]
+        pipeline = SearchPipeline(cache, *indexes, workers=1)
+
+        def refresh_and_search():
+            refresh_corpus(DirectoryScanner(base_dir).changes(snapshot_path), cache, indexes, workers=1)
+            applications = list(iter_directory_applications(base_dir))
+            # A row may spell the path of its CV differently, e.g. absolute
+            applications.append(dict(applications[0], detail_id=99, cv_path=os.path.abspath(os.path.join(PROJECT_ROOT, applications[0]['cv_path']))))
+            for algorithm, whole_words in [('kmp', False), ('kmp', True), ('sa', False)]:
+                summary = pipeline.run(applications, ["python"], algorithm, whole_words, top_n=10)
+                assert summary['relevant'] == len(applications), f"Every application should match: {summary}"
+
+        refresh_and_search()
+        print_assertion("the refresh and the pipeline index every CV once, relative to the project root")
+        for index in indexes:
+            assert sorted(index.get_documents()) == keys, f"{type(index).__name__}: {index.get_documents()}"
+
+        os.remove(os.path.join(base_dir, 'HR', '1.pdf'))
+        refresh_and_search()
+        print_assertion("the deleted CV is gone from every index")
+        for index in indexes:
+            assert sorted(index.get_documents()) == [keys[0], keys[2]], f"{type(index).__name__}: {index.get_documents()}"
+        cache.close()
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_snapshot_deltas,
+        test_refresh_reindexes_changed_files_only,
+        test_sync_applications,
+        test_refresh_and_pipeline_share_document_ids,
+    ]
+    run_test_suite(tests_to_run)
@@ -0,0 +1,154 @@
+import sys
+import os
+import io
+import json
+import contextlib
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import Database
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  In-memory stand-ins for a connection and its unbuffered cursor
+# ======================================================================
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+        self.fetch_sizes = []
+        self.closed = False
+
+    def execute(self, query):
+        self.query = query
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch = self.rows[self.position:self.position + size]
+        self.position += len(batch)
+        return batch
+
+    def close(self):
+        self.closed = True
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+        self.cursor_kwargs = None
+        self.pings = 0
+        self.calls = []
+
+    def shutdown(self):
+        self.calls.append('shutdown')
+
+    def reconnect(self, attempts=1, delay=0):
+        self.calls.append('reconnect')
+
+    def close(self):
+        self.calls.append('close')
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self.pings += 1
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs = kwargs
+        return self.cursor_obj
+
+class PooledFakeConnection(FakeConnection):
+    # A pooled connection resets its session when returned to the pool, which fails once its socket is shut down
+    def close(self):
+        super().close()
+        raise Database.Error("Lost connection to MySQL server during query")
+
+def make_rows(n):
+    return [{'detail_id': i, 'cv_path': f"cv{i}.pdf"} for i in range(n)]
+
+# ======================================================================
+#  TEST CASE 1: test_iter_cv_data_streams_in_batches
+# ======================================================================
+def test_iter_cv_data_streams_in_batches():
+    conn = FakeConnection(make_rows(25))
+    rows = Database.iter_cv_data(conn, batch_size=10)
+
+    first = next(rows)
+    cursor = conn.cursor_obj
+    print_assertion("first row read after a single batch")
+    assert first['detail_id'] == 0 and cursor.position == 10, f"Read {cursor.position} rows for the first one"
+    print_assertion("the cursor is unbuffered and returns dicts")
+    assert conn.cursor_kwargs == {'dictionary': True, 'buffered': False}, f"Unexpected cursor: {conn.cursor_kwargs}"
+
+    remaining = list(rows)
+    print_assertion("all 25 rows are yielded in order")
+    assert [row['detail_id'] for row in [first] + remaining] == list(range(25)), "Rows are missing or out of order"
+    print_assertion("cursor.closed and conn.pings == 1")
+    assert cursor.closed and conn.pings == 1, "The cursor should be closed after a health check"
+
+# ======================================================================
+#  TEST CASE 2: test_iter_cv_data_drops_connection_on_early_stop
+# ======================================================================
+def test_iter_cv_data_drops_connection_on_early_stop():
+    conn = FakeConnection(make_rows(100000))
+    rows = Database.iter_cv_data(conn, batch_size=10)
+    next(rows)
+    rows.close()
+
+    cursor = conn.cursor_obj
+    print_assertion("only the first batch is read: cursor.position == 10")
+    assert cursor.position == 10 and cursor.fetch_sizes == [10], f"Read {cursor.position} rows after an early stop"
+    print_assertion("the connection of the caller is shut down and reconnected")
+    assert conn.calls == ['shutdown', 'reconnect'], f"Unexpected calls: {conn.calls}"
+
+    owned = PooledFakeConnection(make_rows(100000))
+    create_connection = Database.create_connection
+    Database.create_connection = lambda: owned
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            rows = Database.iter_cv_data(batch_size=10)
+            next(rows)
+            rows.close()
+    finally:
+        Database.create_connection = create_connection
+    print_assertion("a connection borrowed from the pool is shut down and returned, not drained")
+    assert owned.cursor_obj.position == 10 and owned.calls == ['shutdown', 'close'], f"Unexpected calls: {owned.calls}"
+    print_assertion("the failed session reset of the returned connection prints nothing")
+    assert output.getvalue() == "", f"Unexpected output: {output.getvalue()!r}"
+
+    conn = FakeConnection(make_rows(25))
+    list(Database.iter_cv_data(conn, batch_size=10))
+    print_assertion("a fully read result keeps the connection open")
+    assert conn.calls == [] and conn.cursor_obj.closed, f"Unexpected calls: {conn.calls}"
+
+    print_assertion("get_all_cv_data(None) == []")
+    assert Database.get_all_cv_data(None) == [], "A missing connection should return no rows"
+
+# ======================================================================
+#  TEST CASE 3: test_config_path_is_independent_of_cwd
+# ======================================================================
+def test_config_path_is_independent_of_cwd():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    print_assertion("Database.CONFIG_PATH == <root>/config/database.json")
+    assert Database.CONFIG_PATH == os.path.join(root, 'config', 'database.json'), f"Unexpected path: {Database.CONFIG_PATH}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, 'database.json')
+        with open(config_path, 'w') as f:
+            json.dump({'host': 'localhost', 'user': 'cv', 'password': 'secret', 'database': 'cv', 'port': 3306}, f)
+        config = Database.load_config(config_path)
+    print_assertion("load_config keeps host, user, password, database and port")
+    assert set(config) == {'host', 'user', 'password', 'database', 'port'}, f"Unexpected keys: {sorted(config)}"
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_iter_cv_data_streams_in_batches,
+        test_iter_cv_data_drops_connection_on_early_stop,
+        test_config_path_is_independent_of_cwd,
+    ]
+    run_test_suite(tests_to_run)
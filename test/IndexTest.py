@@ -0,0 +1,213 @@
+import sys
+import os
+import logging
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Index.CorpusIndex import CorpusIndex
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+from src.Search.Search import Search
+from src.Search.SuffixArrayStrategy import SuffixArrayStrategy
+from SearchTest import run_test_suite, print_assertion
+
+CORPUS = {
+    "data/HR/1.pdf": "project management and people management for a project team",
+    "data/IT/2.pdf": "java developer javascript react project lead",
+    "data/IT/3.pdf": "python developer management of python projects project management",
+}
+
+# ======================================================================
+#  TEST CASE 1: test_single_term_counts
+# ======================================================================
+def test_single_term_counts():
+    index = InvertedIndex()
+    for doc_id, text in CORPUS.items():
+        index.add_document(doc_id, text)
+
+    counts = index.phrase_counts("Management")
+    print(f"'management' -> {counts}")
+    print_assertion("counts == {'data/HR/1.pdf': 2, 'data/IT/3.pdf': 2}")
+    assert counts == {"data/HR/1.pdf": 2, "data/IT/3.pdf": 2}, f"Unexpected counts: {counts}"
+
+    java_counts = index.phrase_counts("java")
+    print_assertion("java_counts == {'data/IT/2.pdf': 1}")
+    assert java_counts == {"data/IT/2.pdf": 1}, "Whole-word search must not match 'javascript'"
+
+# ======================================================================
+#  TEST CASE 2: test_phrase_counts_use_positions
+# ======================================================================
+def test_phrase_counts_use_positions():
+    index = InvertedIndex()
+    for doc_id, text in CORPUS.items():
+        index.add_document(doc_id, text)
+
+    counts = index.phrase_counts("project management")
+    print(f"'project management' -> {counts}")
+    print_assertion("counts == {'data/HR/1.pdf': 1, 'data/IT/3.pdf': 1}")
+    assert counts == {"data/HR/1.pdf": 1, "data/IT/3.pdf": 1}, f"Unexpected counts: {counts}"
+
+    print_assertion("index.phrase_counts('management project') == {}")
+    assert index.phrase_counts("management project") == {}, "Phrase terms must be adjacent and in order"
+
+# ======================================================================
+#  TEST CASE 3: test_sync_save_and_load
+# ======================================================================
+def test_sync_save_and_load():
+    index = InvertedIndex()
+    print_assertion("index.sync_documents(CORPUS) == 3")
+    assert index.sync_documents(CORPUS) == 3, "All documents should be indexed on first sync"
+
+    changed = dict(CORPUS)
+    changed["data/IT/2.pdf"] = "golang developer"
+    print_assertion("index.sync_documents(changed) == 1")
+    assert index.sync_documents(changed) == 1, "Only the changed document should be re-indexed"
+    print_assertion("'java' not in index.postings")
+    assert "java" not in index.postings, "Stale postings should be removed"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.pkl")
+        index.save(path)
+        loaded = InvertedIndex.load(path)
+    print_assertion("loaded.phrase_counts('golang developer') == {'data/IT/2.pdf': 1}")
+    assert loaded.phrase_counts("golang developer") == {"data/IT/2.pdf": 1}, "Loaded index should answer queries"
+    print_assertion("loaded.doc_lengths == index.doc_lengths and the total length follows the changed CV")
+    assert loaded.doc_lengths == index.doc_lengths, "Document lengths should survive a round trip"
+    assert loaded.total_length == sum(index.doc_lengths.values()) == 19, f"Unexpected total length: {loaded.total_length}"
+
+# ======================================================================
+#  TEST CASE 4: test_trigram_prefilter_keeps_full_scan_results
+# ======================================================================
+def test_trigram_prefilter_keeps_full_scan_results():
+    index = TrigramIndex()
+    index.sync_documents(CORPUS)
+    search_engine = Search()
+
+    for keyword in ["java", "management", "project m", "script", "py", "go", "kotlin"]:
+        candidates = index.candidates(keyword)
+        full_scan = {
+            doc_id for doc_id, text in CORPUS.items()
+            if search_engine._search('kmp', text, keyword, fuzzy_fallback=False) > 0
+        }
+        print(f"'{keyword}' -> candidates {sorted(candidates) if candidates is not None else 'all'}")
+        print_assertion(f"full scan matches of '{keyword}' are all candidates")
+        assert candidates is None or full_scan <= candidates, f"Prefilter dropped a match for '{keyword}'"
+
+    print_assertion("index.candidates('java') == {'data/IT/2.pdf'}")
+    assert index.candidates("java") == {"data/IT/2.pdf"}, "Substring 'java' should only be in the IT CV"
+    print_assertion("index.candidates('kotlin') == set()")
+    assert index.candidates("kotlin") == set(), "Absent trigrams should yield no candidates"
+    print_assertion("index.candidates('py') is None")
+    assert index.candidates("py") is None, "Keywords under three characters cannot be filtered"
+
+    print_assertion("upper bounds are never below the exact counts")
+    for keyword in ["project", "management", "java", "aaa", "t p"]:
+        for doc_id, text in CORPUS.items():
+            exact = search_engine._search('kmp', text, keyword, fuzzy_fallback=False)
+            assert index.upper_bound(doc_id, keyword) >= exact, f"Bound below {exact} for '{keyword}' in {doc_id}"
+    print_assertion("index.upper_bound('data/HR/1.pdf', 'project') == 2 and index.upper_bound('data/IT/2.pdf', 'py') is None")
+    assert index.upper_bound("data/HR/1.pdf", "project") == 2, index.upper_bound("data/HR/1.pdf", "project")
+    assert index.upper_bound("data/IT/2.pdf", "py") is None, "Keywords under three characters cannot be bounded"
+
+    index.remove_document("data/IT/2.pdf")
+    print_assertion("index.candidates('java') == set() after removal")
+    assert index.candidates("java") == set(), "Removed documents should not be candidates"
+
+# ======================================================================
+#  TEST CASE 5: test_suffix_array_counts_match_kmp
+# ======================================================================
+def test_suffix_array_counts_match_kmp():
+    corpus = dict(CORPUS)
+    corpus["data/IT/4.pdf"] = "aaaa abab ababab résumé • café"
+    corpus["data/IT/5.pdf"] = ""
+    index = SuffixArrayIndex()
+    index.sync_documents(corpus)
+
+    search_engine = Search()
+    search_engine.register_strategy('sa', SuffixArrayStrategy(index))
+    for keyword in ["project", "management", "java", "a", "aa", "bab", "é", "café", "t p", "zzz"]:
+        for doc_id, text in corpus.items():
+            kmp_count = search_engine._search('kmp', text, keyword, fuzzy_fallback=False)
+            sa_count = search_engine._search('sa', text, keyword, fuzzy_fallback=False)
+            assert sa_count == kmp_count, f"Inconsistent for '{keyword}' in {doc_id}: SA={sa_count}, KMP={kmp_count}"
+        print_assertion(f"SA counts == KMP counts for '{keyword}' in every CV")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "suffix_array.pkl")
+        index.remove_document("data/HR/1.pdf")
+        index.save(path)
+        loaded = SuffixArrayIndex.load(path)
+    print_assertion("loaded.count(CORPUS['data/IT/3.pdf'], 'management') == 2 and the removed CV is not answered")
+    assert loaded.count(CORPUS["data/IT/3.pdf"], "management") == 2, "Indexed CVs should be answered after reload"
+    assert loaded.count(CORPUS["data/HR/1.pdf"], "management") is None, "Removed document should be gone after reload"
+    print_assertion("loaded.count('not indexed text', 'text') is None")
+    assert loaded.count("not indexed text", "text") is None, "Unknown texts should not be answered from the index"
+
+# ======================================================================
+#  TEST CASE 6: test_suffix_array_rebuilds_changed_documents_only
+# ======================================================================
+def test_suffix_array_rebuilds_changed_documents_only():
+    index = SuffixArrayIndex()
+    index.sync_documents(CORPUS)
+    print_assertion("the first rebuild builds one suffix array per CV, with 64-bit offsets")
+    assert index.rebuild() == len(CORPUS), "Every CV should get its suffix array"
+    assert all(sa.typecode == 'q' for sa in index.doc_arrays.values()), "Offsets should not overflow past 2^31"
+
+    arrays = dict(index.doc_arrays)
+    assert index.count(CORPUS["data/HR/1.pdf"], "project") == 2
+    index.sync_documents({**CORPUS, "data/HR/1.pdf": "java project lead"})
+    print_assertion("a changed CV rebuilds its own suffix array only")
+    assert index.rebuild() == 1, "Only the changed CV should be rebuilt"
+    assert all(index.doc_arrays[doc_id] is arrays[doc_id] for doc_id in CORPUS if doc_id != "data/HR/1.pdf")
+    assert index.count("java project lead", "java") == 1
+    assert index.count(CORPUS["data/HR/1.pdf"], "java") is None, "The previous text of a changed CV should not be answered"
+
+    print_assertion("a text with the hash and length of an indexed CV is not answered from the index")
+    text = CORPUS["data/IT/3.pdf"]
+    index.doc_lookup = {(hash(text[::-1]), len(text)): ["data/IT/3.pdf"]}
+    assert index.find_document(text[::-1]) is None, "A colliding text should not be taken for an indexed one"
+
+# ======================================================================
+#  TEST CASE 7: test_corpus_index_interface_and_load_errors
+# ======================================================================
+def test_corpus_index_interface_and_load_errors():
+    print_assertion("CorpusIndex is abstract")
+    try:
+        CorpusIndex()
+        assert False, "CorpusIndex without add_document/remove_document should not be instantiable"
+    except TypeError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inverted.pkl")
+        with open(path, 'wb') as f:
+            f.write(b"not a pickle")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger("src.Index.CorpusIndex")
+        logger.addHandler(handler)
+        try:
+            index = InvertedIndex.load(path)
+        finally:
+            logger.removeHandler(handler)
+    print_assertion("a corrupted file gives an empty index and logs an error")
+    assert not index.get_documents() and [record.levelno for record in records] == [logging.ERROR], records
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_single_term_counts,
+        test_phrase_counts_use_positions,
+        test_sync_save_and_load,
+        test_trigram_prefilter_keeps_full_scan_results,
+        test_suffix_array_counts_match_kmp,
+        test_suffix_array_rebuilds_changed_documents_only,
+        test_corpus_index_interface_and_load_errors,
+    ]
+    run_test_suite(tests_to_run)
@@ -0,0 +1,158 @@
+import sys
+import os
+import re
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+import fitz  # PyMuPDF
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ExtractCV import ExtractCV
+
+"""
+Benchmark of the CV text extraction and normalization against the previous implementation.
+
+The previous implementation grew the document text page by page and normalized it with two regex
+passes; the current one joins the pages once and normalizes in a single translate/split/join pass.
+Both run on generated multi-page PDFs and on the extracted text alone, and every output is checked
+to be identical. The results are written as JSON: time, throughput in MB/s and tracemalloc peak.
+
+Examples:
+    python test/NormalizeBenchmark.py --pages 50,200 --output normalize.json
+    python test/NormalizeBenchmark.py --quick
+"""
+
+DEFAULT_PAGES = [20, 100]
+WORDS_PER_PAGE = 400
+WORDS = [
+    "Managed", "accounts", "payable/receivable", "(AP/AR)", "--", "Python,", "SQL;", "C++", "e-mail:",
+    "résumé", "naïve", "Straße", "ΣΟΦΊΑ", "2019–2021", "100%", "R&D", "•", "snake_case", "“quoted”", "self-starter.",
+]
+
+# ======================================================================
+#  Previous implementation
+# ======================================================================
+def legacy_extract_all_text(pdf_path):
+    doc = fitz.open(pdf_path)
+    full_text = ""
+    for page in doc:
+        full_text += page.get_text()
+    return full_text
+
+def legacy_normalize_text(text):
+    text = re.sub(r'[^\w\s]', '', text)
+    return re.sub(r'\s+', ' ', text).lower().strip()
+
+def current_extract_all_text(pdf_path):
+    cv = ExtractCV(pdf_path)
+    cv.extract_all_text()
+    return cv.raw_text
+
+# ======================================================================
+#  Synthetic PDFs
+# ======================================================================
+def write_large_pdf(path, pages, rng):
+    """Writes a PDF of pages full of CV-like words with punctuation, accents and symbols."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        text = " ".join(rng.choice(WORDS) for _ in range(WORDS_PER_PAGE))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=7)
+    doc.save(path)
+    doc.close()
+
+# ======================================================================
+#  Measurements
+# ======================================================================
+def measure(function, argument, repeat):
+    """Returns the result of function(argument), its best time in ms and its tracemalloc peak in KB."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, min(durations) * 1000, round(peak / 1024, 1)
+
+def run_benchmark(page_counts, repeat, seed, progress=None):
+    """Compares both implementations on one PDF per page count. @return: The report as a JSON-serializable dict."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            path = os.path.join(tmp, f"cv_{pages}.pdf")
+            write_large_pdf(path, pages, random.Random(f"{seed}/{pages}"))
+            cases = [
+                ("extract", legacy_extract_all_text, current_extract_all_text, path),
+                ("normalize", legacy_normalize_text, ExtractCV.normalize_text, legacy_extract_all_text(path)),
+            ]
+            for stage, legacy, current, argument in cases:
+                legacy_output, legacy_ms, legacy_kb = measure(legacy, argument, repeat)
+                current_output, current_ms, current_kb = measure(current, argument, repeat)
+                megabytes = len(legacy_output.encode('utf-8')) / (1024 * 1024)
+                result = {
+                    "key": f"{stage}/pages={pages}", "stage": stage, "pages": pages,
+                    "legacy_ms": round(legacy_ms, 3), "current_ms": round(current_ms, 3),
+                    "legacy_mb_per_s": round(megabytes / (legacy_ms / 1000), 3) if legacy_ms else None,
+                    "current_mb_per_s": round(megabytes / (current_ms / 1000), 3) if current_ms else None,
+                    "speedup": round(legacy_ms / current_ms, 2) if current_ms else None,
+                    "legacy_peak_kb": legacy_kb, "current_peak_kb": current_kb,
+                    "identical": legacy_output == current_output,
+                }
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return {
+        "meta": {
+            "python": platform.python_version(), "platform": platform.platform(), "seed": seed,
+            "repeat": repeat, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CV text extraction and normalization against the previous implementation.")
+    parser.add_argument("--pages", default=",".join(map(str, DEFAULT_PAGES)), help="page counts of the generated PDFs")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quick", action="store_true", help="a single 10-page PDF and run, for a smoke check")
+    parser.add_argument("--output", default="-", help="result file (default: standard output)")
+    args = parser.parse_args(argv)
+
+    page_counts = [10] if args.quick else [int(pages) for pages in args.pages.split(",") if pages.strip()]
+    report = run_benchmark(
+        page_counts, 1 if args.quick else args.repeat, args.seed,
+        progress=lambda result: print(
+            f"{result['key']:<22} {result['legacy_ms']:>9} ms -> {result['current_ms']:>9} ms (x{result['speedup']})",
+            file=sys.stderr,
+        ),
+    )
+
+    status = 0
+    if any(not result["identical"] for result in report["results"]):
+        print("The current implementation does not reproduce the previous output", file=sys.stderr)
+        status = 1
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import sys
+import os
+import random
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ExtractCV import ExtractCV
+from NormalizeBenchmark import legacy_normalize_text, legacy_extract_all_text, write_large_pdf, run_benchmark
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  TEST CASE 1: test_normalize_text_matches_regex_version
+# ======================================================================
+def test_normalize_text_matches_regex_version():
+    samples = [
+        "", "   ", "Hello, World!", "  Senior\tAccountant\n\n(CPA)  ", "snake_case & kebab-case",
+        "e-mail: john.doe@example.com", "Résumé — naïve Straße", "ΟΔΟΣ ΣΟΦΊΑΣ", "İstanbul", "x y z",
+        "①②③ ½ ²", "áb", "中文，日本語。", "emoji 🙂 ok", "\x0b\x0c\x1c\x1d\x1e\x1f\x85",
+    ]
+    print_assertion("normalize_text(text) == legacy_normalize_text(text) for tricky samples")
+    for text in samples:
+        assert ExtractCV.normalize_text(text) == legacy_normalize_text(text), repr(text)
+
+    print_assertion("every character of the Basic Multilingual Plane is kept or dropped like the regex does")
+    for code_point in range(0x10000):
+        if 0xD800 <= code_point < 0xE000:
+            continue
+        char = chr(code_point)
+        assert ExtractCV.normalize_text(f"a{char}b {char}") == legacy_normalize_text(f"a{char}b {char}"), hex(code_point)
+
+    rng = random.Random(3)
+    alphabet = [chr(code_point) for code_point in range(0x3000)] + list(" \t\n.,;-_ΣσİΐK")
+    print_assertion("random strings give the same output")
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert ExtractCV.normalize_text(text) == legacy_normalize_text(text), repr(text)
+
+# ======================================================================
+#  TEST CASE 2: test_extraction_matches_and_benchmark_reports
+# ======================================================================
+def test_extraction_matches_and_benchmark_reports():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "long.pdf")
+        write_large_pdf(pdf_path, 5, random.Random(1))
+        cv = ExtractCV(pdf_path)
+        cv.extract()
+        raw_text = legacy_extract_all_text(pdf_path)
+        print_assertion("the pages are joined in order, as by the page by page concatenation")
+        assert cv.raw_text == raw_text and len(raw_text) > 5 * 1000, f"{len(cv.raw_text)} != {len(raw_text)}"
+        print_assertion("the cleaned text is unchanged")
+        assert cv.cleaned_text == legacy_normalize_text(raw_text), "The cleaned text should not change"
+
+    report = run_benchmark([3], repeat=1, seed=1)
+    results = report["results"]
+    print_assertion("an extract and a normalize result, both identical to the previous implementation")
+    assert [result["key"] for result in results] == ["extract/pages=3", "normalize/pages=3"], results
+    for result in results:
+        assert result["identical"] and result["current_ms"] > 0 and result["legacy_ms"] > 0, result
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_normalize_text_matches_regex_version,
+        test_extraction_matches_and_benchmark_reports,
+    ]
+    run_test_suite(tests_to_run)
@@ -0,0 +1,237 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from itertools import product
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Search.Search import Search
+from src.Search.SuffixArrayStrategy import SuffixArrayStrategy
+from src.Index.SuffixArray import SuffixArrayIndex
+
+"""
+Reproducible benchmark of the search strategies over synthetic corpora.
+
+Every exact strategy registered in Search (KMP, BM, Aho-Corasick, and the suffix array over an index
+built per corpus) counts a pattern in every document of corpora that vary in size, pattern length,
+alphabet skew and match density. The results are written as JSON: throughput in MB/s, per-document
+latency percentiles and the tracemalloc peak of a query. With --baseline, a previous result file
+is compared and every case slower than the threshold is reported as a regression (exit code 1).
+
+Examples:
+    python test/SearchBenchmark.py --output bench.json
+    python test/SearchBenchmark.py --quick --baseline bench.json --threshold 0.15
+"""
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+DOCUMENT_SIZE = 8 * 1024       # about the size of the cleaned text of a CV
+DEFAULT_SIZES = [256 * 1024]
+DEFAULT_PATTERN_LENGTHS = [3, 8, 24]
+DEFAULT_SKEWS = [0.0, 1.5]     # 0 draws letters uniformly, higher values favour a few letters (Zipf)
+DEFAULT_DENSITIES = [0, 5]     # planted occurrences of the pattern per 1000 words
+DEFAULT_THRESHOLD = 0.10
+
+# ======================================================================
+#  Synthetic corpora
+# ======================================================================
+def letter_weights(skew):
+    return [1 / (rank ** skew) for rank in range(1, len(ALPHABET) + 1)]
+
+def make_pattern(length, skew, rng):
+    return "".join(rng.choices(ALPHABET, letter_weights(skew), k=length))
+
+def make_corpus(size, pattern, skew, density, rng):
+    """
+    Generates documents of random words totalling about size characters, in the form of cleaned CV text
+    (lowercase words separated by single spaces), with the pattern planted as a word density times per 1000 words.
+    """
+    weights = letter_weights(skew)
+    documents = []
+    total = 0
+    while total < size:
+        words = []
+        length = 0
+        while length < DOCUMENT_SIZE:
+            if density and rng.random() < density / 1000:
+                word = pattern
+            else:
+                word = "".join(rng.choices(ALPHABET, weights, k=rng.randint(2, 10)))
+            words.append(word)
+            length += len(word) + 1
+        text = " ".join(words)
+        documents.append(text)
+        total += len(text)
+    return documents
+
+# ======================================================================
+#  Measurements
+# ======================================================================
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def make_strategies(names, documents):
+    """Returns name -> (strategy, build_ms); the suffix array strategy gets an index of the corpus."""
+    search_engine = Search()
+    strategies = {}
+    for name in names:
+        build_ms = 0.0
+        if name == 'sa':
+            start = time.perf_counter()
+            index = SuffixArrayIndex()
+            index.sync_documents({str(i): text for i, text in enumerate(documents)})
+            index.rebuild()
+            index.find_document(documents[0])
+            build_ms = (time.perf_counter() - start) * 1000
+            search_engine.register_strategy('sa', SuffixArrayStrategy(index))
+        strategies[name] = (search_engine.strategies[name], build_ms)
+    return strategies
+
+def run_query(strategy, documents, pattern, latencies=None):
+    """Counts the pattern in every document, as a query of the pipeline does: compile once, then scan."""
+    compiled = strategy.prepare([pattern])[pattern]
+    total = 0
+    for text in documents:
+        start = time.perf_counter_ns()
+        total += strategy.search(text, compiled)
+        if latencies is not None:
+            latencies.append(time.perf_counter_ns() - start)
+    return total
+
+def measure(strategy, documents, pattern, repeat):
+    """Returns the throughput, latency percentiles, memory peak and match count of a strategy on a corpus."""
+    latencies = []
+    durations = []
+    matches = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = run_query(strategy, documents, pattern, latencies)
+        durations.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocations down, so memory is measured on a separate run
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    run_query(strategy, documents, pattern)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    megabytes = sum(len(text) for text in documents) / (1024 * 1024)
+    best = min(durations)
+    return {
+        "mb_per_s": round(megabytes / best, 3) if best > 0 else None,
+        "query_ms": round(best * 1000, 3),
+        "latency_ms": {
+            f"p{int(fraction * 100)}": round(percentile(latencies, fraction) / 1e6, 4) for fraction in (0.5, 0.9, 0.99)
+        },
+        "peak_kb": round(peak / 1024, 1),
+        "matches": matches,
+    }
+
+def case_key(strategy, case):
+    return f"{strategy}/size={case['size']}/m={case['pattern_length']}/skew={case['skew']}/density={case['density']}"
+
+def run_benchmark(sizes, pattern_lengths, skews, densities, strategies, repeat, seed, progress=None):
+    """Runs every strategy on every case. @return: The benchmark report as a JSON-serializable dict."""
+    results = []
+    for size, pattern_length, skew, density in product(sizes, pattern_lengths, skews, densities):
+        rng = random.Random(f"{seed}/{size}/{pattern_length}/{skew}/{density}")
+        pattern = make_pattern(pattern_length, skew, rng)
+        documents = make_corpus(size, pattern, skew, density, rng)
+        case = {"size": size, "pattern_length": pattern_length, "skew": skew, "density": density, "documents": len(documents)}
+
+        reference = None
+        for name, (strategy, build_ms) in make_strategies(strategies, documents).items():
+            result = measure(strategy, documents, pattern, repeat)
+            if reference is None:
+                reference = result["matches"]
+            result.update({
+                "key": case_key(name, case), "strategy": name, "case": case, "build_ms": round(build_ms, 3),
+                # Every strategy must find the matches of the first one
+                "consistent": result["matches"] == reference,
+            })
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "meta": {
+            "python": platform.python_version(), "platform": platform.platform(), "seed": seed,
+            "repeat": repeat, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the throughput of every case found in both reports.
+    @return: The list of comparisons; each has 'key', 'baseline' and 'current' MB/s, 'ratio' and 'regression'.
+    """
+    baseline_by_key = {result["key"]: result for result in baseline.get("results", [])}
+    comparisons = []
+    for result in report["results"]:
+        before = baseline_by_key.get(result["key"])
+        if before is None or not before.get("mb_per_s") or not result.get("mb_per_s"):
+            continue
+        ratio = result["mb_per_s"] / before["mb_per_s"]
+        comparisons.append({
+            "key": result["key"], "baseline": before["mb_per_s"], "current": result["mb_per_s"],
+            "ratio": round(ratio, 3), "regression": ratio < 1 - threshold,
+        })
+    return comparisons
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search strategies on synthetic corpora.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="corpus sizes in characters")
+    parser.add_argument("--pattern-lengths", default=",".join(map(str, DEFAULT_PATTERN_LENGTHS)))
+    parser.add_argument("--skews", default=",".join(map(str, DEFAULT_SKEWS)), help="Zipf exponents of the letter distribution")
+    parser.add_argument("--densities", default=",".join(map(str, DEFAULT_DENSITIES)), help="planted matches per 1000 words")
+    parser.add_argument("--strategies", default="kmp,bm,aho,sa")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest gives the throughput")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quick", action="store_true", help="64 KB corpora and a single run, for a smoke check")
+    parser.add_argument("--output", default="-", help="result file (default: standard output)")
+    parser.add_argument("--baseline", help="result file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown flagged as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    sizes = [64 * 1024] if args.quick else parse_list(args.sizes, int)
+    report = run_benchmark(
+        sizes, parse_list(args.pattern_lengths, int), parse_list(args.skews, float), parse_list(args.densities, int),
+        parse_list(args.strategies, str), 1 if args.quick else args.repeat, args.seed,
+        progress=lambda result: print(f"{result['key']:<50} {result['mb_per_s']:>9} MB/s", file=sys.stderr),
+    )
+
+    status = 0
+    if any(not result["consistent"] for result in report["results"]):
+        print("Strategies disagree on the number of matches", file=sys.stderr)
+        status = 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+        regressions = [comparison for comparison in report["comparison"] if comparison["regression"]]
+        for comparison in regressions:
+            print(f"REGRESSION {comparison['key']}: {comparison['baseline']} -> {comparison['current']} MB/s", file=sys.stderr)
+        if regressions:
+            status = 1
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import sys
+import os
+import random
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SearchBenchmark import make_corpus, make_pattern, run_benchmark, compare
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  TEST CASE 1: test_corpora_are_reproducible
+# ======================================================================
+def test_corpora_are_reproducible():
+    corpora = []
+    for _ in range(2):
+        rng = random.Random(7)
+        pattern = make_pattern(12, 1.5, rng)
+        corpora.append((pattern, make_corpus(64 * 1024, pattern, 1.5, 20, rng)))
+
+    print_assertion("the same seed generates the same pattern and documents")
+    assert corpora[0] == corpora[1], "Corpora should be reproducible"
+    pattern, documents = corpora[0]
+    words = [word for text in documents for word in text.split(" ")]
+    planted = words.count(pattern)
+    print(f"{planted} planted occurrences in {len(words)} words")
+    print_assertion("the planted density is about 20 per 1000 words")
+    assert 10 <= planted * 1000 / len(words) <= 30, f"Unexpected density: {planted} in {len(words)} words"
+    print_assertion("sum(len(text) for text in documents) >= 64 KB")
+    assert sum(len(text) for text in documents) >= 64 * 1024, "Corpus too small"
+
+# ======================================================================
+#  TEST CASE 2: test_report_and_baseline_comparison
+# ======================================================================
+def test_report_and_baseline_comparison():
+    report = run_benchmark([16 * 1024], [5], [0.0], [10], ["kmp", "bm", "aho", "sa"], repeat=1, seed=1)
+    results = report["results"]
+    print_assertion("one consistent result per strategy, with throughput, latency and memory")
+    assert [result["strategy"] for result in results] == ["kmp", "bm", "aho", "sa"], results
+    for result in results:
+        assert result["consistent"] and result["matches"] > 0, f"Unexpected result: {result}"
+        assert result["mb_per_s"] > 0 and set(result["latency_ms"]) == {"p50", "p90", "p99"} and result["peak_kb"] >= 0, result
+
+    baseline = {"results": [dict(result, mb_per_s=result["mb_per_s"] * 2) for result in results[:2]]}
+    comparisons = compare(report, baseline, threshold=0.1)
+    print_assertion("halved throughputs are flagged, cases missing from the baseline are skipped")
+    assert [comparison["key"] for comparison in comparisons] == [result["key"] for result in results[:2]], comparisons
+    assert all(comparison["regression"] and comparison["ratio"] == 0.5 for comparison in comparisons), comparisons
+    print_assertion("no regression against itself")
+    assert not any(comparison["regression"] for comparison in compare(report, report)), "A report should not regress against itself"
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_corpora_are_reproducible,
+        test_report_and_baseline_comparison,
+    ]
+    run_test_suite(tests_to_run)
@@ -0,0 +1,291 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.SearchPipeline import SearchPipeline
+from src.Ranking import TopN, BM25
+from src.TextCache import TextCache
+from src.Index.TrigramIndex import TrigramIndex
+from src.Index.InvertedIndex import InvertedIndex
+from TextCacheTest import write_pdf
+from SearchTest import run_test_suite, print_assertion
+
+CV_TEXTS = [
+    "Senior Python developer, Python and SQL.",
+    "Accountant with Excel and SQL reporting.",
+    "Python scripting for data management.",
+    "Project manager, managment of teams.",
+]
+
+# ======================================================================
+#  Helper to write one PDF per CV and the matching application rows
+# ======================================================================
+def make_applications(tmp, texts=CV_TEXTS):
+    applications = []
+    for i, text in enumerate(texts):
+        cv_path = os.path.join(tmp, f"cv{i}.pdf")
+        write_pdf(cv_path, text)
+        applications.append({
+            'detail_id': i, 'applicant_id': i, 'first_name': 'Applicant', 'last_name': str(i),
+            'application_role': 'Tester', 'cv_path': cv_path,
+        })
+    return applications
+
+# ======================================================================
+#  TEST CASE 1: test_pipeline_ranks_and_streams_results
+# ======================================================================
+def test_pipeline_ranks_and_streams_results():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        pipeline = SearchPipeline(trigram_index=TrigramIndex(), workers=1)
+        progress, streamed = [], []
+        summary = pipeline.run(
+            applications, ["python", "sql"], 'kmp', top_n=2,
+            on_progress=lambda done, total, stage: progress.append((done, total, stage)),
+            on_results=streamed.append,
+        )
+
+        ranked = [(result['detail_id'], result['matched_keywords']) for result in summary['results']]
+        print_assertion("ranked == [(0, {'python': 2, 'sql': 1}), (1, {'sql': 1})]")
+        assert ranked == [(0, {'python': 2, 'sql': 1}), (1, {'sql': 1})], f"Unexpected ranking: {ranked}"
+        print_assertion("summary['relevant'] == 3 and not summary['cancelled']")
+        assert summary['relevant'] == 3 and not summary['cancelled'], f"Unexpected summary: {summary}"
+        print_assertion("progress[-1] == (4, 4, 'extract')")
+        assert progress[-1] == (4, 4, 'extract'), f"Unexpected progress: {progress}"
+        print_assertion("streamed top results end with the final results")
+        assert streamed and streamed[-1] == summary['results'], f"Streamed {streamed[-1] if streamed else None}"
+        print_assertion("pipeline.dirty_indexes == {pipeline.trigram_index}")
+        assert pipeline.dirty_indexes == {pipeline.trigram_index}, "The trigram index should be marked for saving"
+
+        whole_words = SearchPipeline(inverted_index=InvertedIndex(), workers=1).run(applications, ["python"], 'kmp', whole_words=True)
+        print_assertion("whole-word results == [(0, 2), (2, 1)]")
+        counts = [(result['detail_id'], result['matched_keywords']['python']) for result in whole_words['results']]
+        assert counts == [(0, 2), (2, 1)], f"Unexpected whole-word counts: {counts}"
+
+# ======================================================================
+#  TEST CASE 2: test_fuzzy_matches_update_ranked_entries
+# ======================================================================
+def test_fuzzy_matches_update_ranked_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        streamed = []
+        summary = SearchPipeline(workers=1).run(applications, ["python", "managment"], 'bm', top_n=4, on_results=streamed.append)
+
+        print_assertion("summary['fuzzy_keywords'] == []")
+        assert summary['fuzzy_keywords'] == [], "'managment' occurs exactly in one CV"
+
+        summary = SearchPipeline(workers=1).run(applications, ["python", "managemnt"], 'bm', top_n=4, on_results=streamed.append)
+        detail_ids = [result['detail_id'] for result in streamed[-1]]
+        print_assertion("no application is ranked twice")
+        assert len(detail_ids) == len(set(detail_ids)), f"Duplicated entries: {detail_ids}"
+        print_assertion("summary['fuzzy_keywords'] == ['managemnt']")
+        assert summary['fuzzy_keywords'] == ['managemnt'], f"Unexpected fuzzy keywords: {summary['fuzzy_keywords']}"
+        matched = {result['detail_id']: result['matched_keywords'] for result in summary['results']}
+        print_assertion("matched[2] == {'python': 1, 'managemnt': 1}")
+        assert matched[2] == {'python': 1, 'managemnt': 1}, f"Unexpected matches: {matched}"
+
+        cache = TextCache(os.path.join(tmp, "cache.sqlite3"))
+        cached = SearchPipeline(cache, workers=1).run(applications, ["python", "managemnt"], 'bm', top_n=4)
+        print_assertion("the fuzzy pass reads the texts again from the text cache")
+        assert cache.get_stats()['hits'] == len(applications), f"Unexpected cache stats: {cache.get_stats()}"
+        assert cached['results'] == summary['results'] and cached['relevant'] == summary['relevant'], f"{cached} != {summary}"
+
+# ======================================================================
+#  TEST CASE 3: test_cancel_stops_the_query
+# ======================================================================
+def test_cancel_stops_the_query():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        cancel_event = threading.Event()
+        progress = []
+
+        def on_progress(done, total, stage):
+            progress.append(done)
+            cancel_event.set()
+
+        summary = SearchPipeline(workers=1).run(applications, ["sql", "zzzz"], 'aho', cancel_event=cancel_event, on_progress=on_progress)
+        print_assertion("summary['cancelled'] and progress == [1]")
+        assert summary['cancelled'] and progress == [1], f"Query went on after cancel: {progress}"
+        print_assertion("summary['fuzzy_keywords'] == []")
+        assert summary['fuzzy_keywords'] == [], "A cancelled query should skip the fuzzy pass"
+
+# ======================================================================
+#  TEST CASE 4: test_applications_are_consumed_in_batches
+# ======================================================================
+def test_applications_are_consumed_in_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        # The last application shares the CV of the first one
+        applications.append(dict(applications[0], detail_id=4, last_name='4'))
+        consumed = []
+
+        def stream():
+            for app_data in applications:
+                consumed.append(app_data['detail_id'])
+                yield app_data
+
+        consumed_at_first_result = []
+        summary = SearchPipeline(workers=2, batch_size=2).run(
+            stream(), ["python"], 'kmp', top_n=5,
+            on_results=lambda results: consumed_at_first_result.append(len(consumed)) if not consumed_at_first_result else None,
+        )
+        print_assertion("consumed_at_first_result == [2]")
+        assert consumed_at_first_result == [2], f"Rows read before the first result: {consumed_at_first_result}"
+
+        ranked = [(result['detail_id'], result['matched_keywords']) for result in summary['results']]
+        print_assertion("ranked == [(0, {'python': 2}), (4, {'python': 2}), (2, {'python': 1})]")
+        assert ranked == [(0, {'python': 2}), (4, {'python': 2}), (2, {'python': 1})], f"Unexpected ranking: {ranked}"
+        print_assertion("summary['documents'] == 5")
+        assert summary['documents'] == 5, f"Unexpected number of applications: {summary['documents']}"
+
+# ======================================================================
+#  TEST CASE 5: test_documents_are_searched_once
+# ======================================================================
+def test_documents_are_searched_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        # A copy of the first CV under another name, and a second application of the second CV
+        copy_path = os.path.join(tmp, "copy.pdf")
+        shutil.copyfile(applications[0]['cv_path'], copy_path)
+        applications.append(dict(applications[0], detail_id=4, cv_path=copy_path))
+        applications.append(dict(applications[1], detail_id=5))
+
+        by_path = SearchPipeline(workers=1).run(applications, ["python", "sql"], 'kmp', top_n=10)
+        print_assertion("by_path['unique_documents'] == 5 and by_path['stats']['documents_scanned'] == 5")
+        assert by_path['unique_documents'] == 5 and by_path['stats']['documents_scanned'] == 5, f"Unexpected summary: {by_path}"
+
+        by_content = SearchPipeline(workers=1, dedupe_content=True).run(applications, ["python", "sql"], 'kmp', top_n=10)
+        print_assertion("by_content['unique_documents'] == 4 and by_content['stats']['documents_scanned'] == 4")
+        assert by_content['unique_documents'] == 4 and by_content['stats']['documents_scanned'] == 4, f"Unexpected summary: {by_content}"
+
+        print_assertion("both runs rank the same applications with the same counts")
+        assert by_content['results'] == by_path['results'], f"{by_content['results']} != {by_path['results']}"
+        matched = {result['detail_id']: (result['cv_path'], result['matched_keywords']) for result in by_content['results']}
+        print_assertion("the copy keeps its own cv_path and gets the counts of the original")
+        assert matched[4] == (copy_path, {'python': 2, 'sql': 1}), f"Unexpected entry: {matched[4]}"
+        print_assertion("matched[5] == matched[1]'s counts")
+        assert matched[5][1] == matched[1][1] == {'sql': 1}, f"Unexpected entries: {matched[1]}, {matched[5]}"
+
+# ======================================================================
+#  TEST CASE 6: test_top_n_heap_and_pruning
+# ======================================================================
+def test_top_n_heap_and_pruning():
+    top = TopN(2)
+    for score, item in [(1, 'a'), (3, 'b'), (1, 'c'), (3, 'd'), (3, 'e'), (2, 'f')]:
+        top.push(score, item)
+    print_assertion("top.items() == ['b', 'd'] and top.pushed == 6")
+    assert top.items() == ['b', 'd'] and top.pushed == 6, f"Unexpected selection: {top.items()}"
+    print_assertion("top.threshold() == 3")
+    assert top.threshold() == 3, f"Unexpected threshold: {top.threshold()}"
+    top = TopN(1)
+    top.push(1, 'late', order=5)
+    top.push(1, 'early', order=2)
+    print_assertion("ties are broken by the given order: top.items() == ['early']")
+    assert top.items() == ['early'], f"Unexpected selection: {top.items()}"
+
+    texts = [
+        "python python python sql", "python python sql sql", "python developer", "sql reporting",
+        "project manager, managment of teams.",
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp, texts)
+        for keywords in [["python", "sql"], ["python", "managemnt"]]:
+            expected = SearchPipeline(workers=1).run(applications, keywords, 'kmp', top_n=1)
+            pruned = SearchPipeline(trigram_index=TrigramIndex(), workers=1).run(applications, keywords, 'kmp', top_n=1)
+            print_assertion(f"{keywords}: pruned['results'] == expected['results']")
+            assert pruned['results'] == expected['results'], f"{pruned['results']} != {expected['results']}"
+            if keywords == ["python", "sql"]:
+                print_assertion("pruned['pruned'] == 3 and the pruned CVs are searched for one keyword at most")
+                assert pruned['pruned'] == 3 and pruned['stats']['patterns_searched'] == 6, f"Unexpected summary: {pruned}"
+            else:
+                print_assertion("no CV is pruned while a keyword has no exact match: pruned['pruned'] == 0")
+                assert pruned['pruned'] == 0 and pruned['fuzzy_keywords'] == ['managemnt'], f"Unexpected summary: {pruned}"
+
+        applications = make_applications(tmp, ["python python python sql", "python", "python", "python sql", "sql", "java"])
+        # A second application of a pruned CV
+        applications.append(dict(applications[1], detail_id=6))
+        expected = SearchPipeline(workers=1).run(applications, ["python", "sql"], 'kmp', top_n=1)
+        pruned = SearchPipeline(trigram_index=TrigramIndex(), workers=1).run(applications, ["python", "sql"], 'kmp', top_n=1)
+        print_assertion("pruned CVs are still counted as relevant: pruned['relevant'] == expected['relevant'] == 6")
+        assert expected['relevant'] == 6 and expected['pruned'] == 0, f"Unexpected summary: {expected}"
+        assert pruned['pruned'] == 5 and pruned['relevant'] == 6, f"Unexpected summary: {pruned}"
+        assert pruned['results'] == expected['results'], f"{pruned['results']} != {expected['results']}"
+
+# ======================================================================
+#  TEST CASE 7: test_bm25_ranking
+# ======================================================================
+def test_bm25_ranking():
+    scores = BM25().score_all({'a': {'x': 1}}, {'a': 10}, 3, 10)
+    expected = BM25.idf(1, 3)  # average length, tf 1: (k1 + 1) * 1 / (1 + k1) == 1
+    print_assertion("scores['a'] == BM25.idf(1, 3)")
+    assert abs(scores['a'] - expected) < 1e-9, f"{scores['a']} != {expected}"
+    print_assertion("BM25(b=1.5) raises ValueError")
+    try:
+        BM25(b=1.5)
+        assert False, "b must be between 0 and 1"
+    except ValueError:
+        pass
+
+    texts = [
+        "python " * 8 + "developer with sql and team lead experience in many projects",
+        "rust and python",
+        "python sql",
+        "python scripting",
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp, texts)
+        by_occurrences = SearchPipeline(workers=1).run(applications, ["python", "rust"], 'kmp', top_n=4)
+        inverted_index = InvertedIndex()
+        by_relevance = SearchPipeline(inverted_index=inverted_index, workers=1).run(applications, ["python", "rust"], 'kmp', top_n=4, ranking='bm25')
+
+        print_assertion("occurrences rank the long CV first, BM25 the CV with the rare keyword")
+        assert by_occurrences['results'][0]['detail_id'] == 0, by_occurrences['results']
+        assert by_relevance['results'][0]['detail_id'] == 1, by_relevance['results']
+        relevance_scores = [result['score'] for result in by_relevance['results']]
+        print_assertion("BM25 scores are in decreasing order and the same CVs are relevant")
+        assert relevance_scores == sorted(relevance_scores, reverse=True), relevance_scores
+        assert by_relevance['relevant'] == by_occurrences['relevant'] == 4, by_relevance
+        print_assertion("the document lengths of BM25 come from the inverted index, updated by the query")
+        assert sorted(inverted_index.doc_lengths.values()) == [2, 2, 3, 17], inverted_index.doc_lengths
+        assert inverted_index.total_length == 24 and inverted_index.average_length() == 6, inverted_index.total_length
+
+        print_assertion("whole-word document frequencies come from the index: the CVs of other queries count")
+        whole_words = SearchPipeline(inverted_index=inverted_index, workers=1).run(applications[1:], ["rust"], whole_words=True, ranking='bm25')
+        score = BM25().score_all({'cv': {'rust': 1}}, {'cv': 3}, 4, 6, {'rust': 1})['cv']
+        assert whole_words['results'][0]['score'] == round(score, 4), whole_words['results']
+
+        print_assertion("BM25 without an inverted index -> ValueError")
+        try:
+            SearchPipeline(workers=1).run(applications, ["python"], ranking='bm25')
+            assert False, "BM25 needs the statistics of the inverted index"
+        except ValueError:
+            pass
+
+        print_assertion("unknown ranking -> ValueError")
+        try:
+            SearchPipeline(workers=1).run(applications, ["python"], ranking='length')
+            assert False, "Unknown rankings should be rejected"
+        except ValueError:
+            pass
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_pipeline_ranks_and_streams_results,
+        test_fuzzy_matches_update_ranked_entries,
+        test_cancel_stops_the_query,
+        test_applications_are_consumed_in_batches,
+        test_documents_are_searched_once,
+        test_top_n_heap_and_pruning,
+        test_bm25_ranking,
+    ]
+    run_test_suite(tests_to_run)
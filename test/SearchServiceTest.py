@@ -0,0 +1,135 @@
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.SearchService import SearchService
+from src.SearchPipeline import SearchPipeline
+from src.Index.InvertedIndex import InvertedIndex
+from src.Index.SuffixArray import SuffixArrayIndex
+from SearchPipelineTest import make_applications
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  Helpers to run a service on a free port in a background event loop
+# ======================================================================
+class RunningService:
+    def __init__(self, applications, shards=2):
+        self.service = SearchService(applications, port=0, shards=shards, extract_workers=1)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.service.load()
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.service.start(), self.loop).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.service.close()
+
+    def request(self, path, body=None):
+        url = f"http://127.0.0.1:{self.service.port}{path}"
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+# ======================================================================
+#  TEST CASE 1: test_service_matches_the_pipeline
+# ======================================================================
+def test_service_matches_the_pipeline():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        with RunningService(applications) as running:
+            status, health = running.request("/health")
+            print_assertion("status == 200 and health['unique_documents'] == 4 and health['shards'] == 2")
+            assert status == 200 and health['unique_documents'] == 4 and health['shards'] == 2, f"Unexpected health: {health}"
+
+            for algorithm in ['kmp', 'bm', 'aho', 'sa']:
+                status, answer = running.request("/search", {"keywords": ["python", "sql", "managemnt"], "algorithm": algorithm, "top": 3})
+                expected = SearchPipeline(suffix_array_index=SuffixArrayIndex(), workers=1).run(
+                    applications, ["python", "sql", "managemnt"], algorithm, top_n=3
+                )
+                print_assertion(f"{algorithm}: the service returns the results of the pipeline")
+                assert status == 200 and answer['results'] == expected['results'], f"{answer} != {expected['results']}"
+                assert answer['relevant'] == expected['relevant'] and answer['fuzzy_keywords'] == ['managemnt'], f"Unexpected answer: {answer}"
+
+            status, answer = running.request("/search", {"keywords": "python, sql", "ranking": "bm25"})
+            expected = SearchPipeline(inverted_index=InvertedIndex(), workers=1).run(applications, ["python", "sql"], ranking='bm25')
+            print_assertion("BM25 ranking returns the results and scores of the pipeline")
+            assert status == 200 and answer['results'] == expected['results'], f"{answer} != {expected['results']}"
+
+            status, answer = running.request("/search?keywords=Python&whole_words=1&top=5")
+            expected = SearchPipeline(inverted_index=InvertedIndex(), workers=1).run(applications, ["python"], whole_words=True)
+            print_assertion("whole-word GET query returns the results of the pipeline")
+            assert status == 200 and answer['results'] == expected['results'], f"{answer} != {expected['results']}"
+
+# ======================================================================
+#  TEST CASE 2: test_concurrent_requests
+# ======================================================================
+def test_concurrent_requests():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        with RunningService(applications) as running:
+            queries = [["python"], ["sql"], ["excel", "sql"], ["teams"]] * 4
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                answers = list(pool.map(lambda keywords: running.request("/search", {"keywords": keywords, "algorithm": "aho"}), queries))
+
+            print_assertion("every concurrent request gets its own answer")
+            for keywords, (status, answer) in zip(queries, answers):
+                assert status == 200, f"Request {keywords} failed: {answer}"
+                found = {keyword for result in answer['results'] for keyword in result['matched_keywords']}
+                assert found == set(keywords), f"Answer to {keywords} matched {found}"
+
+# ======================================================================
+#  TEST CASE 3: test_invalid_requests
+# ======================================================================
+def test_invalid_requests():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        with RunningService(applications, shards=1) as running:
+            print_assertion("empty keywords -> 400")
+            assert running.request("/search", {"keywords": []})[0] == 400
+            print_assertion("keywords of punctuation only -> 400")
+            assert running.request("/search", {"keywords": "., !"})[0] == 400
+            print_assertion("unknown algorithm -> 400")
+            assert running.request("/search", {"keywords": "sql", "algorithm": "grep"})[0] == 400
+            print_assertion("top 0 -> 400")
+            assert running.request("/search?keywords=sql&top=0")[0] == 400
+            print_assertion("unknown path -> 404")
+            assert running.request("/index")[0] == 404
+
+    print_assertion("non-loopback host -> ValueError")
+    try:
+        SearchService([], host='0.0.0.0')
+        assert False, "The service should refuse to listen on every interface"
+    except ValueError:
+        pass
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_service_matches_the_pipeline,
+        test_concurrent_requests,
+        test_invalid_requests,
+    ]
+    run_test_suite(tests_to_run)
@@ -4,12 +4,14 @@ import time
 import io
 import re
 import contextlib
+import tempfile
 
 # Add the root directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.Search.Search import Search
 from src.ExtractCV import ExtractCV
+from src.CVGenerator import CVGenerator
 
 # --- UI and Test Runner Implementation ---
 
@@ -134,12 +136,29 @@ def print_assertion(condition_str):
     """Helper to print the assertion being checked."""
     print(f"{Colors.CYAN}  CHECKING: assert {condition_str}{Colors.ENDC}")
 
+# ======================================================================
+#  Sample CV, generated on first use rather than read from the dataset
+# ======================================================================
+_sample_dir = None
+
+def sample_cv_path():
+    """Writes a synthetic accountant CV with CVGenerator once per run and returns its path."""
+    global _sample_dir
+    if _sample_dir is None:
+        _sample_dir = tempfile.TemporaryDirectory()
+    generator = CVGenerator(_sample_dir.name, roles=('ACCOUNTANT',), keywords=('accountant', 'management', 'accounting'),
+                            plant_rate=0.05, max_pages=2, seed=1)
+    path = generator.generate_cv(1)['path']
+    if not os.path.exists(path):
+        generator.write_cv(1)
+    return path
+
 # ======================================================================
 #  TEST CASE 1: test_search_algorithms_consistency
 # ======================================================================
 def test_search_algorithms_consistency():
     search_engine = Search()
-    test_text = ExtractCV("data/ACCOUNTANT/10554236.pdf")
+    test_text = ExtractCV(sample_cv_path())
     result_kmp = search_engine._search('kmp', test_text, "accountant")
     result_bm = search_engine._search('bm', test_text, "accountant")
     
@@ -157,7 +176,7 @@ def test_search_algorithms_consistency():
 # ======================================================================
 def test_non_existent_word_search():
     search_engine = Search()
-    test_text = ExtractCV("data/ACCOUNTANT/10554236.pdf")
+    test_text = ExtractCV(sample_cv_path())
     result_nonexistent = search_engine._search('kmp', test_text, "xyzabc123")
     print(f"Search for 'xyzabc123' returned: {result_nonexistent}")
     
@@ -173,7 +192,7 @@ def test_non_existent_word_search():
 # ======================================================================
 def test_invalid_strategy_handling():
     search_engine = Search()
-    test_text = ExtractCV("data/ACCOUNTANT/10554236.pdf")
+    test_text = ExtractCV(sample_cv_path())
     result_invalid = search_engine._search('invalid_strategy', test_text, "test")
     
     print_assertion("result_invalid == -1")
@@ -184,7 +203,7 @@ def test_invalid_strategy_handling():
 # ======================================================================
 def test_various_patterns_for_consistency():
     search_engine = Search()
-    test_text = ExtractCV("data/ACCOUNTANT/10554236.pdf")
+    test_text = ExtractCV(sample_cv_path())
     test_patterns = ["experience", "skills", "education", "management", "", "a"]
     print("Testing consistency for multiple patterns...")
     for pattern in test_patterns:
@@ -196,6 +215,212 @@ def test_various_patterns_for_consistency():
         assert kmp_result == bm_result, f"Inconsistent for '{pattern}': KMP={kmp_result}, BM={bm_result}"
     print(f"\nSuccessfully compared {len(test_patterns)} patterns.")
 
+# ======================================================================
+#  TEST CASE 5: test_pdf_opened_once_per_query
+# ======================================================================
+def test_pdf_opened_once_per_query():
+    import fitz  # PyMuPDF
+
+    keywords = ["accountant", "experience", "skills", "education", "management"]
+    cv_path = sample_cv_path()  # Written before fitz.open is counted
+    open_calls = []
+    original_open = fitz.open
+
+    def counting_open(*args, **kwargs):
+        open_calls.append(args)
+        return original_open(*args, **kwargs)
+
+    fitz.open = counting_open
+    try:
+        for algorithm in ['kmp', 'bm']:
+            open_calls.clear()
+            search_engine = Search()
+            test_text = ExtractCV(cv_path)
+            for keyword in keywords:
+                search_engine._search(algorithm, test_text, keyword)
+
+            print(f"{algorithm.upper()}: fitz.open called {len(open_calls)} time(s) for {len(keywords)} keywords")
+            print_assertion(f"len(open_calls) == 1 for {algorithm}")
+            assert len(open_calls) == 1, f"{algorithm.upper()} opened the PDF {len(open_calls)} times in one query"
+    finally:
+        fitz.open = original_open
+
+# ======================================================================
+#  TEST CASE 6: test_aho_corasick_matches_kmp
+# ======================================================================
+def test_aho_corasick_matches_kmp():
+    search_engine = Search()
+    test_text = ExtractCV(sample_cv_path())
+    patterns = ["accountant", "account", "count", "experience", "skills", "management", "xyzabc123", "a", ""]
+
+    aho_counts = search_engine._search_many('aho', test_text, patterns)
+    for pattern in patterns:
+        kmp_count = max(search_engine._search('kmp', test_text, pattern), 0)
+        print_assertion(f"aho_counts['{pattern}'] == {kmp_count}")
+        assert aho_counts[pattern] == kmp_count, f"Inconsistent for '{pattern}': AHO={aho_counts[pattern]}, KMP={kmp_count}"
+
+    overlapping = search_engine._search_many('aho', "aaaa abab ababab", ["aa", "aba", "bab", "b"])
+    print_assertion("overlapping == {'aa': 3, 'aba': 3, 'bab': 3, 'b': 5}")
+    assert overlapping == {'aa': 3, 'aba': 3, 'bab': 3, 'b': 5}, f"Unexpected overlapping counts: {overlapping}"
+
+# ======================================================================
+#  TEST CASE 7: test_bm_unicode_text_and_good_suffix
+# ======================================================================
+def test_bm_unicode_text_and_good_suffix():
+    search_engine = Search()
+    test_text = "résumé • josé garcía — senior developer naïve café ⅷ ✓ developer developer abaabaaba"
+    test_patterns = ["josé", "café", "developer", "developer developer", "•", "naïve", "abaaba", "aba", "zzz"]
+    for pattern in test_patterns:
+        kmp_result = search_engine._search('kmp', test_text, pattern)
+        bm_result = search_engine._search('bm', test_text, pattern)
+
+        print_assertion(f"kmp_result == bm_result for pattern '{pattern}'")
+        assert kmp_result == bm_result, f"Inconsistent for '{pattern}': KMP={kmp_result}, BM={bm_result}"
+
+    print_assertion("_search('bm', test_text, 'abaaba') == 2")
+    assert search_engine._search('bm', test_text, "abaaba") == 2, "Good suffix shift should keep overlapping matches"
+
+# ======================================================================
+#  TEST CASE 8: test_fuzzy_fallback_for_misspelled_keyword
+# ======================================================================
+def test_fuzzy_fallback_for_misspelled_keyword():
+    search_engine = Search()
+    test_text = "senior python developer with sql and python scripting experience"
+
+    result = search_engine._search('kmp', test_text, "pyton")
+    print_assertion("result == 2 and search_engine.successStrategy == 'fuzzy'")
+    assert result == 2 and search_engine.successStrategy == 'fuzzy', f"Expected 2 fuzzy matches, got {result} via {search_engine.successStrategy}"
+
+    count, best_distance = search_engine._fuzzy_search(test_text, "devloper")
+    print_assertion("(count, best_distance) == (1, 1)")
+    assert (count, best_distance) == (1, 1), f"Unexpected fuzzy result: {(count, best_distance)}"
+
+    result_exact_only = search_engine._search('bm', test_text, "pyton", fuzzy_fallback=False)
+    print_assertion("result_exact_only == 0")
+    assert result_exact_only == 0, f"Exact-only search should not fall back, got {result_exact_only}"
+
+    result_far = search_engine._search('kmp', test_text, "kubernetes")
+    print_assertion("result_far == 0")
+    assert result_far == 0, f"Unrelated keyword should not match fuzzily, got {result_far}"
+
+# ======================================================================
+#  TEST CASE 9: test_compiled_patterns_are_reused
+# ======================================================================
+def test_compiled_patterns_are_reused():
+    from src.Search import KMP, BM
+
+    documents = ["python developer with sql", "senior sql analyst", "java developer and python scripting"]
+    keywords = ["python", "sql", "developer"]
+    for algorithm, module in [('kmp', KMP), ('bm', BM)]:
+        module.compile_pattern.cache_clear()
+        search_engine = Search()
+        compiled = search_engine._compile(algorithm, keywords)
+        for document in documents:
+            counts = search_engine._search_many(algorithm, document, list(compiled.values()))
+            expected = {keyword: search_engine._search(algorithm, document, keyword, fuzzy_fallback=False) for keyword in keywords}
+            print_assertion(f"compiled counts == string counts for {algorithm}")
+            assert counts == expected, f"{algorithm.upper()} compiled counts differ: {counts} != {expected}"
+
+        misses = module.compile_pattern.cache_info().misses
+        print_assertion(f"{algorithm} compile_pattern misses == {len(keywords)}")
+        assert misses == len(keywords), f"{algorithm.upper()} compiled {misses} tables for {len(keywords)} keywords"
+
+    search_engine = Search()
+    compiled = search_engine._compile('aho', keywords)
+    search_engine._search_many('aho', documents[0], [compiled["sql"]])
+    search_engine._search_many('aho', documents[1], [compiled["python"], compiled["developer"]])
+    automata = search_engine.strategies['aho'].automata
+    print_assertion("len(automata) == 1")
+    assert len(automata) == 1, f"Aho-Corasick built {len(automata)} automata for one query"
+
+# ======================================================================
+#  TEST CASE 10: test_count_and_streaming_modes
+# ======================================================================
+def test_count_and_streaming_modes():
+    from src.Search.KMP import KMP
+    from src.Search.BM import BM
+
+    search_engine = Search()
+    test_text = "python developer python scripting python sql abaabaaba"
+    for pattern in ["python", "sql", "aba", "abaaba", "missing"]:
+        for algorithm, engine in [('kmp', KMP), ('bm', BM)]:
+            offsets = engine(pattern, test_text).search()
+            print_assertion(f"{algorithm} count == len(search) for pattern '{pattern}'")
+            assert engine(pattern, test_text).count() == len(offsets), f"{algorithm.upper()} count differs for '{pattern}'"
+
+            streamed = list(search_engine._search(algorithm, test_text, pattern, mode='iter'))
+            print_assertion(f"{algorithm} streamed offsets == search offsets for pattern '{pattern}'")
+            assert streamed == offsets, f"{algorithm.upper()} streamed {streamed} != {offsets}"
+
+            first_two = list(search_engine._search(algorithm, test_text, pattern, mode='iter', max_count=2))
+            print_assertion(f"{algorithm} max_count=2 yields the first two offsets for pattern '{pattern}'")
+            assert first_two == offsets[:2], f"{algorithm.upper()} max_count yielded {first_two}"
+
+            exists = search_engine._search(algorithm, test_text, pattern, mode='exists')
+            print_assertion(f"{algorithm} exists == bool(offsets) for pattern '{pattern}'")
+            assert exists == bool(offsets), f"{algorithm.upper()} exists returned {exists} for '{pattern}'"
+
+    from src.Index.SuffixArray import SuffixArrayIndex
+    from src.Search.SuffixArrayStrategy import SuffixArrayStrategy
+
+    index = SuffixArrayIndex()
+    index.sync_documents({'other': "sql python", 'cv': test_text})
+    search_engine.register_strategy('sa', SuffixArrayStrategy(index))
+    search_engine._compile('aho', ["python", "aba", "sql"])
+    for pattern in ["python", "sql", "aba", "abaaba", "missing"]:
+        offsets = KMP(pattern, test_text).search()
+        for algorithm in ['aho', 'sa']:
+            streamed = list(search_engine._search(algorithm, test_text, pattern, mode='iter'))
+            print_assertion(f"{algorithm} streamed offsets == KMP offsets for pattern '{pattern}'")
+            assert streamed == offsets, f"{algorithm.upper()} streamed {streamed} != {offsets}"
+            first_two = list(search_engine._search(algorithm, test_text, pattern, mode='iter', max_count=2))
+            assert first_two == offsets[:2], f"{algorithm.upper()} max_count yielded {first_two}"
+            assert search_engine._search(algorithm, test_text, pattern, mode='exists') == bool(offsets), algorithm
+    print_assertion("sa streams a text missing from the index through BM")
+    assert list(search_engine._search('sa', "no python here", "python", mode='iter')) == [3], "Unindexed text should use BM"
+
+    from src.Search.FuzzyStrategy import FuzzyStrategy
+    search_engine.register_strategy('myers', FuzzyStrategy())
+    print_assertion("a strategy without finditer: mode='iter' == -1, mode='exists' counts")
+    assert search_engine._search('myers', test_text, "pythn", mode='iter') == -1, "Fuzzy matches can not be streamed"
+    assert search_engine._search('myers', test_text, "pythn", mode='exists') is True, "Exists should fall back to counting"
+
+    print_assertion("_search('kmp', ..., mode='unknown') == -1")
+    assert search_engine._search('kmp', test_text, "sql", mode='unknown') == -1, "Unknown mode should return -1"
+
+# ======================================================================
+#  TEST CASE 11: test_quiet_hot_path_and_counters
+# ======================================================================
+def test_quiet_hot_path_and_counters():
+    search_engine = Search()
+    documents = ["python developer with sql", "senior sql analyst", ""]
+    output_buffer = io.StringIO()
+    with contextlib.redirect_stdout(output_buffer):
+        for document in documents:
+            for algorithm in ['kmp', 'bm']:
+                search_engine._search(algorithm, document, "sql", fuzzy_fallback=False)
+            search_engine._search_many('aho', document, ["python", "sql"])
+        search_engine._search('kmp', documents[0], "pyton")
+
+    print_assertion("output_buffer.getvalue() == ''")
+    assert output_buffer.getvalue() == "", f"Search wrote to stdout: {output_buffer.getvalue()!r}"
+
+    stats = search_engine.stats.as_dict()
+    expected = {
+        'documents_scanned': 10,
+        'chars_scanned': 3 * sum(len(document) for document in documents) + len(documents[0]),
+        'patterns_searched': 13,
+        'matches_found': 7,
+        'fuzzy_fallbacks': 1,
+        'fuzzy_matches': 1,
+    }
+    print_assertion(f"search_engine.stats == {expected}")
+    assert stats == expected, f"Unexpected counters: {stats}"
+
+    search_engine.stats.reset()
+    print_assertion("all counters are zero after reset()")
+    assert not any(search_engine.stats.as_dict().values()), "reset() should zero every counter"
+
 # --- Main Execution Block ---
 
 # ======================================================================
@@ -207,5 +432,12 @@ if __name__ == "__main__":
         test_non_existent_word_search,
         test_invalid_strategy_handling,
         test_various_patterns_for_consistency,
+        test_pdf_opened_once_per_query,
+        test_aho_corasick_matches_kmp,
+        test_bm_unicode_text_and_good_suffix,
+        test_fuzzy_fallback_for_misspelled_keyword,
+        test_compiled_patterns_are_reused,
+        test_count_and_streaming_modes,
+        test_quiet_hot_path_and_counters,
     ]
     run_test_suite(tests_to_run)
\ No newline at end of file
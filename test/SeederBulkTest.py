@@ -0,0 +1,168 @@
+import sys
+import os
+import json
+import random
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Seeder import Seeder
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  In-memory stand-ins for a connection and its cursor, recording the statements
+# ======================================================================
+class FakeCursor:
+    def __init__(self, applications_per_path=None):
+        self.executed = []
+        self.batches = []
+        self.loaded_files = {}
+        self.applications_per_path = applications_per_path or {}
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        self.executed.append(" ".join(query.split()))
+        if query.strip().startswith("LOAD DATA"):
+            table = query.split("INTO TABLE")[1].split()[0]
+            with open(params[0], encoding='utf-8') as f:
+                self.loaded_files[table] = f.read().splitlines()
+
+    def fetchone(self):
+        return (1,)
+
+    def executemany(self, query, rows):
+        rows = list(rows)
+        if query.lstrip().startswith("DELETE"):
+            table = query.split("FROM")[1].split()[0]
+            self.rowcount = sum(self.applications_per_path.get(row[0], 0) for row in rows)
+        else:
+            table = query.split("INTO")[1].split()[0]
+            self.rowcount = len(rows)
+        self.batches.append((table, rows))
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+# ======================================================================
+#  Helper to build a seeder over a temporary data directory
+# ======================================================================
+def make_seeder(tmp, applications_per_path=None):
+    for role in ['ACCOUNTANT', 'DESIGNER', 'INFORMATION-TECHNOLOGY']:
+        os.makedirs(os.path.join(tmp, 'data', role))
+        for i in range(3):
+            open(os.path.join(tmp, 'data', role, f"{role.lower()}{i}.pdf"), 'w').close()
+    config_path = os.path.join(tmp, 'database.json')
+    with open(config_path, 'w') as f:
+        json.dump({'host': 'localhost', 'user': 'cv', 'password': 'secret', 'database': 'cv'}, f)
+
+    seeder = Seeder(os.path.join(tmp, 'data'), config_path)
+    connections = []
+
+    def connect(allow_local_infile=False):
+        seeder.conn = FakeConnection()
+        seeder.cursor = FakeCursor(applications_per_path)
+        connections.append((seeder.conn, seeder.cursor, allow_local_infile))
+
+    seeder._connect_db = connect
+    return seeder, connections
+
+# ======================================================================
+#  TEST CASE 1: test_generated_rows_are_reproducible
+# ======================================================================
+def test_generated_rows_are_reproducible():
+    with tempfile.TemporaryDirectory() as tmp:
+        seeder, _ = make_seeder(tmp)
+        state = random.getstate()
+        first = list(seeder.generate_bulk_rows(50, first_applicant_id=10, max_roles=2, seed=7))
+        print_assertion("the global random generator is left untouched")
+        assert random.getstate() == state, "A seeded run should not reseed the module generator"
+        second = []
+        for rows in seeder.generate_bulk_rows(50, first_applicant_id=10, max_roles=2, seed=7):
+            random.random()
+            second.append(rows)
+
+        print_assertion("first == second, even with other draws from the global generator in between")
+        assert first == second, "The same seed should generate the same rows"
+        print_assertion("applicant ids are 10..59")
+        assert [profile[0] for profile, _ in first] == list(range(10, 60)), "Applicant ids should be consecutive"
+        print_assertion("every applicant has 1 or 2 applications for distinct roles")
+        for profile, details in first:
+            roles = [role for _, role, _ in details]
+            assert 1 <= len(details) <= 2 and len(set(roles)) == len(roles), f"Unexpected applications: {details}"
+            assert all(applicant_id == profile[0] for applicant_id, _, _ in details), "Applications should reference their applicant"
+        all_paths = {path for paths in seeder.scanner.getMap().values() for path in paths}
+        print_assertion("every cv_path comes from the scanned directory")
+        assert all(cv_path in all_paths for _, details in first for _, _, cv_path in details), "Unknown CV path"
+
+# ======================================================================
+#  TEST CASE 2: test_bulk_insert_batches_and_commits
+# ======================================================================
+def test_bulk_insert_batches_and_commits():
+    with tempfile.TemporaryDirectory() as tmp:
+        seeder, connections = make_seeder(tmp)
+        stats = seeder.seed_bulk(1000, batch_size=100, commit_every=3, seed=1)
+        conn, cursor, allow_local_infile = connections[0]
+
+        profiles = sum(len(rows) for table, rows in cursor.batches if table == 'ApplicantProfile')
+        details = sum(len(rows) for table, rows in cursor.batches if table == 'ApplicationDetail')
+        print_assertion("stats['profiles'] == 1000 and stats['applications'] == rows inserted")
+        assert stats['profiles'] == profiles == 1000 and stats['applications'] == details, f"Unexpected stats: {stats}"
+        print_assertion("stats['rows_per_sec'] > 0")
+        assert stats['rows_per_sec'] > 0, "Throughput should be reported"
+
+        # A batch closes once it holds batch_size rows; the last applicant can add up to 3 applications
+        flushes = [len(cursor.batches[k][1]) + len(cursor.batches[k + 1][1]) for k in range(0, len(cursor.batches), 2)]
+        print_assertion("every batch holds at most batch_size + 3 rows")
+        assert max(flushes) <= 103, f"Batches too large: {max(flushes)}"
+        print_assertion("conn.commits == len(flushes) // 3 + 2")
+        assert conn.commits == len(flushes) // 3 + 2, f"{conn.commits} commits for {len(flushes)} batches"
+        print_assertion("foreign key checks are restored and local infile is not requested")
+        assert cursor.executed[-1] == "SET SESSION foreign_key_checks = 1" and not allow_local_infile, cursor.executed
+
+# ======================================================================
+#  TEST CASE 3: test_load_data_local_infile
+# ======================================================================
+def test_load_data_local_infile():
+    with tempfile.TemporaryDirectory() as tmp:
+        seeder, connections = make_seeder(tmp)
+        stats = seeder.seed_bulk(20, use_load_data=True, seed=3)
+        conn, cursor, allow_local_infile = connections[0]
+
+        print_assertion("allow_local_infile and no executemany")
+        assert allow_local_infile and not cursor.batches, "LOAD DATA mode should not insert row batches"
+        print_assertion("20 profile lines and stats['applications'] detail lines were loaded")
+        assert len(cursor.loaded_files['ApplicantProfile']) == 20, cursor.loaded_files.keys()
+        assert len(cursor.loaded_files['ApplicationDetail']) == stats['applications'], f"Unexpected stats: {stats}"
+        first_profile = cursor.loaded_files['ApplicantProfile'][0].split('\t')
+        print_assertion("profile lines hold 6 tab-separated columns, starting with applicant_id 1")
+        assert len(first_profile) == 6 and first_profile[0] == '1', f"Unexpected line: {first_profile}"
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_generated_rows_are_reproducible,
+        test_bulk_insert_batches_and_commits,
+        test_load_data_local_infile,
+    ]
+    run_test_suite(tests_to_run)
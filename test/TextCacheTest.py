@@ -0,0 +1,144 @@
+import sys
+import os
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from src.ExtractCV import ExtractCV
+from src.TextCache import TextCache
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  Helper to write a small PDF to a temporary directory
+# ======================================================================
+def write_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 72), text, fontsize=11)
+    doc.save(path)
+    doc.close()
+
+# ======================================================================
+#  TEST CASE 1: test_cache_hit_after_first_extraction
+# ======================================================================
+def test_cache_hit_after_first_extraction():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "cv.pdf")
+        write_pdf(pdf_path, "Senior Accountant, Python & SQL.")
+        cache = TextCache(os.path.join(tmp, "cache.sqlite3"))
+
+        first = ExtractCV(pdf_path, cache=cache).get_cleaned_text()
+        second = ExtractCV(pdf_path, cache=cache).get_cleaned_text()
+        stats = cache.get_stats()
+        print(f"Cache stats: {stats}")
+
+        print_assertion("first == second")
+        assert first == second, f"Cached text differs: '{first}' != '{second}'"
+        print_assertion("stats['misses'] == 1 and stats['hits'] == 1")
+        assert stats['misses'] == 1 and stats['hits'] == 1, f"Unexpected counters: {stats}"
+        cache.close()
+
+# ======================================================================
+#  TEST CASE 2: test_cache_persists_across_instances
+# ======================================================================
+def test_cache_persists_across_instances():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "cv.pdf")
+        cache_path = os.path.join(tmp, "cache.sqlite3")
+        write_pdf(pdf_path, "Project management and budgeting.")
+
+        cache = TextCache(cache_path)
+        ExtractCV(pdf_path, cache=cache).get_cleaned_text()
+        cache.close()
+
+        reopened = TextCache(cache_path)
+        text = ExtractCV(pdf_path, cache=reopened).get_cleaned_text()
+        print_assertion("reopened.hits == 1")
+        assert reopened.hits == 1, f"Expected a hit after reopening, got {reopened.get_stats()}"
+        print_assertion("text == 'project management and budgeting'")
+        assert text == "project management and budgeting", f"Unexpected text: '{text}'"
+        reopened.close()
+
+# ======================================================================
+#  TEST CASE 3: test_modified_file_is_reextracted
+# ======================================================================
+def test_modified_file_is_reextracted():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "cv.pdf")
+        cache = TextCache(os.path.join(tmp, "cache.sqlite3"))
+        write_pdf(pdf_path, "Old content")
+        ExtractCV(pdf_path, cache=cache).get_cleaned_text()
+
+        write_pdf(pdf_path, "New content with more words")
+        stat = os.stat(pdf_path)
+        os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        text = ExtractCV(pdf_path, cache=cache).get_cleaned_text()
+
+        print_assertion("text == 'new content with more words'")
+        assert text == "new content with more words", f"Stale text returned: '{text}'"
+        print_assertion("cache.misses == 2")
+        assert cache.misses == 2, f"Expected two misses, got {cache.get_stats()}"
+        cache.close()
+
+# ======================================================================
+#  TEST CASE 4: test_size_cap_evicts_least_recently_used
+# ======================================================================
+def test_size_cap_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            path = os.path.join(tmp, f"cv{i}.pdf")
+            write_pdf(path, f"document number {i} " * 10)
+            paths.append(path)
+
+        cache = TextCache(os.path.join(tmp, "cache.sqlite3"), max_bytes=400)
+        for path in paths:
+            ExtractCV(path, cache=cache).get_cleaned_text()
+        stats = cache.get_stats()
+        print(f"Cache stats: {stats}")
+
+        print_assertion("stats['bytes'] <= 400")
+        assert stats['bytes'] <= 400, f"Cache exceeds its cap: {stats}"
+        print_assertion("stats['evictions'] >= 1")
+        assert stats['evictions'] >= 1, f"Expected evictions, got {stats}"
+        print_assertion("cache.get(paths[-1]) is not None")
+        assert cache.get(paths[-1]) is not None, "Most recent entry should not be evicted"
+        cache.close()
+
+# ======================================================================
+#  TEST CASE 5: test_extract_many_matches_serial_extraction
+# ======================================================================
+def test_extract_many_matches_serial_extraction():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(12):
+            path = os.path.join(tmp, f"cv{i}.pdf")
+            write_pdf(path, f"Candidate {i}: Python, SQL & Excel.")
+            paths.append(path)
+        paths.append(os.path.join(tmp, "missing.pdf"))
+
+        serial = [ExtractCV(path).get_cleaned_text() for path in paths[:-1]] + [""]
+        cache = TextCache(os.path.join(tmp, "cache.sqlite3"))
+        parallel = ExtractCV.extract_many(paths, workers=4, chunksize=2, cache=cache)
+        print_assertion("parallel == serial")
+        assert parallel == serial, "Parallel extraction should return texts in input order"
+
+        again = ExtractCV.extract_many(paths, workers=4, cache=cache)
+        print_assertion("again == serial and cache.hits == 12")
+        assert again == serial and cache.hits == 12, f"Second batch should be served from the cache: {cache.get_stats()}"
+        cache.close()
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_cache_hit_after_first_extraction,
+        test_cache_persists_across_instances,
+        test_modified_file_is_reextracted,
+        test_size_cap_evicts_least_recently_used,
+        test_extract_many_matches_serial_extraction,
+    ]
+    run_test_suite(tests_to_run)
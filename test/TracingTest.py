@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import tempfile
+
+# Add the root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Tracing import Tracer, NULL_TRACER
+from src.SearchPipeline import SearchPipeline
+from src.Index.TrigramIndex import TrigramIndex
+from SearchPipelineTest import make_applications
+from SearchTest import run_test_suite, print_assertion
+
+# ======================================================================
+#  TEST CASE 1: test_spans_breakdown_and_exports
+# ======================================================================
+def test_spans_breakdown_and_exports():
+    tracer = Tracer(memory=True)
+    with tracer.span("extract"):
+        data = [str(i) * 10 for i in range(1000)]
+    for i in range(3):
+        with tracer.span("search", cv_path=f"cv{i}.pdf") as span:
+            span.set(matches=i)
+    tracer.add_worker_time("pdf parse", 2_000_000)
+    for _ in range(5):
+        with tracer.timed("fuzzy"):
+            pass
+    tracer.stop()
+
+    breakdown = tracer.breakdown()
+    print(tracer.format_breakdown())
+    print_assertion("list(breakdown['stages']) == ['extract', 'search', 'fuzzy'] and the search count is 3")
+    assert list(breakdown['stages']) == ['extract', 'search', 'fuzzy'] and breakdown['stages']['search']['count'] == 3, breakdown
+    print_assertion("the 5 timed blocks are counted, without keeping a span each")
+    assert breakdown['stages']['fuzzy']['count'] == 5 and len(tracer.spans) == 4, tracer.spans
+    print_assertion("breakdown['workers']['pdf parse'] == {'count': 1, 'total_ms': 2.0}")
+    assert breakdown['workers']['pdf parse'] == {'count': 1, 'total_ms': 2.0}, breakdown['workers']
+    print_assertion("the heap peak is recorded")
+    assert breakdown['memory']['tracemalloc_peak_kb'] > 0, breakdown['memory']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chrome_path = os.path.join(tmp, "trace.json")
+        tracer.save(chrome_path)
+        with open(chrome_path) as f:
+            events = json.load(f)['traceEvents']
+        json_path = os.path.join(tmp, "spans.json")
+        tracer.save(json_path, 'json')
+        with open(json_path) as f:
+            spans = json.load(f)['spans']
+    print_assertion("4 complete events in the Chrome trace, with their arguments")
+    assert len(events) == 4 and all(event['ph'] == 'X' and event['dur'] >= 0 for event in events), events
+    assert events[-1]['args'] == {'cv_path': 'cv2.pdf', 'matches': '2'}, events[-1]
+    print_assertion("the JSON export lists the spans in ms from the start")
+    assert [span['name'] for span in spans] == ['extract', 'search', 'search', 'search'] and spans[0]['start_ms'] >= 0, spans
+
+# ======================================================================
+#  TEST CASE 2: test_disabled_tracer_records_nothing
+# ======================================================================
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False, memory=True)
+    print_assertion("a disabled tracer hands out the same no-op span")
+    assert tracer.span("search", cv_path="a") is tracer.timed("fuzzy") is NULL_TRACER.span("rank"), "Spans should be shared"
+    with tracer.span("search") as span:
+        span.set(matches=1)
+    tracer.add_worker_time("pdf parse", 10)
+    tracer.stop()
+    print_assertion("no span, worker time or memory peak")
+    assert not tracer.spans and not tracer.worker_times and not tracer.stage_times and not tracer.memory, "A disabled tracer should record nothing"
+
+# ======================================================================
+#  TEST CASE 3: test_pipeline_stages_are_traced
+# ======================================================================
+def test_pipeline_stages_are_traced():
+    with tempfile.TemporaryDirectory() as tmp:
+        applications = make_applications(tmp)
+        tracer = Tracer()
+        traced = SearchPipeline(trigram_index=TrigramIndex(), workers=1).run(applications, ["python", "managemnt"], 'kmp', tracer=tracer)
+        plain = SearchPipeline(trigram_index=TrigramIndex(), workers=1).run(applications, ["python", "managemnt"], 'kmp')
+        stages = tracer.breakdown()['stages']
+        print(tracer.format_breakdown())
+
+        print_assertion("tracing does not change the results")
+        assert traced['results'] == plain['results'], f"{traced['results']} != {plain['results']}"
+        print_assertion("fetch, extract, index, search, fuzzy and rank are traced")
+        assert {'fetch', 'extract', 'index', 'search', 'fuzzy', 'rank'} <= set(stages), stages
+        print_assertion("the search and fuzzy pass of each CV are counted, not kept as spans")
+        assert stages['search']['count'] == stages['fuzzy']['count'] == 4, stages
+        assert not {'extract', 'search', 'fuzzy'} & {span[0] for span in tracer.spans}, tracer.spans
+        print_assertion("PDF parsing and cleaning are timed in the workers")
+        assert set(tracer.breakdown()['workers']) == {'pdf parse', 'text cleaning'}, tracer.breakdown()['workers']
+
+# --- Main Execution Block ---
+
+# ======================================================================
+#  Script Entry Point
+# ======================================================================
+if __name__ == "__main__":
+    tests_to_run = [
+        test_spans_breakdown_and_exports,
+        test_disabled_tracer_records_nothing,
+        test_pipeline_stages_are_traced,
+    ]
+    run_test_suite(tests_to_run)